@@ -0,0 +1,51 @@
+"""Benchmark sequential assembly with Compound.add.
+
+Adds particles to a single parent one at a time (bonding each new particle to
+the previous one, as a polymer builder would) and reports the time spent per
+block of adds. With in-place bond graph merging, the time per block should
+stay roughly constant as the hierarchy grows, i.e. total time is linear in
+the number of particles.
+
+Usage::
+
+    python devtools/benchmarks/bench_add.py [n_particles] [n_blocks]
+"""
+
+import sys
+import time
+
+import mbuild as mb
+
+
+def bench_sequential_add(n_particles=100000, n_blocks=10):
+    """Time adding `n_particles` particles to one Compound, one at a time."""
+    compound = mb.Compound()
+    block_size = n_particles // n_blocks
+    previous = None
+    timings = []
+    for _ in range(n_blocks):
+        start = time.perf_counter()
+        for _ in range(block_size):
+            particle = mb.Compound(name="C", pos=[0, 0, 0])
+            compound.add(particle)
+            if previous is not None:
+                compound.add_bond((previous, particle))
+            previous = particle
+        timings.append(time.perf_counter() - start)
+    return block_size, timings
+
+
+def main(argv):
+    n_particles = int(argv[1]) if len(argv) > 1 else 100000
+    n_blocks = int(argv[2]) if len(argv) > 2 else 10
+    block_size, timings = bench_sequential_add(n_particles, n_blocks)
+    print(f"{'particles':>12} {'block time (s)':>16} {'us / add':>10}")
+    for i, elapsed in enumerate(timings, start=1):
+        print(
+            f"{i * block_size:>12} {elapsed:>16.3f} {1e6 * elapsed / block_size:>10.2f}"
+        )
+    print(f"total: {sum(timings):.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
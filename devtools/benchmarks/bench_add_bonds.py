@@ -0,0 +1,53 @@
+"""Benchmark adding and removing many bonds.
+
+Times bonding a chain of particles with one `Compound.add_bond` call per
+bond and with a single `Compound.add_bonds` call, and removing the bonds
+again with `Compound.remove_bonds`, for both bond graph backends.
+
+Usage::
+
+    python devtools/benchmarks/bench_add_bonds.py [n_particles]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.bond_graph import set_default_backend
+
+
+def make_chain(n_particles):
+    """Return a Compound of unbonded particles along the x axis."""
+    return mb.Compound(
+        [mb.Particle(name="C", pos=[0.15 * i, 0.0, 0.0]) for i in range(n_particles)]
+    )
+
+
+def main(argv):
+    n_particles = int(argv[1]) if len(argv) > 1 else 100000
+    pairs = np.column_stack((np.arange(n_particles - 1), np.arange(1, n_particles)))
+    for backend in ("networkx", "compact"):
+        set_default_backend(backend)
+
+        chain = make_chain(n_particles)
+        particles = list(chain.particles())
+        start = time.perf_counter()
+        for i, j in pairs.tolist():
+            chain.add_bond((particles[i], particles[j]))
+        print(f"{backend:>8} add_bond:     {time.perf_counter() - start:8.3f} s")
+
+        chain = make_chain(n_particles)
+        start = time.perf_counter()
+        chain.add_bonds(pairs)
+        print(f"{backend:>8} add_bonds:    {time.perf_counter() - start:8.3f} s")
+
+        start = time.perf_counter()
+        chain.remove_bonds(pairs)
+        print(f"{backend:>8} remove_bonds: {time.perf_counter() - start:8.3f} s")
+    set_default_backend("networkx")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,43 @@
+"""Benchmark adding many molecules one at a time to a box.
+
+Times a loop of `Compound.add` calls, each adding a clone of a molecule to a
+Compound with a box, once as is and once inside `Compound.batch`, which
+checks the box size and merges the bond graphs once at the end.
+
+Usage::
+
+    python devtools/benchmarks/bench_batch.py [n_molecules]
+"""
+
+import sys
+import time
+
+import mbuild as mb
+from mbuild.lib.molecules import Ethane
+
+
+def bench_add_loop(prototype, n_molecules, batched):
+    """Return the seconds taken to add `n_molecules` clones one at a time."""
+    copies = [mb.clone(prototype) for _ in range(n_molecules)]
+    box = mb.Compound(box=mb.Box([10.0, 10.0, 10.0]))
+    start = time.perf_counter()
+    if batched:
+        with box.batch():
+            for copy in copies:
+                box.add(copy)
+    else:
+        for copy in copies:
+            box.add(copy)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    n_molecules = int(argv[1]) if len(argv) > 1 else 2000
+    prototype = Ethane()
+    print(f"{n_molecules:,} ethanes")
+    print(f"add loop:         {bench_add_loop(prototype, n_molecules, False):8.3f} s")
+    print(f"add loop (batch): {bench_add_loop(prototype, n_molecules, True):8.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,40 @@
+"""Benchmark repeated geometric queries on a large Compound.
+
+Times building a box of molecules with `Compound.add`, which checks the box
+size after every add, and then repeated calls to `get_boundingbox`,
+`center`, `mins` and `maxs`, which are served from a cache while the
+coordinates do not change.
+
+Usage::
+
+    python devtools/benchmarks/bench_boundingbox.py [n_molecules]
+"""
+
+import sys
+import time
+
+import mbuild as mb
+from mbuild.lib.molecules import Ethane
+
+
+def main(argv):
+    n_molecules = int(argv[1]) if len(argv) > 1 else 2000
+    copies = mb.replicate(Ethane(), n_molecules)
+    box = mb.Compound(box=mb.Box([100.0, 100.0, 100.0]))
+
+    start = time.perf_counter()
+    for copy in copies:
+        box.add(copy)
+    print(f"{n_molecules:,} adds with box checks: {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        box.get_boundingbox()
+        box.center
+        box.mins
+        box.maxs
+    print(f"1,000 repeated queries:     {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
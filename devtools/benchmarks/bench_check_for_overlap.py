@@ -0,0 +1,39 @@
+"""Benchmark overlap checks that exclude bonded neighbors.
+
+Places copies of ethane on a dense grid and times
+`Compound.check_for_overlap` with a cutoff that catches most bonded pairs,
+so the exclusion of particles within a few bonds of each other dominates.
+
+Usage::
+
+    python devtools/benchmarks/bench_check_for_overlap.py [n_molecules]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.lib.molecules import Ethane
+
+
+def main(argv):
+    n_molecules = int(argv[1]) if len(argv) > 1 else 10000
+    n_side = int(np.ceil(n_molecules ** (1 / 3)))
+    grid = np.indices((n_side,) * 3).reshape(3, -1).T[:n_molecules] * 0.5 + 0.25
+    box = mb.Compound(box=mb.Box([n_side * 0.5] * 3))
+    box.add(mb.replicate(Ethane(), n_molecules, positions=grid))
+    print(f"{box.n_particles:,} particles")
+
+    for depth in (1, 3):
+        start = time.perf_counter()
+        overlap = box.check_for_overlap(depth, minimum_distance=0.2)
+        print(
+            f"excluded_bond_depth={depth}: {len(overlap):,} overlaps, "
+            f"{time.perf_counter() - start:8.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
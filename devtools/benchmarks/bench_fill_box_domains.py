@@ -0,0 +1,34 @@
+"""Benchmark packing a box of water in slabs.
+
+Times `fill_box` packing water at liquid density with a single PACKMOL run
+and with the box split into slabs that are packed concurrently. Requires
+PACKMOL.
+
+Usage::
+
+    python devtools/benchmarks/bench_fill_box_domains.py [n_molecules] [n_domains]
+"""
+
+import os
+import sys
+import time
+
+import mbuild as mb
+from mbuild.lib.moieties import H2O
+
+
+def main(argv):
+    n_molecules = int(argv[1]) if len(argv) > 1 else 20000
+    n_domains = int(argv[2]) if len(argv) > 2 else os.cpu_count()
+    # Cube with the volume of n_molecules waters at 1000 kg/m^3.
+    length = (n_molecules * 0.0299) ** (1 / 3)
+    for domains in sorted({1, n_domains}):
+        start = time.perf_counter()
+        mb.fill_box(
+            H2O(), n_molecules, box=[length] * 3, n_domains=domains, sidemax=1000.0
+        )
+        print(f"n_domains={domains}: {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
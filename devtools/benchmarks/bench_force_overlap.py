@@ -0,0 +1,52 @@
+"""Benchmark growing chains with force_overlap.
+
+Times growing a chain of methylene groups by moving the whole chain onto
+each new monomer, which composes the moves lazily unless the chain is
+array-backed, and building the same chain with `Polymer.build`.
+
+Usage::
+
+    python devtools/benchmarks/bench_force_overlap.py [n_monomers]
+"""
+
+import sys
+import time
+
+import mbuild as mb
+from mbuild.lib.moieties import CH2
+from mbuild.lib.recipes import Polymer
+
+
+def grow_chain(n_monomers, array_backed):
+    """Grow a chain by moving it onto each new monomer."""
+    monomer = CH2()
+    chain = mb.Compound()
+    chain.add(mb.clone(monomer), "monomer[$]")
+    chain.array_backed = array_backed
+    for _ in range(n_monomers - 1):
+        new_monomer = mb.clone(monomer)
+        mb.force_overlap(chain, chain["monomer"][-1]["down"], new_monomer["up"])
+        chain.add(new_monomer, "monomer[$]")
+    return chain
+
+
+def main(argv):
+    n_monomers = int(argv[1]) if len(argv) > 1 else 2000
+    for array_backed in (True, False):
+        start = time.perf_counter()
+        chain = grow_chain(n_monomers, array_backed)
+        chain.xyz
+        print(
+            f"array_backed={array_backed}, moving the chain: "
+            f"{time.perf_counter() - start:8.3f} s"
+        )
+
+    start = time.perf_counter()
+    polymer = Polymer(monomers=[CH2()])
+    polymer.build(n_monomers)
+    polymer.xyz
+    print(f"Polymer.build: {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
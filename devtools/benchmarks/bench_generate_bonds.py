@@ -0,0 +1,42 @@
+"""Benchmark bonding all pairs of two particle types within a distance range.
+
+Times `Compound.generate_bonds` on a periodic box of randomly placed "Si" and
+"O" particles at the number density of amorphous silica, as done when
+building a silica interface.
+
+Usage::
+
+    python devtools/benchmarks/bench_generate_bonds.py [n_particles]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+
+
+def main(argv):
+    n_particles = int(argv[1]) if len(argv) > 1 else 30000
+    length = (n_particles / 66.0) ** (1 / 3)
+    rng = np.random.default_rng(0)
+    compound = mb.Compound(box=mb.Box([length] * 3))
+    compound.add(
+        [
+            mb.Particle(name="Si" if i % 3 == 0 else "O", pos=pos)
+            for i, pos in enumerate(rng.random((n_particles, 3)) * length)
+        ]
+    )
+    compound.periodicity = (True, True, True)
+
+    start = time.perf_counter()
+    compound.generate_bonds("Si", "O", dmin=0.0, dmax=0.20419)
+    print(
+        f"{n_particles:,} particles, {compound.n_bonds:,} bonds: "
+        f"{time.perf_counter() - start:8.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
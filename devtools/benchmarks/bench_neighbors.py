@@ -0,0 +1,42 @@
+"""Benchmark finding all pairs of points within a cutoff in a periodic box.
+
+Times `mbuild.neighbors.neighbor_pairs` on uniformly random points at the
+number density of liquid water, and `Compound.check_for_overlap` on a box of
+the same number of particles, which uses it.
+
+Usage::
+
+    python devtools/benchmarks/bench_neighbors.py [n_points]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.neighbors import neighbor_pairs
+
+
+def main(argv):
+    n_points = int(argv[1]) if len(argv) > 1 else 100000
+    length = (n_points / 100.0) ** (1 / 3)
+    box = mb.Box([length] * 3)
+    points = np.random.default_rng(0).random((n_points, 3)) * length
+
+    start = time.perf_counter()
+    i, _, _ = neighbor_pairs(points, 0.3, box=box)
+    print(
+        f"{n_points:,} points, {len(i):,} pairs: {time.perf_counter() - start:8.3f} s"
+    )
+
+    compound = mb.Compound(box=box)
+    compound.add([mb.Particle(name="Ar", pos=pos) for pos in points])
+    compound.periodicity = (True, True, True)
+    start = time.perf_counter()
+    compound.check_for_overlap(0, minimum_distance=0.1)
+    print(f"check_for_overlap: {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
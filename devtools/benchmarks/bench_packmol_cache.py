@@ -0,0 +1,37 @@
+"""Benchmark repeating a packing with the PACKMOL cache.
+
+Times `fill_box` packing the same box of water twice into an empty PACKMOL
+cache, so that the second packing is copied from the cache. Requires
+PACKMOL.
+
+Usage::
+
+    python devtools/benchmarks/bench_packmol_cache.py [n_molecules]
+"""
+
+import sys
+import tempfile
+import time
+
+import mbuild as mb
+from mbuild.lib.moieties import H2O
+from mbuild.packing import set_packmol_cache
+
+
+def main(argv):
+    n_molecules = int(argv[1]) if len(argv) > 1 else 2000
+    length = (n_molecules * 0.0299) ** (1 / 3)
+    water = H2O()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        set_packmol_cache(cache_dir)
+        try:
+            for attempt in ("first", "cached"):
+                start = time.perf_counter()
+                mb.fill_box(water, n_molecules, box=[length] * 3)
+                print(f"{attempt} fill_box: {time.perf_counter() - start:8.3f} s")
+        finally:
+            set_packmol_cache(None)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
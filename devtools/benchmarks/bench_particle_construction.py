@@ -0,0 +1,58 @@
+"""Benchmark particle construction throughput.
+
+Reports how many particles per second can be created on their own, created
+and added to a parent Compound (as the loaders in mbuild.conversion do), and
+cloned as part of a larger Compound.
+
+Usage::
+
+    python devtools/benchmarks/bench_particle_construction.py [n_particles]
+"""
+
+import sys
+import time
+
+import mbuild as mb
+
+
+def bench_construct(n_particles):
+    """Create `n_particles` standalone particles."""
+    start = time.perf_counter()
+    particles = [
+        mb.Compound(name="C", element="C", pos=[0.0, 0.0, 0.0])
+        for _ in range(n_particles)
+    ]
+    return time.perf_counter() - start, particles
+
+
+def bench_construct_and_add(n_particles):
+    """Create `n_particles` particles and add them to a Compound one by one."""
+    compound = mb.Compound()
+    start = time.perf_counter()
+    for _ in range(n_particles):
+        compound.add(
+            mb.Compound(name="C", element="C", pos=[0.0, 0.0, 0.0]),
+            check_box_size=False,
+        )
+    return time.perf_counter() - start, compound
+
+
+def bench_clone(compound):
+    """Clone a Compound made of particles."""
+    start = time.perf_counter()
+    mb.clone(compound)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    n_particles = int(argv[1]) if len(argv) > 1 else 100000
+    elapsed, _ = bench_construct(n_particles)
+    print(f"construct:         {n_particles / elapsed:>12,.0f} particles/s")
+    elapsed, compound = bench_construct_and_add(n_particles)
+    print(f"construct and add: {n_particles / elapsed:>12,.0f} particles/s")
+    elapsed = bench_clone(compound)
+    print(f"clone:             {n_particles / elapsed:>12,.0f} particles/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,60 @@
+"""Benchmark the memory used per atom of a large lattice.
+
+Populates a simple cubic lattice with copies of a particle and reports the
+memory traced by `tracemalloc` divided by the number of atoms, once with a
+plain `mb.Compound` as the particle (before) and once with `mb.Particle`
+(after), which shares empty containers between atoms and only allocates the
+instance `__dict__` inherited from Compound when an attribute outside its
+slots is set.
+
+Usage::
+
+    python devtools/benchmarks/bench_particle_memory.py [n_cells_per_side]
+
+The default of 100 cells per side gives 1M atoms.
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import mbuild as mb
+
+
+def bench_lattice_memory(particle, n_cells):
+    """Return the bytes per atom of a lattice populated with `particle`."""
+    lattice = mb.Lattice(
+        lattice_spacing=[0.5, 0.5, 0.5],
+        lattice_points={"A": [[0.0, 0.0, 0.0]]},
+    )
+    gc.collect()
+    tracemalloc.start()
+    compound = lattice.populate(
+        compound_dict={"A": particle}, x=n_cells, y=n_cells, z=n_cells
+    )
+    gc.collect()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / compound.n_particles, peak / compound.n_particles
+
+
+def main(argv):
+    n_cells = int(argv[1]) if len(argv) > 1 else 100
+    print(f"{n_cells**3:,} atoms")
+    results = {}
+    for label, particle in (
+        ("before (mb.Compound)", mb.Compound(name="Ar", element="Ar")),
+        ("after (mb.Particle)", mb.Particle(name="Ar", element="Ar")),
+    ):
+        per_atom, peak_per_atom = bench_lattice_memory(particle, n_cells)
+        results[label] = per_atom
+        print(
+            f"{label:<21} {per_atom:>8,.0f} bytes/atom retained, "
+            f"{peak_per_atom:>8,.0f} bytes/atom peak"
+        )
+    before, after = results.values()
+    print(f"saved {before - after:,.0f} bytes/atom ({1 - after / before:.0%})")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,45 @@
+"""Benchmark batch queries of a PeriodicKDTree.
+
+Times building a `PeriodicKDTree` of uniformly random points and querying
+the nearest neighbors and all pairs within a cutoff, in an orthorhombic and
+a triclinic box.
+
+Usage::
+
+    python devtools/benchmarks/bench_periodic_kdtree.py [n_points]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.periodic_kdtree import PeriodicKDTree
+
+
+def bench_box(box, n_points):
+    """Print the time of a batch of queries in `box`."""
+    points = np.random.default_rng(0).random((n_points, 3)) @ box.vectors
+    bounds = box.lengths if np.allclose(box.angles, 90.0) else box.vectors
+
+    start = time.perf_counter()
+    tree = PeriodicKDTree(bounds, points)
+    tree.query(points, k=20, distance_upper_bound=0.5)
+    pairs = tree.query_pairs(0.3, output_type="ndarray")
+    print(
+        f"angles {box.angles}: {len(pairs):,} pairs, "
+        f"{time.perf_counter() - start:8.3f} s"
+    )
+
+
+def main(argv):
+    n_points = int(argv[1]) if len(argv) > 1 else 100000
+    length = (n_points / 100.0) ** (1 / 3)
+    print(f"{n_points:,} points")
+    bench_box(mb.Box([length] * 3), n_points)
+    bench_box(mb.Box([length] * 3, angles=[80.0, 95.0, 110.0]), n_points)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,65 @@
+"""Benchmark creating and connecting Ports.
+
+Times creating Ports and AnalyticPorts anchored to a particle, cloning a
+Compound that holds them, and connecting pairs of them with `force_overlap`.
+Also times querying the Ports of each molecule of a system of methylene
+groups, and removing particles one at a time, which prunes the Ports
+anchored to them.
+
+Usage::
+
+    python devtools/benchmarks/bench_ports.py [n_ports]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.lib.moieties import CH2
+
+
+def main(argv):
+    n_ports = int(argv[1]) if len(argv) > 1 else 10000
+    rng = np.random.default_rng(0)
+    orientations = rng.random((n_ports, 3)) - 0.5
+
+    for port_type in (mb.Port, mb.AnalyticPort):
+        name = port_type.__name__
+        surface = mb.Compound()
+        anchor = mb.Particle(name="O")
+        surface.add(anchor)
+        start = time.perf_counter()
+        for orientation in orientations:
+            surface.add(
+                port_type(anchor=anchor, orientation=orientation, separation=0.1),
+                "port[$]",
+            )
+        print(f"{name}, create: {time.perf_counter() - start:8.3f} s")
+
+        start = time.perf_counter()
+        mb.clone(surface)
+        print(f"{name}, clone: {time.perf_counter() - start:8.3f} s")
+
+        ports = surface.available_ports()
+        start = time.perf_counter()
+        for from_port, to_port in zip(ports[::2], ports[1::2]):
+            mb.force_overlap(mb.Compound(), from_port, to_port, add_bond=False)
+        print(f"{name}, force_overlap: {time.perf_counter() - start:8.3f} s")
+
+    system = mb.Compound(mb.replicate(CH2(), n_ports // 2))
+    start = time.perf_counter()
+    for child in system.children:
+        child.all_ports()
+    print(f"all_ports of each molecule: {time.perf_counter() - start:8.3f} s")
+
+    hydrogens = list(system.particles_by_name("H"))[: n_ports // 20]
+    start = time.perf_counter()
+    for hydrogen in hydrogens:
+        system.remove(hydrogen)
+    print(f"remove {len(hydrogens):,} particles: {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,45 @@
+"""Benchmark removing many particles from a large system.
+
+Fills a box with ethane and times removing every hydrogen of half of the
+molecules, once in a single call to `Compound.remove` and once with one call
+per particle.
+
+Usage::
+
+    python devtools/benchmarks/bench_remove.py [n_molecules]
+"""
+
+import sys
+import time
+
+import mbuild as mb
+from mbuild.lib.molecules import Ethane
+
+
+def bench_remove(n_molecules, batched):
+    """Return the seconds taken to remove the hydrogens of half the box."""
+    box = mb.Compound()
+    box.add(mb.replicate(Ethane(), n_molecules))
+    hydrogens = [
+        particle
+        for ethane in box.children[: n_molecules // 2]
+        for particle in ethane.particles_by_name("H")
+    ]
+    start = time.perf_counter()
+    if batched:
+        box.remove(hydrogens)
+    else:
+        for hydrogen in hydrogens:
+            box.remove(hydrogen)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    n_molecules = int(argv[1]) if len(argv) > 1 else 1000
+    print(f"{n_molecules:,} ethanes")
+    print(f"batched:    {bench_remove(n_molecules, batched=True):8.3f} s")
+    print(f"one by one: {bench_remove(n_molecules, batched=False):8.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
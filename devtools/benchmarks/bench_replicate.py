@@ -0,0 +1,51 @@
+"""Benchmark creating many copies of a molecule.
+
+Compares cloning a prototype and translating each copy in a loop with
+`mb.replicate`, which is what the packing functions, `Lattice.populate` and
+the tiling/pattern recipes use to build their topologies.
+
+Usage::
+
+    python devtools/benchmarks/bench_replicate.py [n_copies]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.lib.molecules import Ethane
+
+
+def bench_clone_loop(prototype, positions):
+    """Clone and move `len(positions)` copies one at a time."""
+    start = time.perf_counter()
+    copies = []
+    for position in positions:
+        copy = mb.clone(prototype)
+        copy.translate_to(position)
+        copies.append(copy)
+    return time.perf_counter() - start
+
+
+def bench_replicate(prototype, positions):
+    """Create `len(positions)` copies with one call to mb.replicate."""
+    start = time.perf_counter()
+    mb.replicate(prototype, len(positions), positions=positions)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    n_copies = int(argv[1]) if len(argv) > 1 else 20000
+    prototype = Ethane()
+    positions = np.random.default_rng(12345).random((n_copies, 3)) * 10
+    clone_time = bench_clone_loop(prototype, positions)
+    replicate_time = bench_replicate(prototype, positions)
+    print(f"{n_copies} copies of {prototype.name}")
+    print(f"clone + translate_to: {clone_time:.3f} s")
+    print(f"replicate:            {replicate_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,52 @@
+"""Benchmark computing many rigid transformations.
+
+Times aligning K pairs of four-point sets, the size of the point sets of a
+Port, with one `RigidTransform` per pair and with a single call to
+`rigid_transform_matrices`, and times `force_overlap` growing a chain of
+methylene groups.
+
+Usage::
+
+    python devtools/benchmarks/bench_rigid_transform.py [n_transforms]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.coordinate_transform import RigidTransform, rigid_transform_matrices
+from mbuild.lib.moieties import CH2
+
+
+def main(argv):
+    n_transforms = int(argv[1]) if len(argv) > 1 else 10000
+    rng = np.random.default_rng(0)
+    A = rng.random((n_transforms, 4, 3))
+    B = rng.random((n_transforms, 4, 3))
+
+    start = time.perf_counter()
+    for a, b in zip(A, B):
+        RigidTransform(a, b)
+    print(f"{n_transforms:,} RigidTransform: {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    rigid_transform_matrices(A, B)
+    print(f"rigid_transform_matrices: {time.perf_counter() - start:8.3f} s")
+
+    chain = mb.Compound()
+    chain.add(CH2(), "monomer[$]")
+    start = time.perf_counter()
+    for _ in range(n_transforms // 20 - 1):
+        monomer = CH2()
+        mb.force_overlap(monomer, monomer["up"], chain["monomer"][-1]["down"])
+        chain.add(monomer, "monomer[$]")
+    print(
+        f"force_overlap, {n_transforms // 20:,} monomers: "
+        f"{time.perf_counter() - start:8.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
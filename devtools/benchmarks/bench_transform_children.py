@@ -0,0 +1,51 @@
+"""Benchmark moving many child Compounds rigidly.
+
+Times placing copies of water at random positions and orientations with one
+`rotate` and `translate` call per copy and with a single
+`Compound.transform_children` call, with and without `array_backed`.
+
+Usage::
+
+    python devtools/benchmarks/bench_transform_children.py [n_molecules]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.coordinate_transform import random_rotation_matrices
+from mbuild.lib.moieties import H2O
+
+
+def main(argv):
+    n_molecules = int(argv[1]) if len(argv) > 1 else 10000
+    rng = np.random.default_rng(0)
+    translations = rng.random((n_molecules, 3)) * 5.0
+    angles = rng.random(n_molecules) * 2 * np.pi
+    axes = rng.random((n_molecules, 3)) - 0.5
+
+    for array_backed in (False, True):
+        system = mb.Compound(mb.replicate(H2O(), n_molecules))
+        system.array_backed = array_backed
+        start = time.perf_counter()
+        for child, theta, axis, by in zip(system.children, angles, axes, translations):
+            child.spin(theta, axis)
+            child.translate(by)
+        print(
+            f"array_backed={array_backed}, per child: "
+            f"{time.perf_counter() - start:8.3f} s"
+        )
+
+        start = time.perf_counter()
+        rotations = random_rotation_matrices(n_molecules, seed=0)
+        system.transform_children(translations, rotations)
+        print(
+            f"array_backed={array_backed}, transform_children: "
+            f"{time.perf_counter() - start:8.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
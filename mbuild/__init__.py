@@ -14,7 +14,7 @@ from mbuild.coordinate_transform import *
 from mbuild.lattice import Lattice
 from mbuild.packing import *
 from mbuild.pattern import *
-from mbuild.port import Port
+from mbuild.port import AnalyticPort, Port
 from mbuild.recipes import recipes
 
 __version__ = "1.3.1"
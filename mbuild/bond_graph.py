@@ -39,7 +39,12 @@ THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
+import itertools
+
 import networkx as nx
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components as _csgraph_components
 
 
 class BondGraph(nx.Graph):
@@ -57,6 +62,742 @@ class BondGraph(nx.Graph):
                     seen.add(v)
                     nextlevel.update(self.neighbors(v))
 
+    def merge(self, other):
+        """Add the particles and bonds of another bond graph in place.
+
+        Unlike `nx.compose`, which builds a new graph from both inputs, this
+        only visits the nodes and edges of `other`, so repeatedly merging
+        small graphs into a large one scales with the size of the small
+        graphs. As with `nx.compose`, attributes from `other` take precedence
+        for nodes and edges present in both graphs.
+
+        Parameters
+        ----------
+        other : BondGraph
+            The bond graph to merge into this one. It is not modified.
+        """
+        self.add_nodes_from(other.nodes(data=True))
+        self.add_edges_from(other.edges(data=True))
+
+    def merge_many(self, others):
+        """Add the particles and bonds of several bond graphs in place.
+
+        Equivalent to calling `merge` on each graph in turn.
+
+        Parameters
+        ----------
+        others : list of BondGraph
+            The bond graphs to merge into this one. They are not modified.
+        """
+        self.add_nodes_from(
+            itertools.chain.from_iterable(other.nodes(data=True) for other in others)
+        )
+        self.add_edges_from(
+            itertools.chain.from_iterable(other.edges(data=True) for other in others)
+        )
+
+    def edges_among(self, nodes, data=False):
+        """Return the bonds between the given nodes.
+
+        Only the bonds of `nodes` are visited, without building a subgraph
+        view.
+
+        Parameters
+        ----------
+        nodes : iterable of mb.Compound
+            The nodes to return the bonds between.
+        data : bool, optional, default=False
+            If True, return (u, v, attribute dict) tuples.
+        """
+        adj = self._adj
+        nodes = [node for node in nodes if node in adj]
+        members = set(nodes)
+        seen = set()
+        edges = []
+        for u in nodes:
+            for v, attrs in adj[u].items():
+                if v in members and v not in seen:
+                    edges.append((u, v, attrs) if data else (u, v))
+            seen.add(u)
+        return edges
+
     def connected_components(self):
         """Return list of connected bond component of bondgraph."""
         return [list(mol) for mol in nx.connected_components(self)]
+
+
+class CompactBondGraph:
+    """Store connectivity information in integer arrays over particle indices.
+
+    A memory-efficient alternative to `BondGraph` for large systems. Each
+    particle is assigned an integer index and bonds are stored as a pair of
+    index arrays with a parallel array of bond orders, instead of the nested
+    dictionaries used by networkx. Neighbor lookups use a CSR adjacency built
+    from the bond arrays; bonds added since the adjacency was last built are
+    kept in a small pending table and folded in periodically, so adding bonds
+    one at a time remains cheap. Connected components and subgraphs are
+    computed with vectorized array operations and `scipy.sparse.csgraph`.
+
+    The methods used by `Compound` and the converters (`add_node`,
+    `add_edge`, `remove_node`, `remove_edge`, `has_node`, `has_edge`,
+    `neighbors`, `nodes`, `edges`, `subgraph`, `copy`,
+    `connected_components`, `merge`, ...) follow the networkx signatures.
+    Node attributes are not stored, and the only edge attribute stored is
+    `bond_order`.
+    """
+
+    # Minimum number of pending bonds or stale entries kept before the
+    # adjacency is rebuilt.
+    _min_pending = 1024
+
+    def __init__(self):
+        self._nodes = []
+        self._node_index = {}
+        self._n_removed_nodes = 0
+        self._edge_u = np.empty(0, dtype=np.int64)
+        self._edge_v = np.empty(0, dtype=np.int64)
+        self._bond_order = np.empty(0, dtype=float)
+        self._edge_alive = np.empty(0, dtype=bool)
+        self._n_edge_slots = 0
+        self._n_edges = 0
+        # CSR adjacency over the bonds in slots [0, _csr_edge_slots)
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int64)
+        self._csr_edges = np.empty(0, dtype=np.int64)
+        self._csr_edge_slots = 0
+        # Bonds added after the CSR was built: {index: {index: slot}}
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._node_index)
+
+    def __iter__(self):
+        return iter(self._node_index)
+
+    def __contains__(self, node):
+        return node in self._node_index
+
+    def has_node(self, node):
+        """Return True if `node` is in the graph."""
+        return node in self._node_index
+
+    def number_of_nodes(self):
+        """Return the number of nodes in the graph."""
+        return len(self._node_index)
+
+    def number_of_edges(self):
+        """Return the number of bonds in the graph."""
+        return self._n_edges
+
+    def nodes(self, data=False):
+        """Return a list of the nodes in the graph.
+
+        If `data` is True, (node, {}) pairs are returned for compatibility
+        with networkx, as node attributes are not stored.
+        """
+        if data:
+            return [(node, {}) for node in self._node_index]
+        return list(self._node_index)
+
+    def add_node(self, node):
+        """Add a single node to the graph."""
+        if node not in self._node_index:
+            self._node_index[node] = len(self._nodes)
+            self._nodes.append(node)
+
+    def add_nodes_from(self, nodes):
+        """Add nodes, or (node, attribute dict) pairs, to the graph."""
+        for node in nodes:
+            if isinstance(node, tuple) and len(node) == 2 and isinstance(node[1], dict):
+                node = node[0]
+            self.add_node(node)
+
+    def remove_node(self, node):
+        """Remove a node and all of its bonds from the graph."""
+        index = self._index(node)
+        for neighbor in self._neighbor_indices(index):
+            self._remove_slot(self._find_slot(index, neighbor))
+        del self._node_index[node]
+        self._nodes[index] = None
+        self._n_removed_nodes += 1
+        self._maybe_rebuild()
+
+    def add_edge(self, u, v, **attr):
+        """Add a bond between `u` and `v`, adding the nodes if needed.
+
+        If the bond already exists, its bond order is updated.
+        """
+        self.add_node(u)
+        self.add_node(v)
+        i = self._node_index[u]
+        j = self._node_index[v]
+        bond_order = attr.get("bond_order", np.nan)
+        slot = self._find_slot(i, j)
+        if slot is not None:
+            if "bond_order" in attr:
+                self._bond_order[slot] = bond_order
+            return
+        slot = self._n_edge_slots
+        if slot == len(self._edge_u):
+            self._grow_edges(slot + 1)
+        self._edge_u[slot] = i
+        self._edge_v[slot] = j
+        self._bond_order[slot] = bond_order
+        self._edge_alive[slot] = True
+        self._n_edge_slots += 1
+        self._n_edges += 1
+        self._pending.setdefault(i, {})[j] = slot
+        self._pending.setdefault(j, {})[i] = slot
+        self._maybe_rebuild()
+
+    def add_edges_from(self, edges, **attr):
+        """Add bonds given as (u, v) or (u, v, attribute dict) tuples.
+
+        Equivalent to calling `add_edge` on each bond in turn. Unless the
+        batch is small compared to the graph, bonds that already exist are
+        found with one sorted search over the bond arrays and the new bonds
+        are appended in one step.
+        """
+        edges = list(edges)
+        if self._is_small_batch(edges):
+            for edge in edges:
+                if len(edge) == 3:
+                    self.add_edge(edge[0], edge[1], **{**attr, **edge[2]})
+                else:
+                    self.add_edge(edge[0], edge[1], **attr)
+            return
+        n_edges = len(edges)
+        for edge in edges:
+            self.add_node(edge[0])
+            self.add_node(edge[1])
+        node_index = self._node_index
+        i = np.fromiter((node_index[edge[0]] for edge in edges), np.int64, n_edges)
+        j = np.fromiter((node_index[edge[1]] for edge in edges), np.int64, n_edges)
+        attrs = [{**attr, **edge[2]} if len(edge) == 3 else attr for edge in edges]
+        has_order = np.fromiter(("bond_order" in a for a in attrs), bool, n_edges)
+        bond_orders = np.fromiter(
+            (a.get("bond_order", np.nan) for a in attrs), float, n_edges
+        )
+        # Keep the last of repeated bonds, in the order they were given.
+        keys = self._edge_keys(i, j)
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = np.sort(n_edges - 1 - last)
+        i, j = i[last], j[last]
+        has_order, bond_orders = has_order[last], bond_orders[last]
+
+        slots = self._find_slots(i, j)
+        found = slots >= 0
+        update = found & has_order
+        self._bond_order[slots[update]] = bond_orders[update]
+        new = ~found
+        if new.any():
+            start = self._append_edges(i[new], j[new], bond_orders[new])
+            self._index_new_edges(start)
+
+    def remove_edges_from(self, edges):
+        """Remove bonds given as (u, v) tuples, ignoring missing bonds."""
+        node_index = self._node_index
+        edges = [
+            edge for edge in edges if edge[0] in node_index and edge[1] in node_index
+        ]
+        if self._is_small_batch(edges):
+            for edge in edges:
+                slot = self._find_slot(node_index[edge[0]], node_index[edge[1]])
+                if slot is not None:
+                    self._remove_slot(slot)
+        else:
+            n_edges = len(edges)
+            i = np.fromiter((node_index[edge[0]] for edge in edges), np.int64, n_edges)
+            j = np.fromiter((node_index[edge[1]] for edge in edges), np.int64, n_edges)
+            slots = self._find_slots(i, j)
+            for slot in np.unique(slots[slots >= 0]).tolist():
+                self._remove_slot(slot)
+        self._maybe_rebuild()
+
+    def remove_edge(self, u, v):
+        """Remove the bond between `u` and `v`."""
+        slot = None
+        if u in self._node_index and v in self._node_index:
+            slot = self._find_slot(self._node_index[u], self._node_index[v])
+        if slot is None:
+            raise nx.NetworkXError(f"The edge {u}-{v} is not in the graph")
+        self._remove_slot(slot)
+        self._maybe_rebuild()
+
+    def has_edge(self, u, v):
+        """Return True if `u` and `v` are bonded."""
+        i = self._node_index.get(u)
+        j = self._node_index.get(v)
+        if i is None or j is None:
+            return False
+        return self._find_slot(i, j) is not None
+
+    def neighbors(self, node):
+        """Return an iterator over the nodes bonded to `node`."""
+        nodes = self._nodes
+        return iter([nodes[j] for j in self._neighbor_indices(self._index(node))])
+
+    def edges(self, data=False, default=None):
+        """Return a list of the bonds in the graph.
+
+        Parameters
+        ----------
+        data : bool or str, optional, default=False
+            If False, return (u, v) tuples. If True, return (u, v, dict)
+            tuples where the dict holds the bond order. If a string, return
+            (u, v, value) tuples with the value of that attribute.
+        default : optional, default=None
+            Value used for bonds without the attribute requested by `data`.
+        """
+        return self._edge_tuples(self._alive_slots(), data, default)
+
+    def edges_among(self, nodes, data=False):
+        """Return the bonds between the given nodes.
+
+        The bonds are selected with a vectorized mask over the bond arrays,
+        without building a subgraph.
+
+        Parameters
+        ----------
+        nodes : iterable of mb.Compound
+            The nodes to return the bonds between.
+        data : bool or str, optional, default=False
+            See `edges`.
+        """
+        node_index = self._node_index
+        indices = [node_index[node] for node in nodes if node in node_index]
+        keep = np.zeros(len(self._nodes), dtype=bool)
+        keep[indices] = True
+        slots = self._alive_slots()
+        slots = slots[keep[self._edge_u[slots]] & keep[self._edge_v[slots]]]
+        return self._edge_tuples(slots, data)
+
+    def _edge_tuples(self, slots, data=False, default=None):
+        """Return the bonds in `slots` in the format of `edges`."""
+        nodes = self._nodes
+        u = [nodes[i] for i in self._edge_u[slots].tolist()]
+        v = [nodes[i] for i in self._edge_v[slots].tolist()]
+        if data is False:
+            return list(zip(u, v))
+        bond_orders = self._bond_order[slots].tolist()
+        if data is True:
+            attrs = [{} if bo != bo else {"bond_order": bo} for bo in bond_orders]
+        elif data == "bond_order":
+            attrs = [default if bo != bo else bo for bo in bond_orders]
+        else:
+            attrs = [default] * len(bond_orders)
+        return list(zip(u, v, attrs))
+
+    def edge_array(self):
+        """Return the bonds as arrays of node positions in `self.nodes()`.
+
+        Returns
+        -------
+        edges : np.ndarray, shape=(n_bonds, 2), dtype=int
+            Indices into `self.nodes()` of the two particles in each bond.
+        bond_orders : np.ndarray, shape=(n_bonds,), dtype=float
+            The bond order of each bond, NaN where it was not set.
+        """
+        if self._n_removed_nodes:
+            self._compact()
+        slots = self._alive_slots()
+        edges = np.column_stack((self._edge_u[slots], self._edge_v[slots]))
+        return edges, self._bond_order[slots].copy()
+
+    def copy(self):
+        """Return a copy of the graph."""
+        new = self.__class__()
+        new._nodes = list(self._nodes)
+        new._node_index = dict(self._node_index)
+        new._n_removed_nodes = self._n_removed_nodes
+        for attr in (
+            "_edge_u",
+            "_edge_v",
+            "_bond_order",
+            "_edge_alive",
+            "_indptr",
+            "_indices",
+            "_csr_edges",
+        ):
+            setattr(new, attr, getattr(self, attr).copy())
+        new._n_edge_slots = self._n_edge_slots
+        new._n_edges = self._n_edges
+        new._csr_edge_slots = self._csr_edge_slots
+        new._pending = {i: dict(row) for i, row in self._pending.items()}
+        return new
+
+    def subgraph(self, nodes):
+        """Return a new graph with `nodes` and the bonds between them.
+
+        Nodes that are not in the graph are ignored. Unlike networkx, the
+        result is an independent copy rather than a view.
+        """
+        node_index = self._node_index
+        indices = {node_index[node] for node in nodes if node in node_index}
+        indices = np.fromiter(indices, dtype=np.int64, count=len(indices))
+        indices.sort()
+        keep = np.zeros(len(self._nodes), dtype=bool)
+        keep[indices] = True
+        slots = self._alive_slots()
+        u = self._edge_u[slots]
+        v = self._edge_v[slots]
+        slots = slots[keep[u] & keep[v]]
+        return self._from_arrays(
+            [self._nodes[i] for i in indices.tolist()],
+            indices,
+            self._edge_u[slots],
+            self._edge_v[slots],
+            self._bond_order[slots],
+        )
+
+    def merge(self, other):
+        """Add the particles and bonds of another bond graph in place.
+
+        The cost scales with the size of `other`. Attributes from `other`
+        take precedence for bonds present in both graphs. `other` may be a
+        `CompactBondGraph` or a networkx-based `BondGraph`, and is not
+        modified.
+
+        Parameters
+        ----------
+        other : CompactBondGraph or BondGraph
+            The bond graph to merge into this one.
+        """
+        if not isinstance(other, CompactBondGraph):
+            self.add_nodes_from(other.nodes())
+            self.add_edges_from(other.edges(data=True))
+            return
+        n_before = len(self._nodes)
+        node_index = self._node_index
+        overlap = any(node in node_index for node in other._node_index)
+        self.add_nodes_from(other._node_index)
+        slots = other._alive_slots()
+        if not len(slots):
+            return
+        if overlap:
+            for u, v, attrs in other.edges(data=True):
+                self.add_edge(u, v, **attrs)
+            return
+        # All of the nodes of other are new, so none of its bonds exist yet.
+        # Nodes of other are appended in its order, skipping removed ones.
+        remap = np.full(len(other._nodes), -1, dtype=np.int64)
+        alive = np.fromiter(
+            (node is not None for node in other._nodes),
+            dtype=bool,
+            count=len(other._nodes),
+        )
+        remap[alive] = np.arange(n_before, n_before + alive.sum())
+        start = self._append_edges(
+            remap[other._edge_u[slots]],
+            remap[other._edge_v[slots]],
+            other._bond_order[slots],
+        )
+        self._index_new_edges(start)
+
+    def merge_many(self, others):
+        """Add the particles and bonds of several bond graphs in place.
+
+        Equivalent to calling `merge` on each graph in turn. When none of the
+        graphs share particles with each other or with this one, their bonds
+        are appended with one set of array operations and the adjacency is
+        rebuilt once.
+
+        Parameters
+        ----------
+        others : list of CompactBondGraph or BondGraph
+            The bond graphs to merge into this one. They are not modified.
+        """
+        others = list(others)
+        disjoint = all(isinstance(other, CompactBondGraph) for other in others)
+        if disjoint:
+            node_index = self._node_index
+            seen = set()
+            for other in others:
+                for node in other._node_index:
+                    if node in node_index or node in seen:
+                        disjoint = False
+                        break
+                    seen.add(node)
+                if not disjoint:
+                    break
+        if not disjoint:
+            for other in others:
+                self.merge(other)
+            return
+        offset = len(self._nodes)
+        edge_u, edge_v, bond_orders = [], [], []
+        for other in others:
+            # Nodes of other are appended in its order, skipping removed ones.
+            remap = np.full(len(other._nodes), -1, dtype=np.int64)
+            alive = np.fromiter(
+                (node is not None for node in other._nodes),
+                dtype=bool,
+                count=len(other._nodes),
+            )
+            n_alive = int(alive.sum())
+            remap[alive] = np.arange(offset, offset + n_alive)
+            offset += n_alive
+            slots = other._alive_slots()
+            edge_u.append(remap[other._edge_u[slots]])
+            edge_v.append(remap[other._edge_v[slots]])
+            bond_orders.append(other._bond_order[slots])
+            self.add_nodes_from(other._node_index)
+        if not others:
+            return
+        start = self._append_edges(
+            np.concatenate(edge_u), np.concatenate(edge_v), np.concatenate(bond_orders)
+        )
+        self._index_new_edges(start)
+
+    def connected_components(self):
+        """Return list of connected bond component of bondgraph."""
+        if self._n_removed_nodes:
+            self._compact()
+        n_nodes = len(self._nodes)
+        slots = self._alive_slots()
+        adjacency = coo_matrix(
+            (
+                np.ones(len(slots), dtype=np.int8),
+                (self._edge_u[slots], self._edge_v[slots]),
+            ),
+            shape=(n_nodes, n_nodes),
+        )
+        _, labels = _csgraph_components(adjacency, directed=False)
+        # Components are labeled in order of their first node
+        order = np.argsort(labels, kind="stable")
+        splits = np.flatnonzero(np.diff(labels[order])) + 1
+        nodes = self._nodes
+        return [
+            [nodes[i] for i in component.tolist()]
+            for component in np.split(order, splits)
+            if len(component)
+        ]
+
+    def _bfs(self, source):
+        seen = set()
+        nextlevel = {source}
+        while nextlevel:
+            thislevel = nextlevel
+            nextlevel = set()
+            for v in thislevel:
+                if v not in seen:
+                    yield v
+                    seen.add(v)
+                    nextlevel.update(self.neighbors(v))
+
+    @classmethod
+    def _from_arrays(cls, nodes, old_indices, edge_u, edge_v, bond_orders):
+        """Build a graph from nodes and bonds given as old node indices."""
+        new = cls()
+        new._nodes = list(nodes)
+        new._node_index = {node: i for i, node in enumerate(new._nodes)}
+        if len(old_indices):
+            remap = np.full(int(old_indices.max()) + 1, -1, dtype=np.int64)
+            remap[old_indices] = np.arange(len(old_indices))
+            edge_u = remap[edge_u]
+            edge_v = remap[edge_v]
+        new._append_edges(edge_u, edge_v, bond_orders)
+        new._build_csr()
+        return new
+
+    def _index(self, node):
+        try:
+            return self._node_index[node]
+        except KeyError:
+            raise nx.NetworkXError(f"The node {node} is not in the graph.")
+
+    def _alive_slots(self):
+        return np.flatnonzero(self._edge_alive[: self._n_edge_slots])
+
+    def _append_edges(self, edge_u, edge_v, bond_orders):
+        """Append bonds to the edge arrays and return the first new slot."""
+        start = self._n_edge_slots
+        stop = start + len(edge_u)
+        if stop > len(self._edge_u):
+            self._grow_edges(stop)
+        self._edge_u[start:stop] = edge_u
+        self._edge_v[start:stop] = edge_v
+        self._bond_order[start:stop] = bond_orders
+        self._edge_alive[start:stop] = True
+        self._n_edge_slots = stop
+        self._n_edges += stop - start
+        return start
+
+    def _index_new_edges(self, start):
+        """Add the bonds appended from slot `start` on to the adjacency."""
+        n_new = self._n_edge_slots - start
+        if n_new > max(self._min_pending, self._n_edges // 8):
+            self._build_csr()
+            return
+        for slot in range(start, self._n_edge_slots):
+            i = int(self._edge_u[slot])
+            j = int(self._edge_v[slot])
+            self._pending.setdefault(i, {})[j] = slot
+            self._pending.setdefault(j, {})[i] = slot
+        self._maybe_rebuild()
+
+    def _is_small_batch(self, edges):
+        """Return True if bonds are best handled one at a time.
+
+        Finding bonds in bulk sorts all bonds of the graph, which only pays
+        off for batches that are not tiny compared to the graph.
+        """
+        return 32 * len(edges) < self._n_edges
+
+    def _edge_keys(self, i, j):
+        """Return one integer per bond between indices i and j, in any order."""
+        n_nodes = len(self._nodes)
+        return np.minimum(i, j) * n_nodes + np.maximum(i, j)
+
+    def _find_slots(self, i, j):
+        """Return the slots of the bonds between indices i and j, -1 if none."""
+        result = np.full(len(i), -1, dtype=np.int64)
+        slots = self._alive_slots()
+        if not len(slots) or not len(i):
+            return result
+        existing = self._edge_keys(self._edge_u[slots], self._edge_v[slots])
+        order = np.argsort(existing, kind="stable")
+        existing = existing[order]
+        keys = self._edge_keys(i, j)
+        positions = np.minimum(np.searchsorted(existing, keys), len(existing) - 1)
+        found = existing[positions] == keys
+        result[found] = slots[order[positions[found]]]
+        return result
+
+    def _grow_edges(self, size):
+        """Reallocate the edge arrays to hold at least `size` bonds."""
+        capacity = max(size, 2 * len(self._edge_u), 16)
+        n_slots = self._n_edge_slots
+        for attr in ("_edge_u", "_edge_v", "_bond_order", "_edge_alive"):
+            old = getattr(self, attr)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:n_slots] = old[:n_slots]
+            setattr(self, attr, new)
+
+    def _find_slot(self, i, j):
+        """Return the slot of the bond between indices i and j, or None."""
+        row = self._pending.get(i)
+        if row is not None and j in row:
+            return row[j]
+        if i < len(self._indptr) - 1:
+            start, stop = self._indptr[i], self._indptr[i + 1]
+            if start != stop:
+                hits = np.flatnonzero(self._indices[start:stop] == j)
+                for slot in self._csr_edges[start + hits].tolist():
+                    if self._edge_alive[slot]:
+                        return slot
+        return None
+
+    def _neighbor_indices(self, i):
+        """Return the indices of the nodes bonded to index i."""
+        neighbors = []
+        if i < len(self._indptr) - 1:
+            start, stop = self._indptr[i], self._indptr[i + 1]
+            if start != stop:
+                alive = self._edge_alive[self._csr_edges[start:stop]]
+                neighbors = self._indices[start:stop][alive].tolist()
+        row = self._pending.get(i)
+        if row:
+            neighbors.extend(row)
+        return neighbors
+
+    def _remove_slot(self, slot):
+        self._edge_alive[slot] = False
+        self._n_edges -= 1
+        if slot >= self._csr_edge_slots:
+            i = int(self._edge_u[slot])
+            j = int(self._edge_v[slot])
+            self._pending[i].pop(j, None)
+            self._pending[j].pop(i, None)
+
+    def _maybe_rebuild(self):
+        """Fold pending bonds into the CSR once there are enough of them."""
+        min_pending = self._min_pending
+        n_stale = self._n_edge_slots - self._n_edges + self._n_removed_nodes
+        if n_stale > min_pending and n_stale > len(self._nodes) // 2:
+            self._compact()
+        else:
+            n_pending = self._n_edge_slots - self._csr_edge_slots
+            if n_pending > min_pending and n_pending > self._n_edges // 8:
+                self._build_csr()
+
+    def _compact(self):
+        """Drop removed nodes and bonds, renumbering the remaining nodes."""
+        alive_nodes = np.fromiter(
+            (node is not None for node in self._nodes),
+            dtype=bool,
+            count=len(self._nodes),
+        )
+        old_indices = np.flatnonzero(alive_nodes)
+        slots = self._alive_slots()
+        compacted = self._from_arrays(
+            [self._nodes[i] for i in old_indices.tolist()],
+            old_indices,
+            self._edge_u[slots],
+            self._edge_v[slots],
+            self._bond_order[slots],
+        )
+        self.__dict__.update(compacted.__dict__)
+
+    def _build_csr(self):
+        """Rebuild the CSR adjacency from all live bonds."""
+        n_nodes = len(self._nodes)
+        slots = self._alive_slots()
+        u = self._edge_u[slots]
+        v = self._edge_v[slots]
+        rows = np.concatenate((u, v))
+        order = np.argsort(rows, kind="stable")
+        self._indices = np.concatenate((v, u))[order]
+        self._csr_edges = np.concatenate((slots, slots))[order]
+        self._indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_nodes), out=self._indptr[1:])
+        self._csr_edge_slots = self._n_edge_slots
+        self._pending = {}
+
+
+_BACKENDS = {"networkx": BondGraph, "compact": CompactBondGraph}
+_default_backend = "networkx"
+
+
+def set_default_backend(backend):
+    """Set the bond graph backend used for newly created Compounds.
+
+    Parameters
+    ----------
+    backend : str
+        Either "networkx" for `BondGraph` or "compact" for
+        `CompactBondGraph`.
+    """
+    global _default_backend
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"Unknown bond graph backend {backend}. "
+            f"Available backends are: {list(_BACKENDS)}"
+        )
+    _default_backend = backend
+
+
+def get_default_backend():
+    """Return the name of the bond graph backend used for new Compounds."""
+    return _default_backend
+
+
+def new_bond_graph(backend=None):
+    """Return an empty bond graph of the given or default backend."""
+    if backend is None:
+        backend = _default_backend
+    try:
+        return _BACKENDS[backend]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown bond graph backend {backend}. "
+            f"Available backends are: {list(_BACKENDS)}"
+        )
+
+
+def backend_of(bond_graph):
+    """Return the name of the backend of a bond graph."""
+    for name, cls in _BACKENDS.items():
+        if isinstance(bond_graph, cls):
+            return name
+    raise ValueError(f"{bond_graph} is not a known bond graph type.")
@@ -86,7 +86,7 @@ class Proxy(Compound):
         # Remember that we're cloning the new one of self.
         clone_of[self] = newone
 
-        newone.name = deepcopy(self.name)
+        newone._name = self._name
         newone.wrapped = clone(self.wrapped)
 
         if hasattr(self, "index"):
@@ -1,11 +1,14 @@
 """Module for working with mBuild Compounds."""
 
+import gc
 import itertools
 import logging
 import os
 import tempfile
+import weakref
 from collections import OrderedDict
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
+from contextlib import contextmanager
 from copy import deepcopy
 from typing import Sequence
 
@@ -15,21 +18,38 @@ import numpy as np
 from boltons.setutils import IndexedSet
 from ele.element import Element, element_from_name, element_from_symbol
 from ele.exceptions import ElementError
+from scipy.sparse import csr_matrix
 from treelib import Tree
 
 from mbuild import conversion
-from mbuild.bond_graph import BondGraph
+from mbuild.bond_graph import backend_of, new_bond_graph
 from mbuild.box import Box
-from mbuild.coordinate_transform import _rotate, _translate
+from mbuild.coordinate_transform import (
+    _rotate,
+    _translate,
+    quaternions_to_matrices,
+)
 from mbuild.exceptions import MBuildError
+from mbuild.neighbors import CellList, neighbor_pairs
 from mbuild.periodic_kdtree import PeriodicKDTree
-from mbuild.utils.io import import_, run_from_ipython
+from mbuild.utils.io import has_freud, import_, run_from_ipython
 from mbuild.utils.jsutils import overwrite_nglview_default
 
-__all__ = ["clone", "Compound", "Particle"]
+__all__ = ["clone", "replicate", "Compound", "Particle"]
 
 logger = logging.getLogger(__name__)
 
+# Orders the moves of Compounds against the geometric summaries cached on
+# their descendants, see `Compound._coordinates_changed`.
+_coordinates_clock = itertools.count(1)
+
+
+# Compounds with a transform pending on their particles, see
+# `Compound._defer_transform`. Coordinates are only checked for pending
+# transforms while it is not empty.
+_pending_transforms = weakref.WeakSet()
+
+
 bond_orderDict = {
     "single": 1.0,
     "double": 2.0,
@@ -54,14 +74,140 @@ def clone(existing_compound, clone_of=None, root_container=None):
     clone_of : dict, optional, default None,
     root_container : mb.Compound, optional, default None,
     """
+    # Only the outermost call, not the clones of Port anchors made while
+    # cloning a hierarchy, moves the clone out of its ancestors' transforms.
+    ancestor_transform = None
     if clone_of is None:
         clone_of = dict()
+        ancestor_transform = existing_compound._ancestor_transform()
 
     newone = existing_compound._clone(clone_of=clone_of, root_container=root_container)
     existing_compound._clone_bonds(clone_of=clone_of)
+    if ancestor_transform is not None:
+        newone._compose_transform(ancestor_transform)
     return newone
 
 
+def replicate(prototype, n, positions=None, rotations=None):
+    """Create many copies of a Compound.
+
+    A faster alternative to calling `clone` and then moving each copy in a
+    loop. The bonds of the prototype are collected once and added to each
+    copy by particle index, and the coordinates of all copies are computed
+    with a single broadcasted transform.
+
+    Parameters
+    ----------
+    prototype : mb.Compound
+        The Compound to copy. It is not modified.
+    n : int
+        The number of copies to create.
+    positions : array-like, shape=(n, 3), dtype=float, optional, default=None
+        The center of each copy, as set by `Compound.translate_to`. If None,
+        the copies are centered where the prototype is.
+    rotations : array-like, shape=(n, 3, 3), dtype=float, optional, default=None
+        Rotation matrix applied to each copy about its center, before it is
+        moved to its position. If None, the copies are not rotated.
+
+    Returns
+    -------
+    copies : list of mb.Compound
+        The `n` copies of the prototype, each the root of its own hierarchy.
+
+    See Also
+    --------
+    clone : Copy a single Compound
+    """
+    n = int(n)
+    if n < 0:
+        raise ValueError(f"The number of copies cannot be negative, got {n}.")
+    if positions is not None:
+        positions = np.asarray(positions, dtype=float)
+        if positions.shape != (n, 3):
+            raise ValueError(
+                f"positions must have shape ({n}, 3), got {positions.shape}."
+            )
+    if rotations is not None:
+        rotations = np.asarray(rotations, dtype=float)
+        if rotations.shape != (n, 3, 3):
+            raise ValueError(
+                f"rotations must have shape ({n}, 3, 3), got {rotations.shape}."
+            )
+
+    # Copies are made from the stored positions of the prototype, so only
+    # transforms pending on its ancestors remain to be applied to them.
+    prototype._apply_pending_transforms()
+    ancestor_transform = prototype._ancestor_transform()
+
+    # Bonds of the prototype as indices into its particles.
+    leaves = list(prototype.particles(include_ports=True))
+    particles = list(prototype.particles())
+    leaf_indices = {leaf: i for i, leaf in enumerate(leaves)}
+    bonds = []
+    for particle1, particle2, data in prototype.bonds(return_bond_order=True):
+        try:
+            bonds.append((leaf_indices[particle1], leaf_indices[particle2], data))
+        except KeyError:
+            raise MBuildError(
+                "Replication failed. Compound contains bonds to "
+                "Particles outside of its containment hierarchy."
+            )
+    if prototype.children:
+        root_bond_graph = prototype.root.bond_graph
+        if root_bond_graph is None:
+            bond_graph_class = type(new_bond_graph())
+        else:
+            bond_graph_class = type(root_bond_graph)
+    particle_indices = [leaf_indices[particle] for particle in particles]
+
+    # New coordinates of all copies, including ports.
+    new_xyz = None
+    if positions is not None or rotations is not None:
+        xyz = np.array([leaf.pos for leaf in leaves], dtype=float).reshape(-1, 3)
+        center = prototype.center
+        if rotations is None:
+            new_xyz = np.repeat((xyz - center)[np.newaxis], n, axis=0)
+        else:
+            new_xyz = np.einsum("nij,kj->nki", rotations, xyz - center)
+        if positions is None:
+            new_xyz += center
+        else:
+            new_xyz += positions[:, np.newaxis, :]
+    set_pos_directly = all(type(leaf).pos is Compound.pos for leaf in leaves)
+
+    # Creating many objects triggers cyclic garbage collections that scan
+    # every object alive, while nothing created here is garbage.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        copies = []
+        for i in range(n):
+            clone_of = dict()
+            newone = prototype._clone(clone_of=clone_of)
+            new_leaves = [clone_of[leaf] for leaf in leaves]
+            if prototype.children:
+                newone.bond_graph = bond_graph_class()
+                newone.bond_graph.add_nodes_from(
+                    new_leaves[j] for j in particle_indices
+                )
+                newone.bond_graph.add_edges_from(
+                    (new_leaves[j], new_leaves[k], data) for j, k, data in bonds
+                )
+            if new_xyz is not None:
+                if set_pos_directly:
+                    for leaf, pos in zip(new_leaves, new_xyz[i]):
+                        leaf._pos[:] = pos
+                else:
+                    newone.xyz_with_ports = new_xyz[i]
+            elif ancestor_transform is not None:
+                newone._compose_transform(ancestor_transform)
+            copies.append(newone)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return copies
+
+
 class Compound(object):
     """A building block in the mBuild hierarchy.
 
@@ -82,8 +228,8 @@ class Compound(object):
         }
 
     with Compound being the composite, and Particle playing the role of the
-    primitive (leaf) part, where Particle is in fact simply an alias to the
-    Compound class.
+    primitive (leaf) part. Particle is a lightweight subclass of Compound, and
+    any Compound without children is treated as a particle.
 
     Compound maintains a list of children (other Compounds contained within),
     and provides a means to tag the children with labels, so that the compounds
@@ -122,8 +268,10 @@ class Compound(object):
 
     Attributes
     ----------
-    bond_graph : mb.BondGraph
+    bond_graph : mb.BondGraph or mb.bond_graph.CompactBondGraph
         Graph-like object that stores bond information for this Compound
+    bond_graph_backend : str
+        The type of bond graph used by the root of the hierarchy
     children : list
         Contains all children (other Compounds).
     labels : OrderedDict
@@ -143,8 +291,58 @@ class Compound(object):
     root
     xyz
     xyz_with_ports
+    array_backed
     """
 
+    # Attributes set on every Compound are stored in slots. `__dict__` keeps
+    # other attributes, including those of subclasses, working as before.
+    __slots__ = (
+        "_name",
+        "_pos",
+        "parent",
+        "children",
+        "labels",
+        "referrers",
+        "_bond_graph",
+        "port_particle",
+        "_element",
+        "_box",
+        "_periodicity",
+        "_charge",
+        "_mass",
+        "__dict__",
+        "__weakref__",
+    )
+
+    # Coordinate buffer bookkeeping used by `array_backed` mode. These are
+    # class-level defaults so that particles only pay for them once they are
+    # part of an array-backed hierarchy.
+    _array_backed = False
+    _xyz_buffer = None
+    _xyz_buffer_port_mask = None
+    # Incremented on the root whenever particles are added to or removed from
+    # its hierarchy. The coordinate buffer is valid for the generation it was
+    # built at.
+    _hierarchy_generation = 0
+    _xyz_buffer_generation = None
+    # Ordered index of the particles of a hierarchy, only set on its root.
+    _particle_index = None
+    # Cached bounds of the particle coordinates, see `_geometry_summary`.
+    _geometry = None
+    # Tick of `_coordinates_clock` at which the particles below this Compound
+    # were last moved together, see `_coordinates_changed`.
+    _moved_at = 0
+    # Affine transform (4x4) not yet applied to the particles below this
+    # Compound, see `_defer_transform`.
+    _pending_transform = None
+    # Bond graphs and particles added during `batch`, merged into the bond
+    # graph of the root the next time it is used.
+    _pending_bond_graphs = None
+    # Nesting depth of `batch` on this Compound, and the Compounds whose box
+    # size is checked when the outermost batch exits.
+    _batch_depth = 0
+    _pending_box_checks = None
+
     def __init__(
         self,
         subcompounds=None,
@@ -164,22 +362,21 @@ class Compound(object):
                 raise ValueError(
                     f"Compound.name should be a string. You passed {name}."
                 )
-            self.name = name
+            self._name = name
         else:
-            self.name = self.__class__.__name__
+            self._name = self.__class__.__name__
 
         if pos is not None:
-            self._pos = np.asarray(pos, dtype=float)
+            self._pos = np.array(pos, dtype=float)
         else:
             self._pos = np.zeros(3)
 
         self.parent = None
-        self.children = list()
-        self.labels = OrderedDict()
-        self.referrers = set()
+        self._allocate_containers()
 
-        self.bond_graph = BondGraph()
-        self.bond_graph.add_node(self)
+        # The bond graph is allocated lazily, once this Compound has children
+        # or bonds; particles are added to the bond graph of their root.
+        self._bond_graph = None
 
         self.port_particle = port_particle
 
@@ -208,6 +405,18 @@ class Compound(object):
             self._charge = charge
             self._mass = mass
 
+    def _allocate_containers(self):
+        """Give self its own children, labels and referrers containers."""
+        self.children = list()
+        self.labels = OrderedDict()
+        self.referrers = set()
+
+    def _add_referrer(self, referrer):
+        """Record that `referrer` labels self."""
+        if not isinstance(self.referrers, set):
+            self.referrers = set()
+        self.referrers.add(referrer)
+
     def particles(self, include_ports=False):
         """Return all Particles of the Compound.
 
@@ -224,15 +433,83 @@ class Compound(object):
         if not self.children:
             yield self
         else:
-            for particle in self._particles(include_ports):
-                yield particle
+            yield from self._particles(include_ports)
 
     def _particles(self, include_ports=False):
         """Return all Particles of the Compound."""
-        for child in self.successors():
-            if not child.children:
-                if include_ports or not child.port_particle:
-                    yield child
+        if not self.children:
+            return
+        if self.parent is not None and self.root._particle_index is None:
+            # Walk self instead of indexing the whole hierarchy, so that
+            # alternately adding parts and reading the coordinates of a few
+            # of them does not cost the size of the hierarchy each time.
+            yield from self._walk_particles(include_ports)
+            return
+        index, start, stop = self._particle_range()
+        if include_ports:
+            yield from index.leaves[start:stop]
+        else:
+            yield from index.particles[index.n_before[start] : index.n_before[stop]]
+
+    def _walk_particles(self, include_ports=False):
+        """Return the Particles of the Compound in order, without the index."""
+        particles = []
+        stack = list(reversed(self.children))
+        while stack:
+            compound = stack.pop()
+            if compound.children:
+                stack.extend(reversed(compound.children))
+            elif include_ports or not compound.port_particle:
+                particles.append(compound)
+        return particles
+
+    def _particle_range(self):
+        """Return the particle index of the hierarchy and the range of self.
+
+        The particles below any Compound are contiguous in the index of its
+        root. The range refers to `index.leaves`, which includes Port
+        particles.
+        """
+        index = self._hierarchy_index()
+        _, _, start, stop = index.subtrees[self]
+        return index, start, stop
+
+    def _hierarchy_index(self):
+        """Return the particle index of the root, building it if needed."""
+        root = self.root
+        index = root._particle_index
+        if index is None:
+            index = root._particle_index = _ParticleIndex(root)
+        return index
+
+    def _contains(self, compound):
+        """Return True if `compound` is self or is below self in the hierarchy.
+
+        Compares the preorder intervals of the particle index of the root, so
+        it takes constant time once the index is built.
+        """
+        if compound is self:
+            return True
+        if not self.children:
+            return False
+        index = self._hierarchy_index()
+        first, end, start, stop = index.subtrees[self]
+        position = index.positions.get(compound)
+        if position is not None:
+            return start <= position < stop
+        interval = index.subtrees.get(compound)
+        return interval is not None and first <= interval[0] < end
+
+    def _invalidate_particle_index(self):
+        """Drop the particle index of self and mark its coordinate buffer stale.
+
+        Must be called on the root whenever particles are added to or removed
+        from a hierarchy.
+        """
+        if self._particle_index is not None:
+            self._particle_index = None
+        if self._xyz_buffer is not None:
+            self._hierarchy_generation += 1
 
     def successors(self):
         """Yield Compounds below self in the hierarchy.
@@ -268,7 +545,12 @@ class Compound(object):
 
     def _n_particles(self, include_ports=False):
         """Return the number of Particles in the Compound."""
-        return sum(1 for _ in self._particles(include_ports))
+        if not self.children:
+            return 0
+        index, start, stop = self._particle_range()
+        if include_ports:
+            return stop - start
+        return int(index.n_before[stop] - index.n_before[start])
 
     def _contains_only_ports(self):
         if self.children:
@@ -449,12 +731,10 @@ class Compound(object):
         mb.Compound
             The Compound at the top of self's hierarchy
         """
-        parent = None
-        for parent in self.ancestors():
-            pass
-        if parent is None:
-            return self
-        return parent
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return root
 
     def particles_by_name(self, name):
         """Return all Particles of the Compound with a specific name.
@@ -469,9 +749,7 @@ class Compound(object):
         mb.Compound
             The next Particle in the Compound with the user-specified name
         """
-        for particle in self.particles():
-            if particle.name == name:
-                yield particle
+        yield from self._particles_at(self.particle_indices_by_name(name))
 
     def particles_by_element(self, element):
         """Return all Particles of the Compound with a specific element.
@@ -486,11 +764,71 @@ class Compound(object):
         mb.Compound
             The next Particle in the Compound with the user-specified element
         """
+        yield from self._particles_at(self.particle_indices_by_element(element))
+
+    def particle_indices_by_name(self, name):
+        """Return the indices of the Particles of the Compound with a name.
+
+        The lookup uses an index of particle names kept by the root of the
+        hierarchy, which is rebuilt after particles are added, removed or
+        renamed.
+
+        Parameters
+        ----------
+        name : str
+            Only the indices of particles with this name are returned
+
+        Returns
+        -------
+        np.ndarray, shape=(n,), dtype=int
+            The positions of the particles in `Compound.particles()`, which
+            are also their rows in `Compound.xyz`, in increasing order
+        """
+        if not self.children:
+            return np.arange(int(self.name == name))
+        return self._local_indices(self._hierarchy_index().names().get(name))
+
+    def particle_indices_by_element(self, element):
+        """Return the indices of the Particles of the Compound with an element.
+
+        Parameters
+        ----------
+        element : str or ele.Element
+            element abbreviation or element
+
+        Returns
+        -------
+        np.ndarray, shape=(n,), dtype=int
+            The positions of the particles in `Compound.particles()`, which
+            are also their rows in `Compound.xyz`, in increasing order
+        """
         if not isinstance(element, Element):
             element = ele.element_from_symbol(element)
-        for particle in self.particles():
-            if particle.element == element:
-                yield particle
+        if not self.children:
+            return np.arange(int(self.element == element))
+        elements = self._hierarchy_index().elements()
+        return self._local_indices(elements.get(element.symbol))
+
+    def _local_indices(self, positions):
+        """Return the positions in the root particles that are below self.
+
+        `positions` are sorted indices into the particles of the root, or
+        None. They are returned relative to the first particle of self.
+        """
+        if positions is None:
+            return np.empty(0, dtype=int)
+        index, start, stop = self._particle_range()
+        first, last = index.n_before[start], index.n_before[stop]
+        lo, hi = np.searchsorted(positions, [first, last])
+        return positions[lo:hi] - first
+
+    def _particles_at(self, indices):
+        """Return the Particles of the Compound at the given indices."""
+        if not self.children:
+            return [self] * len(indices)
+        index, start, _ = self._particle_range()
+        first = index.n_before[start]
+        return [index.particles[first + i] for i in indices.tolist()]
 
     @property
     def mass(self):
@@ -576,6 +914,123 @@ class Compound(object):
                 "not at the bottom of the containment hierarchy."
             )
 
+    @contextmanager
+    def batch(self):
+        """Defer bookkeeping of edits to the Compound until the block exits.
+
+        Within a `with compound.batch():` block, bond graphs of Compounds
+        added below `compound` are not merged into the bond graph of the root
+        one at a time, and box size checks are not run after every change.
+        When the outermost block exits, the pending bond graphs are merged in
+        one go and each changed box is checked once. Merging also happens
+        earlier if the bond graph is used within the block, so the Compound
+        can be queried and edited as usual.
+
+        This speeds up building a Compound with many calls to `add`, `remove`
+        and `add_bond` in a loop.
+
+        Yields
+        ------
+        mb.Compound
+            self
+
+        Examples
+        --------
+        >>> box = mb.Compound()
+        >>> with box.batch():
+        ...     for i in range(1000):
+        ...         box.add(mb.clone(molecule))
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._end_batch()
+
+    def _batch_owner(self):
+        """Return the closest of self and its ancestors in a batch, or None."""
+        compound = self
+        while compound is not None:
+            if compound._batch_depth:
+                return compound
+            compound = compound.parent
+        return None
+
+    def _end_batch(self):
+        """Apply the bookkeeping deferred by `batch`."""
+        root = self.root
+        if root._pending_bond_graphs is not None:
+            root._merge_pending_bond_graphs()
+        box_checks = self._pending_box_checks
+        if box_checks is None:
+            return
+        self._pending_box_checks = None
+        for compound in box_checks:
+            compound._check_box_size()
+
+    def _defer_box_check(self):
+        """Check the box size now, or when the enclosing batch exits."""
+        owner = self._batch_owner()
+        if owner is None:
+            self._check_box_size()
+            return
+        if owner._pending_box_checks is None:
+            owner._pending_box_checks = dict()
+        owner._pending_box_checks[self] = None
+
+    def _check_box_size(self):
+        """Warn if the box of self is smaller than its bounding box."""
+        if self.box is None:
+            return
+        if np.asarray((self.box.lengths < self.get_boundingbox().lengths)).any():
+            logger.warning(
+                "Compound.box.lengths < Compound.boundingbox.lengths. "
+                "There may be particles outside of the defined "
+                "simulation box."
+            )
+
+    def _defer_bond_graph(self, new_child):
+        """Queue the bonds and particles of new_child for the root of self."""
+        items = []
+        if new_child.bond_graph is not None:
+            items.append(new_child.bond_graph)
+            new_child.bond_graph = None
+        if not new_child.children:
+            items.append(new_child)
+        if items:
+            root = self.root
+            if root._pending_bond_graphs is None:
+                root._pending_bond_graphs = []
+            root._pending_bond_graphs.extend(items)
+
+    def _merge_pending_bond_graphs(self):
+        """Merge the bond graphs and particles queued by `batch` into self.
+
+        Consecutive bond graphs are merged with a single call to
+        `merge_many`, and queued particles are added in the order they were
+        added to the hierarchy.
+        """
+        pending = self._pending_bond_graphs
+        self._pending_bond_graphs = None
+        if self._bond_graph is None:
+            self._bond_graph = new_bond_graph()
+        bond_graph = self._bond_graph
+        graphs = []
+        for item in pending:
+            if not isinstance(item, Compound):
+                graphs.append(item)
+                continue
+            if graphs:
+                bond_graph.merge_many(graphs)
+                graphs = []
+            # Particles that have since been given children are containers.
+            if not item.children:
+                bond_graph.add_node(item)
+        if graphs:
+            bond_graph.merge_many(graphs)
+
     def add(
         self,
         new_child,
@@ -612,8 +1067,8 @@ class Compound(object):
             Checks and warns if compound box is smaller than its bounding box after adding new_child.
         """
         # Support batch add via lists, tuples and sets.
-        # If iterable, we will first compose all the bondgraphs of individual
-        # Compounds in the list for efficiency
+        # If iterable, we will first merge all the bondgraphs of individual
+        # Compounds in the list into the root bond graph for efficiency
         from mbuild.port import Port
 
         if isinstance(new_child, Iterable) and not isinstance(new_child, str):
@@ -633,24 +1088,17 @@ class Compound(object):
                     if child.bond_graph and not isinstance(self, Port):
                         temp_bond_graphs.append(child.bond_graph)
 
-            # compose children bond_graphs; make sure we actually have graphs to compose
-            children_bond_graph = None
-            if len(temp_bond_graphs) != 0:
-                children_bond_graph = nx.compose_all(temp_bond_graphs)
-
-            if (
-                temp_bond_graphs
-                and not isinstance(self, Port)
-                and children_bond_graph is not None
-            ):
+            if temp_bond_graphs and not isinstance(self, Port):
                 # If anything is added at self level, it is no longer a particle
                 # search for self in self.root.bond_graph and remove self
-                if self.root.bond_graph.has_node(self):
-                    self.root.bond_graph.remove_node(self)
-                # compose the bond graph of all the children with the root
-                self.root.bond_graph = nx.compose(
-                    self.root.bond_graph, children_bond_graph
-                )
+                if self.root.bond_graph is None:
+                    self.root.bond_graph = new_bond_graph()
+                root_bond_graph = self.root.bond_graph
+                if root_bond_graph.has_node(self):
+                    root_bond_graph.remove_node(self)
+                # merge the bond graphs of the children into the root in place
+                for child_bond_graph in temp_bond_graphs:
+                    root_bond_graph.merge(child_bond_graph)
             for i, child in enumerate(compound_list):
                 child.bond_graph = None
                 if label is not None:
@@ -678,9 +1126,9 @@ class Compound(object):
             self._mass = 0
 
         # Create children and labels on the first add operation
-        if self.children is None:
+        if not isinstance(self.children, list):
             self.children = list()
-        if self.labels is None:
+        if not isinstance(self.labels, dict):
             self.labels = OrderedDict()
 
         if containment:
@@ -688,20 +1136,48 @@ class Compound(object):
                 raise MBuildError(
                     f"Part {new_child} already has a parent: {new_child.parent}"
                 )
+            was_particle = not self.children
             self.children.append(new_child)
             new_child.parent = self
+            new_child._invalidate_particle_index()
+            new_child._invalidate_xyz_buffer()
+            self.root._invalidate_particle_index()
+            ancestor_transform = new_child._ancestor_transform()
+            if ancestor_transform is not None:
+                # Keep the coordinates of new_child where they are.
+                new_child._compose_transform(np.linalg.inv(ancestor_transform))
 
-            if new_child.bond_graph is not None and not isinstance(self, Port):
+            if (
+                not isinstance(self, Port)
+                and not was_particle
+                and self._batch_owner() is not None
+            ):
+                # Merged into the bond graph of the root when the batch exits
+                self._defer_bond_graph(new_child)
+            elif not isinstance(self, Port) and (
+                new_child.bond_graph is not None or not new_child.children
+            ):
+                # The bond graph of the root is only allocated once it has
+                # children or bonds
+                if self.root.bond_graph is None:
+                    self.root.bond_graph = new_bond_graph()
+                root_bond_graph = self.root.bond_graph
                 # If anything is added at self level, it is no longer a particle
                 # search for self in self.root.bond_graph and remove self
-                if self.root.bond_graph.has_node(self):
-                    self.root.bond_graph.remove_node(self)
-                # Compose bond_graph of new child
-                self.root.bond_graph = nx.compose(
-                    self.root.bond_graph, new_child.bond_graph
-                )
-
-                new_child.bond_graph = None
+                if root_bond_graph.has_node(self):
+                    root_bond_graph.remove_node(self)
+                # Merge bond_graph of new child into the root in place
+                if new_child.bond_graph is not None:
+                    root_bond_graph.merge(new_child.bond_graph)
+                    new_child.bond_graph = None
+                # Particles do not allocate their own bond graph, add them here
+                if not new_child.children:
+                    root_bond_graph.add_node(new_child)
+
+            if was_particle:
+                self._coordinates_changed()
+            else:
+                self._extend_geometry(new_child)
 
         # Add new_part to labels. Does not currently support batch add.
         if label is None:
@@ -722,7 +1198,7 @@ class Compound(object):
             raise MBuildError(f'Label "{label}" already exists in {self}.')
         else:
             self.labels[label] = new_child
-        new_child.referrers.add(self)
+        new_child._add_referrer(self)
 
         if inherit_periodicity and isinstance(new_child, Compound):
             self.periodicity = new_child.periodicity
@@ -755,7 +1231,9 @@ class Compound(object):
 
         # Check that bounding box is within box after adding compound
         if self.box and check_box_size:
-            if (
+            if self._batch_owner() is not None:
+                self._defer_box_check()
+            elif (
                 np.array(self.box.lengths) < np.array(self.get_boundingbox().lengths)
             ).any():
                 logger.warning(
@@ -773,68 +1251,173 @@ class Compound(object):
             The Compound(s) to be removed from self
         reset_labels : bool, optional, default=False
             If True, the Compound labels will be reset
+
+        Notes
+        -----
+        All objects are removed in a single batch, so removing many particles
+        at once is much faster than removing them one at a time. The cost is
+        proportional to the number of removed particles and the size of the
+        Compounds containing them, not to the size of the whole hierarchy.
         """
         # Preprocessing and validating input type
         from mbuild.port import Port
 
         if not hasattr(objs_to_remove, "__iter__"):
             objs_to_remove = [objs_to_remove]
-        objs_to_remove = set(objs_to_remove)
+        objs_to_remove = list(dict.fromkeys(objs_to_remove))
 
         # If nothing is to be remove, do nothing
         if len(objs_to_remove) == 0:
             return
 
         # Remove Port objects separately
-        ports_removed = set()
-        for obj in objs_to_remove:
-            if isinstance(obj, Port):
-                ports_removed.add(obj)
-                self._remove(obj)
-                obj.parent.children.remove(obj)
-                self._remove_references(obj)
-
-        objs_to_remove = objs_to_remove - ports_removed
+        ports_removed = [obj for obj in objs_to_remove if isinstance(obj, Port)]
+        objs_to_remove = [obj for obj in objs_to_remove if not isinstance(obj, Port)]
 
         # Get particles to remove
-        particles_to_remove = set(
-            [particle for obj in objs_to_remove for particle in obj.particles()]
+        particles_to_remove = dict.fromkeys(
+            particle for obj in objs_to_remove for particle in obj.particles()
         )
 
-        # Recursively get container compounds to remove
-        to_remove = list()
-
-        def _check_if_empty(child):
-            if child in to_remove:
-                return
-            if set(child.particles()).issubset(particles_to_remove):
-                if child.parent:
-                    to_remove.append(child)
-                    _check_if_empty(child.parent)
-                else:
-                    logger.warning(f"This will remove all particles in {self}")
-            return
-
-        for particle in particles_to_remove:
-            _check_if_empty(particle)
+        # Get container compounds emptied by the removal, by counting the
+        # removed particles below each ancestor of a removed particle.
+        to_remove = self._emptied_compounds(particles_to_remove)
+        removed = set(to_remove)
+        # The index from before the removal, if any, maps anchors to Ports.
+        index = self.root._particle_index
 
-        # Remove obj from bondgraph
-        for removed_part in to_remove:
-            self._remove(removed_part)
+        # Remove bonds and add ports to both particles of each bond cut
+        new_ghost_ports = self._remove_bonds_to(particles_to_remove, removed)
 
-        # Remove references to object
-        for removed_part in to_remove:
-            if removed_part.parent is not None:
-                removed_part.parent.children.remove(removed_part)
-            self._remove_references(removed_part)
+        # Only the top-most removed parts are detached, the parts below them
+        # stay in place.
+        ghost_port_parents = self._detach_parts(
+            ports_removed + [part for part in to_remove if part.parent not in removed]
+        )
 
         # Remove ghost ports
-        self._prune_ghost_ports()
+        removed.update(ports_removed)
+        self._prune_ghost_ports(ghost_port_parents, removed, index, new_ghost_ports)
+        self.root._invalidate_particle_index()
 
         # Reorder labels
         if reset_labels:
             self.reset_labels()
 
+    def _detach_parts(self, parts):
+        """Worker for remove(). Detach parts and their subtrees from the hierarchy.
+
+        The parts keep their coordinates and the parts below them. Returns
+        the parents that keep their place in the hierarchy.
+        """
+        # Transforms pending on the ancestors of the parts stop applying to
+        # them, so they are moved to the parts themselves.
+        ancestor_transforms = [(part, part._ancestor_transform()) for part in parts]
+        for part in parts:
+            part.parent._drop_geometry()
+        parents = self._detach_children(parts)
+        self._remove_all_references(parts)
+        for part, ancestor_transform in ancestor_transforms:
+            if ancestor_transform is not None:
+                part._compose_transform(ancestor_transform)
+            # The summaries below part no longer see the moves of its former
+            # ancestors.
+            part._coordinates_changed()
+        return parents
+
+    def _emptied_compounds(self, particles_to_remove):
+        """Worker for remove(). Return the parts left empty by a removal.
+
+        Each removed particle adds one to the count of its parent; a parent
+        whose count reaches its number of particles is empty and passes its
+        count on to its own parent in turn.
+        """
+        n_removed = dict.fromkeys(particles_to_remove, 1)
+        n_removed_below = {}
+        n_particles = {}
+        pending = list(particles_to_remove)
+        to_remove = []
+        while pending:
+            part = pending.pop()
+            parent = part.parent
+            if parent is None:
+                logger.warning(f"This will remove all particles in {self}")
+                continue
+            to_remove.append(part)
+            count = n_removed_below.get(parent, 0) + n_removed[part]
+            n_removed_below[parent] = count
+            if parent not in n_particles:
+                n_particles[parent] = parent._n_particles()
+            if count == n_particles[parent]:
+                n_removed[parent] = count
+                pending.append(parent)
+        return to_remove
+
+    def _remove_bonds_to(self, particles, removed):
+        """Worker for remove(). Remove the bonds of particles being removed.
+
+        For each bond between a removed particle and one left behind, a Port
+        is added to both particles in the same order as `remove_bond`, so
+        that the Ports are labelled as before. Returns the Ports added to
+        removed particles whose parent is not removed, which are ghost Ports
+        once the particles are detached.
+        """
+        from mbuild.port import Port
+
+        bond_graph = self.root.bond_graph
+        if bond_graph is None:
+            return []
+        ghost_ports = []
+        for particle in particles:
+            if particle not in removed or not bond_graph.has_node(particle):
+                continue
+            for neighbor in list(bond_graph.neighbors(particle)):
+                if neighbor in removed:
+                    continue
+                bond_vector = particle.pos - neighbor.pos
+                if np.allclose(bond_vector, np.zeros(3)):
+                    logger.warning(
+                        "Particles {} and {} overlap! Ports will not be added.".format(
+                            particle, neighbor
+                        )
+                    )
+                    continue
+                distance = np.linalg.norm(bond_vector)
+                port = Port(
+                    anchor=particle, orientation=-bond_vector, separation=distance / 2
+                )
+                particle.parent.add(port, "port[$]")
+                if particle.parent not in removed:
+                    ghost_ports.append(port)
+                neighbor.parent.add(
+                    Port(
+                        anchor=neighbor,
+                        orientation=bond_vector,
+                        separation=distance / 2,
+                    ),
+                    "port[$]",
+                )
+            bond_graph.remove_node(particle)
+        return ghost_ports
+
+    def _detach_children(self, parts):
+        """Worker for remove(). Detach parts from their parents.
+
+        The children of each parent are filtered once, however many of them
+        are removed. Returns the parents that keep their place in the
+        hierarchy.
+        """
+        removed = set(parts)
+        by_parent = {}
+        for part in parts:
+            if part.parent is not None:
+                by_parent.setdefault(part.parent, set()).add(part)
+        for parent, children in by_parent.items():
+            parent.children[:] = [
+                child for child in parent.children if child not in children
+            ]
+        return [parent for parent in by_parent if parent not in removed]
+
     def reset_labels(self):
         """Reset Compound labels so that substituents and ports are renumbered, indexed from port[0] to port[N], where N-1 is the number of ports.
 
@@ -895,53 +1478,90 @@ class Compound(object):
             new_labels[label] = child
         self.labels = new_labels
 
-    def _prune_ghost_ports(self):
-        """Worker for remove(). Remove all ports whose anchor has been deleted."""
-        all_ports_list = list(self.all_ports())
-        particles = list(self.particles())
-        for port in all_ports_list:
-            if port.anchor not in particles:
-                self._remove(port)
-                port.parent.children.remove(port)
-                self._remove_references(port)
-
-    def _remove(self, removed_part):
-        """Worker for remove(). Removes bonds."""
-        if self.root.bond_graph.has_node(removed_part):
-            for neighbor in nx.neighbors(self.root.bond_graph.copy(), removed_part):
-                self.root.remove_bond((removed_part, neighbor))
-            self.root.bond_graph.remove_node(removed_part)
+    def _prune_ghost_ports(self, parents, removed, index=None, ghost_ports=()):
+        """Worker for remove(). Remove all ports whose anchor has been deleted.
+
+        With the particle index from before the removal, the Ports anchored
+        to the removed parts are looked up directly, along with `ghost_ports`
+        added since. Otherwise only the Ports below `parents` and their
+        ancestors are considered, which is where the Ports of the removed
+        particles are attached.
+        """
+        from mbuild.port import Port
+
+        if index is not None:
+            # Ports detached along with a removed part are no longer below
+            # the root.
+            root = self.root
+            by_anchor = index.anchors()
+            ghost_ports = list(ghost_ports) + [
+                port
+                for part in removed
+                for port in by_anchor.get(part, ())
+                if port not in removed and port.root is root
+            ]
+        else:
+            containers = set()
+            for parent in parents:
+                for container in [parent, *parent.ancestors()]:
+                    if container in containers:
+                        break
+                    containers.add(container)
+            ghost_ports = [
+                child
+                for container in containers
+                for child in container.children
+                if isinstance(child, Port) and child.anchor in removed
+            ]
+        if ghost_ports:
+            self._detach_children(ghost_ports)
+            self._remove_all_references(ghost_ports)
 
     def _remove_references(self, removed_part):
         """Remove labels pointing to this part and vice versa."""
-        removed_part.parent = None
-
-        # Remove labels in the hierarchy pointing to this part.
-        referrers_to_remove = set()
-        for referrer in removed_part.referrers:
-            if removed_part not in referrer.ancestors():
-                for label, referred_part in list(referrer.labels.items()):
-                    if referred_part is removed_part:
-                        del referrer.labels[label]
-                        referrers_to_remove.add(referrer)
-        removed_part.referrers -= referrers_to_remove
-
-        # Remove labels in this part pointing into the hierarchy.
-        labels_to_delete = []
-        if isinstance(removed_part, Compound):
-            for label, part in list(removed_part.labels.items()):
-                if not isinstance(part, Compound):
-                    for p in part:
-                        self._remove_references(p)
-                elif removed_part not in part.ancestors():
-                    try:
-                        part.referrers.discard(removed_part)
-                    except KeyError:
-                        pass
-                    else:
-                        labels_to_delete.append(label)
-        for label in labels_to_delete:
-            removed_part.labels.pop(label, None)
+        self._remove_all_references([removed_part])
+
+    def _remove_all_references(self, removed_parts):
+        """Remove labels between these parts and the rest of the hierarchy.
+
+        The parts below each removed part keep their labels among themselves.
+        The labels of each referrer are scanned once for all removed parts.
+        """
+        # The former parent labels each part, even if it is not recorded as
+        # a referrer, as in a clone.
+        by_referrer = {}
+        for removed_part in removed_parts:
+            if removed_part.parent is not None:
+                by_referrer.setdefault(removed_part.parent, set()).add(removed_part)
+            removed_part.parent = None
+        for removed_part in removed_parts:
+            for part in itertools.chain([removed_part], removed_part.successors()):
+                # Labels in the hierarchy pointing to this part.
+                for referrer in part.referrers:
+                    if referrer.root is not removed_part:
+                        by_referrer.setdefault(referrer, set()).add(part)
+                # Labels in this part pointing into the hierarchy.
+                labels = part.labels
+                for label, target in list(labels.items()):
+                    if isinstance(target, list):
+                        kept = [p for p in target if p.root is removed_part]
+                        if len(kept) < len(target):
+                            labels[label] = kept
+                    elif target.root is not removed_part:
+                        if part in target.referrers:
+                            target.referrers.discard(part)
+                        del labels[label]
+        for referrer, referred_parts in by_referrer.items():
+            labels = referrer.labels
+            for label in [
+                label
+                for label, part in labels.items()
+                if not isinstance(part, list) and part in referred_parts
+            ]:
+                del labels[label]
+            for removed_part in referred_parts:
+                if referrer in removed_part.referrers:
+                    removed_part.referrers.discard(referrer)
 
     def referenced_ports(self):
         """Return all Ports referenced by this Compound.
@@ -965,7 +1585,15 @@ class Compound(object):
         """
         from mbuild.port import Port
 
-        return [s for s in self.successors() if isinstance(s, Port)]
+        if not self.children:
+            return []
+        if self.parent is not None and self.root._particle_index is None:
+            return [s for s in self.successors() if isinstance(s, Port)]
+        # The Ports below self are contiguous in the preorder of the index.
+        index = self._hierarchy_index()
+        first, end, _, _ = index.subtrees[self]
+        start, stop = np.searchsorted(index.port_order, [first + 1, end])
+        return index.ports[start:stop]
 
     def available_ports(self):
         """Return all unoccupied Ports referenced by this Compound.
@@ -1009,12 +1637,21 @@ class Compound(object):
         if not self.parent:
             return None
         # Get all nodes within n edges (graph_depth=n) using BFS
-        top_ancestor = [i for i in self.ancestors()][-1]
-        neighbor_dict = nx.single_source_shortest_path_length(
-            top_ancestor.bond_graph, self, cutoff=graph_depth
-        )
+        bond_graph = self.root.bond_graph
+        if not bond_graph.has_node(self):
+            raise nx.NodeNotFound(f"Source {self} is not in G")
+        all_neighbors = {self}
+        this_level = [self]
+        for _ in range(graph_depth):
+            next_level = []
+            for particle in this_level:
+                for neighbor in bond_graph.neighbors(particle):
+                    if neighbor not in all_neighbors:
+                        all_neighbors.add(neighbor)
+                        next_level.append(neighbor)
+            this_level = next_level
         # Exclude the source node itself
-        all_neighbors = {n for n, depth in neighbor_dict.items() if depth > 0}
+        all_neighbors.discard(self)
         return all_neighbors
 
     def bonds(self, return_bond_order=False):
@@ -1037,13 +1674,12 @@ class Compound(object):
         bond_graph.edges_iter : Iterates over all edges in a BondGraph
         Compound.n_bonds : Returns the total number of bonds in the Compound and sub-Compounds
         """
-        if self.root.bond_graph:
+        bond_graph = self.root.bond_graph
+        if bond_graph:
             if self.root == self:
-                return self.root.bond_graph.edges(data=return_bond_order)
+                return bond_graph.edges(data=return_bond_order)
             else:
-                return self.root.bond_graph.subgraph(self.particles()).edges(
-                    data=return_bond_order
-                )
+                return bond_graph.edges_among(self.particles(), data=return_bond_order)
         else:
             return iter(())
 
@@ -1100,7 +1736,7 @@ class Compound(object):
             "triple", "aromatic" or "unspecified", are supported but will be deprecated.
         """
         if self.root.bond_graph is None:
-            self.root.bond_graph = BondGraph()
+            self.root.bond_graph = new_bond_graph()
         if bond_order is None:
             bond_order = 0.0
         elif isinstance(bond_order, str):
@@ -1117,6 +1753,89 @@ class Compound(object):
             particle_pair[0], particle_pair[1], bond_order=bond_order
         )
 
+    def add_bonds(self, pairs, bond_orders=None):
+        """Add bonds between many pairs of Particles at once.
+
+        Equivalent to calling `add_bond` for each pair, but the bond orders
+        are validated and the bond graph is updated in bulk.
+
+        Parameters
+        ----------
+        pairs : array-like, shape=(n_bonds, 2), dtype=int
+            The indices of the two Particles of each bond, in the order of
+            `Compound.particles()` and of `Compound.xyz`.
+        bond_orders : float or array-like, shape=(n_bonds,), optional, default=None
+            Bond order of all bonds, or of each bond. Available options are
+            the same as for `add_bond`.
+        """
+        pairs = self._check_particle_pairs(pairs)
+        if not len(pairs):
+            return
+        if bond_orders is None:
+            bond_orders = 0.0
+        else:
+            bond_orders = np.asarray(bond_orders)
+            if bond_orders.dtype.kind in "US":
+                logger.warning(
+                    "Bond order as a string will be deprecated and replaced with "
+                    "floats."
+                )
+                bond_orders = np.vectorize(
+                    lambda bond_order: bond_orderDict.get(bond_order, 0.0),
+                    otypes=[float],
+                )(bond_orders)
+            bond_orders = np.broadcast_to(bond_orders.astype(float), (len(pairs),))
+            invalid = ~np.isin(bond_orders, [0.0, 1.0, 2.0, 3.0, 1.5])
+            if invalid.any():
+                raise ValueError(
+                    f"Invalid bond_order given {bond_orders[invalid][0]}. Available "
+                    "bond orders are: 0.0, 1.0, 2.0, 3.0, 1.5"
+                )
+        particles = list(self.particles())
+        self._add_bonds(
+            [(particles[i], particles[j]) for i, j in pairs.tolist()], bond_orders
+        )
+
+    def _add_bonds(self, bonds, bond_orders):
+        """Add bonds between pairs of Particles without validating them.
+
+        `bond_orders` is one bond order for all bonds, or one per bond.
+        """
+        if not bonds:
+            return
+        root = self.root
+        if root.bond_graph is None:
+            root.bond_graph = new_bond_graph()
+        bond_orders = np.asarray(bond_orders, dtype=float)
+        if bond_orders.ndim == 0 or np.all(bond_orders == bond_orders[0]):
+            root.bond_graph.add_edges_from(bonds, bond_order=float(bond_orders.flat[0]))
+        else:
+            root.bond_graph.add_edges_from(
+                (u, v, {"bond_order": bond_order})
+                for (u, v), bond_order in zip(bonds, bond_orders.tolist())
+            )
+
+    def _check_particle_pairs(self, pairs):
+        """Return pairs of particle indices as an (n, 2) array of integers."""
+        pairs = np.asarray(pairs)
+        if pairs.size == 0:
+            return np.empty((0, 2), dtype=int)
+        if (
+            pairs.ndim != 2
+            or pairs.shape[1] != 2
+            or not np.issubdtype(pairs.dtype, np.integer)
+        ):
+            raise ValueError(
+                "Bonds must be given as an (n, 2) array of particle indices, "
+                f"got an array of shape {pairs.shape} and dtype {pairs.dtype}."
+            )
+        n_particles = self.n_particles
+        if pairs.min() < 0 or pairs.max() >= n_particles:
+            raise ValueError(
+                f"Particle indices must be between 0 and {n_particles - 1}."
+            )
+        return pairs
+
     def generate_bonds(self, name_a, name_b, dmin, dmax):
         """Add Bonds between all pairs of types a/b within [dmin, dmax].
 
@@ -1133,31 +1852,34 @@ class Compound(object):
         """
         if self.box is None:
             self.box = self.get_boundingbox()
-        particle_kdtree = PeriodicKDTree.from_compound(compound=self, leafsize=10)
-        particle_array = np.array(list(self.particles()))
-        added_bonds = list()
-        for p1 in self.particles_by_name(name_a):
-            nearest = self.particles_in_range(
-                p1,
-                dmax,
-                max_particles=20,
-                particle_kdtree=particle_kdtree,
-                particle_array=particle_array,
-            )
-            for p2 in nearest:
-                if p2 == p1:
-                    continue
-                bond_tuple = (p1, p2) if id(p1) < id(p2) else (p2, p1)
-                if bond_tuple in added_bonds:
-                    continue
-                min_dist = self.min_periodic_distance(p2.pos, p1.pos)
-                if (p2.name == name_b) and (dmin <= min_dist <= dmax):
-                    self.add_bond((p1, p2))
-                    added_bonds.append(bond_tuple)
+        a_indices = self.particle_indices_by_name(name_a)
+        b_indices = self.particle_indices_by_name(name_b)
+        if not (len(a_indices) and len(b_indices)):
+            return
+        # All pairs of an a and a b particle within dmax in one query of a
+        # tree holding the b particles only.
+        xyz = self.xyz
+        a_kdtree, b_kdtree = (
+            PeriodicKDTree.from_compound(self, leafsize=10, data=xyz[indices])
+            for indices in (a_indices, b_indices)
+        )
+        pairs = b_kdtree.sparse_distance_matrix(a_kdtree, dmax, output_type="ndarray")
+        keep = pairs["v"] >= dmin
+        bonds = np.column_stack(
+            (a_indices[pairs["j"][keep]], b_indices[pairs["i"][keep]])
+        )
+        bonds = bonds[bonds[:, 0] != bonds[:, 1]]
+        if name_a == name_b:
+            # Each pair of particles is found once in each order.
+            bonds = bonds[bonds[:, 0] < bonds[:, 1]]
+        self.add_bonds(bonds)
 
     def freud_generate_bonds(self, name_a, name_b, dmin, dmax):
         """Add Bonds between all pairs of types a/b within [dmin, dmax].
 
+        Uses freud if it is installed, and the cell list neighbor search of
+        `mbuild.neighbors` otherwise.
+
         Parameters
         ----------
         name_a : str
@@ -1169,15 +1891,13 @@ class Compound(object):
         dmax : float
             The maximum distance (in nm) between Particles for considering a bond
         """
+        a_indices = self.particle_indices_by_name(name_a)
+        b_indices = self.particle_indices_by_name(name_b)
+        if not has_freud:
+            self._cell_list_generate_bonds(a_indices, b_indices, dmin, dmax)
+            return
         freud = import_("freud")
         moved_positions, freud_box = self.to_freud()
-        a_indices = []
-        b_indices = []
-        for i, part in enumerate(self.particles()):
-            if part.name == name_a:
-                a_indices.append(i)
-            if part.name == name_b:
-                b_indices.append(i)
         # If we are looking to create bonds between the same species
         # then the indices added to a_indices and b_indices will be identical.
         # In this case we need to make sure that we don't try to bond a particle
@@ -1200,9 +1920,27 @@ class Compound(object):
             dict(r_min=dmin, r_max=dmax, exclude_ii=exclude_ii),
         ).toNeighborList()
 
-        part_list = [part for part in self.particles(include_ports=False)]
-        for i, j in nlist[:]:
-            self.add_bond((part_list[a_indices[i]], part_list[b_indices[j]]))
+        neighbors = np.asarray(nlist[:], dtype=int).reshape(-1, 2)
+        self.add_bonds(
+            np.column_stack((a_indices[neighbors[:, 0]], b_indices[neighbors[:, 1]]))
+        )
+
+    def _cell_list_generate_bonds(self, a_indices, b_indices, dmin, dmax):
+        """Bond particles a to particles b within [dmin, dmax] using a cell list."""
+        xyz = self.xyz
+        box = self.box if self.box else self.get_boundingbox()
+        cell_list = CellList(
+            xyz[b_indices], dmax, box=box, periodicity=self.periodicity
+        )
+        i, j, _ = cell_list.query(xyz[a_indices], r_min=dmin)
+        a_indices = np.asarray(a_indices, dtype=int)[i]
+        b_indices = np.asarray(b_indices, dtype=int)[j]
+        # Each pair of particles is bonded once, and never to itself.
+        distinct = a_indices != b_indices
+        pairs = np.unique(
+            np.sort(np.column_stack((a_indices, b_indices))[distinct], axis=1), axis=0
+        )
+        self.add_bonds(pairs)
 
     def remove_bond(self, particle_pair):
         """Delete a bond between a pair of Particles.
@@ -1212,8 +1950,6 @@ class Compound(object):
         particle_pair : indexable object, length=2, dtype=mb.Compound
             The pair of Particles to remove the bond between
         """
-        from mbuild.port import Port
-
         if self.root.bond_graph is None or not self.root.bond_graph.has_edge(
             *particle_pair
         ):
@@ -1222,6 +1958,43 @@ class Compound(object):
             )
             return
         self.root.bond_graph.remove_edge(*particle_pair)
+        self._add_bond_ports(particle_pair)
+
+    def remove_bonds(self, pairs, add_ports=False):
+        """Delete the bonds between many pairs of Particles at once.
+
+        Parameters
+        ----------
+        pairs : array-like, shape=(n_bonds, 2), dtype=int
+            The indices of the two Particles of each bond, in the order of
+            `Compound.particles()` and of `Compound.xyz`.
+        add_ports : bool, optional, default=False
+            Add a Port to both Particles of each removed bond, pointing along
+            the bond, as `remove_bond` does.
+        """
+        pairs = self._check_particle_pairs(pairs)
+        if not len(pairs):
+            return
+        particles = list(self.particles())
+        bonds = {}
+        for i, j in pairs.tolist():
+            bonds[frozenset((i, j))] = (particles[i], particles[j])
+        bonds = list(bonds.values())
+        bond_graph = self.root.bond_graph
+        for particle_pair in bonds:
+            if bond_graph is None or not bond_graph.has_edge(*particle_pair):
+                raise MBuildError(
+                    "Bond between {} and {} doesn't exist!".format(*particle_pair)
+                )
+        bond_graph.remove_edges_from(bonds)
+        if add_ports:
+            for particle_pair in bonds:
+                self._add_bond_ports(particle_pair)
+
+    def _add_bond_ports(self, particle_pair):
+        """Add a Port to each Particle of a removed bond, pointing along it."""
+        from mbuild.port import Port
+
         bond_vector = particle_pair[0].pos - particle_pair[1].pos
         if np.allclose(bond_vector, np.zeros(3)):
             logger.warning(
@@ -1257,6 +2030,10 @@ class Compound(object):
         The position of a Compound containing children can't be set.
         """
         if not self.children:
+            if _pending_transforms:
+                T = self._ancestor_transform()
+                if T is not None:
+                    return T[:3, :3] @ self._pos + T[:3, 3]
             return self._pos
         else:
             return self.center
@@ -1264,7 +2041,12 @@ class Compound(object):
     @pos.setter
     def pos(self, value):
         if not self.children:
-            self._pos = value
+            T = self._ancestor_transform()
+            if T is not None:
+                T = np.linalg.inv(T)
+                value = T[:3, :3] @ np.asarray(value, dtype=float) + T[:3, 3]
+            self._store_pos(value)
+            self._coordinates_changed()
         else:
             raise MBuildError("Can't set position of Compound with children.")
 
@@ -1298,15 +2080,23 @@ class Compound(object):
             raise TypeError("box must be specified as an mbuild.Box")
         if self.port_particle and box is not None:
             raise ValueError("Ports cannot have a box")
+        self._box = box
         # Make sure the box is bigger than the bounding box
         if box is not None:
-            if np.asarray((box.lengths < self.get_boundingbox().lengths)).any():
-                logger.warning(
-                    "Compound.box.lengths < Compound.boundingbox.lengths. "
-                    "There may be particles outside of the defined "
-                    "simulation box."
-                )
-        self._box = box
+            self._defer_box_check()
+
+    @property
+    def name(self):
+        """Get the name of the Compound."""
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        if not self.children:
+            index = self.root._particle_index
+            if index is not None:
+                index.by_name = None
 
     @property
     def element(self):
@@ -1321,6 +2111,160 @@ class Compound(object):
             self._element = element
         else:
             self._element = ele.element_from_symbol(element)
+        index = self.root._particle_index
+        if index is not None:
+            index.by_element = None
+
+    @property
+    def array_backed(self):
+        """Whether particle coordinates are stored in a root-owned array.
+
+        When True, the root of the hierarchy owns a single contiguous
+        (n, 3) array holding the coordinates of all of its particles
+        (including Port particles), and the `pos` of each particle is a view
+        into one row of that array. `xyz`, `xyz_with_ports`, `translate`,
+        `rotate` and `force_overlap` then operate on slices of the array
+        instead of visiting every particle. The array is rebuilt lazily the
+        first time coordinates are accessed after particles are added or
+        removed.
+
+        Only the root Compound of a hierarchy can change this setting;
+        Compounds added to an array-backed root use the root's array.
+
+        Notes
+        -----
+        The positions returned by `pos` for particles of an array-backed
+        Compound are updated in place when the Compound is moved. Copy them
+        (e.g. with `np.array(particle.pos)`) if the previous values are
+        needed after a move.
+        """
+        return self.root._array_backed
+
+    @array_backed.setter
+    def array_backed(self, value):
+        if self.parent is not None:
+            raise MBuildError(
+                "array_backed can only be set on the root of a hierarchy. "
+                f"Set it on {self.root} instead."
+            )
+        self._array_backed = bool(value)
+        if not self._array_backed:
+            self._invalidate_xyz_buffer()
+
+    @property
+    def bond_graph(self):
+        """Get the bond graph of the Compound.
+
+        Only the root of a hierarchy holds a bond graph. Bond graphs queued
+        by `batch` are merged into it first.
+        """
+        if self._pending_bond_graphs is not None:
+            self._merge_pending_bond_graphs()
+        return self._bond_graph
+
+    @bond_graph.setter
+    def bond_graph(self, bond_graph):
+        if self._pending_bond_graphs is not None:
+            self._pending_bond_graphs = None
+        self._bond_graph = bond_graph
+
+    @property
+    def bond_graph_backend(self):
+        """The type of bond graph used to store the bonds of this hierarchy.
+
+        None if the hierarchy does not have a bond graph yet; particles that
+        are not part of a hierarchy only allocate one when they are bonded.
+
+        Either "networkx", which stores bonds in a `BondGraph` (a subclass of
+        `networkx.Graph`), or "compact", which stores bonds in a
+        `CompactBondGraph` backed by integer arrays and uses much less memory
+        for large systems. New Compounds use the backend set with
+        `mbuild.bond_graph.set_default_backend`.
+
+        Only the root Compound of a hierarchy can change the backend, which
+        converts its existing bond graph. Compounds added to a root are merged
+        into the root's bond graph, whatever their own backend was.
+        """
+        bond_graph = self.root.bond_graph
+        if bond_graph is None:
+            return None
+        return backend_of(bond_graph)
+
+    @bond_graph_backend.setter
+    def bond_graph_backend(self, backend):
+        if self.parent is not None:
+            raise MBuildError(
+                "bond_graph_backend can only be set on the root of a hierarchy. "
+                f"Set it on {self.root} instead."
+            )
+        bond_graph = new_bond_graph(backend)
+        if self.bond_graph is not None:
+            bond_graph.merge(self.bond_graph)
+        self.bond_graph = bond_graph
+
+    def _build_xyz_buffer(self):
+        """Copy particle coordinates into a new buffer owned by self."""
+        self._apply_pending_transforms()
+        leaves = self._hierarchy_index().leaves
+        if any(type(leaf).pos is not Compound.pos for leaf in leaves):
+            logger.warning(
+                f"{self} contains particles that do not store their own "
+                "positions. Disabling array_backed."
+            )
+            self._array_backed = False
+            self._invalidate_xyz_buffer()
+            return None
+        buffer = np.empty((len(leaves), 3), dtype=float)
+        port_mask = np.empty(len(leaves), dtype=bool)
+        for i, leaf in enumerate(leaves):
+            buffer[i] = leaf._pos
+            port_mask[i] = leaf.port_particle
+            leaf._pos = buffer[i]
+        self._xyz_buffer = buffer
+        self._xyz_buffer_port_mask = port_mask
+        self._xyz_buffer_generation = self._hierarchy_generation
+        return buffer
+
+    def _invalidate_xyz_buffer(self):
+        """Drop the coordinate buffer owned by self, if any.
+
+        Particles keep their current positions; the buffer is rebuilt on the
+        next coordinate access.
+        """
+        if self._xyz_buffer is not None:
+            self._xyz_buffer = None
+            self._xyz_buffer_port_mask = None
+
+    def _xyz_buffer_rows(self):
+        """Return the root and the rows of its coordinate buffer used by self.
+
+        Returns None if the hierarchy is not array-backed. The buffer follows
+        the order of the particle index of the root, in which the particles of
+        any Compound are contiguous, so the rows are those of its subtree.
+        """
+        root = self.root
+        if not root._array_backed or not root.children or not self.children:
+            return None
+        if (
+            root._xyz_buffer is None
+            or root._xyz_buffer_generation != root._hierarchy_generation
+        ):
+            if root._build_xyz_buffer() is None:
+                return None
+        _, _, start, stop = root._hierarchy_index().subtrees[self]
+        return root, slice(start, stop)
+
+    def _store_pos(self, value, root=None):
+        """Store the position of a particle, relative to its ancestors.
+
+        A particle backed by the coordinate buffer of its root keeps its row,
+        which is written in place, so that the buffer stays current.
+        """
+        buffer = (self.root if root is None else root)._xyz_buffer
+        if buffer is not None and self._pos.base is buffer:
+            self._pos[:] = value
+        else:
+            self._pos = value
 
     @property
     def xyz(self):
@@ -1331,8 +2275,16 @@ class Compound(object):
         pos : np.ndarray, shape=(n, 3), dtype=float
             Array with the positions of all particles.
         """
+        self._apply_pending_transforms()
+        buffer_rows = self._xyz_buffer_rows()
+        if buffer_rows is not None:
+            root, rows = buffer_rows
+            port_mask = root._xyz_buffer_port_mask[rows]
+            if port_mask.any():
+                return root._xyz_buffer[rows][~port_mask]
+            return root._xyz_buffer[rows].copy()
         if not self.children:
-            pos = np.expand_dims(self._pos, axis=0)
+            pos = np.expand_dims(self.pos if _pending_transforms else self._pos, axis=0)
         else:
             arr = np.fromiter(
                 itertools.chain.from_iterable(p.pos for p in self.particles()),
@@ -1350,8 +2302,13 @@ class Compound(object):
         pos : np.ndarray, shape=(n, 3), dtype=float
             Array with the positions of all particles and ports.
         """
+        self._apply_pending_transforms()
+        buffer_rows = self._xyz_buffer_rows()
+        if buffer_rows is not None:
+            root, rows = buffer_rows
+            return root._xyz_buffer[rows].copy()
         if not self.children:
-            pos = self._pos
+            pos = self.pos if _pending_transforms else self._pos
         else:
             arr = np.fromiter(
                 itertools.chain.from_iterable(
@@ -1374,6 +2331,16 @@ class Compound(object):
             The new particle positions
         """
         arrnx3 = np.array(arrnx3)
+        self._apply_pending_transforms()
+        buffer_rows = self._xyz_buffer_rows()
+        if buffer_rows is not None:
+            root, rows = buffer_rows
+            port_mask = root._xyz_buffer_port_mask[rows]
+            indices = np.arange(rows.start, rows.stop)[~port_mask]
+            if arrnx3.shape == (len(indices), 3):
+                root._xyz_buffer[indices] = arrnx3
+                self._coordinates_changed()
+                return
         if not self.children:
             if not arrnx3.shape[0] == 1:
                 raise ValueError(
@@ -1382,8 +2349,7 @@ class Compound(object):
                 )
             self.pos = np.squeeze(arrnx3)
         else:
-            for atom, coords in zip(self._particles(include_ports=False), arrnx3):
-                atom.pos = coords
+            self._set_positions(self._particles(include_ports=False), arrnx3)
 
     @xyz_with_ports.setter
     def xyz_with_ports(self, arrnx3):
@@ -1394,6 +2360,14 @@ class Compound(object):
         arrnx3 : np.ndarray, shape=(n,3), dtype=float
             The new particle positions
         """
+        self._apply_pending_transforms()
+        buffer_rows = self._xyz_buffer_rows()
+        if buffer_rows is not None:
+            root, rows = buffer_rows
+            if np.shape(arrnx3) == (rows.stop - rows.start, 3):
+                root._xyz_buffer[rows] = arrnx3
+                self._coordinates_changed()
+                return
         if not self.children:
             if not arrnx3.shape[0] == 1:
                 raise ValueError(
@@ -1402,8 +2376,166 @@ class Compound(object):
                 )
             self.pos = np.squeeze(arrnx3)
         else:
-            for atom, coords in zip(self._particles(include_ports=True), arrnx3):
+            self._set_positions(self._particles(include_ports=True), arrnx3)
+
+    def _set_positions(self, particles, arrnx3):
+        """Worker for the xyz setters. Set the positions of particles below self.
+
+        Positions are stored relative to the transforms pending on the
+        ancestors of self, which are inverted once for all particles.
+        """
+        T = self._ancestor_transform()
+        if T is None:
+            for atom, coords in zip(particles, arrnx3):
                 atom.pos = coords
+            return
+        T = np.linalg.inv(T)
+        arrnx3 = np.asarray(arrnx3, dtype=float) @ T[:3, :3].T + T[:3, 3]
+        root = self.root
+        for atom, coords in zip(particles, arrnx3):
+            atom._store_pos(coords, root)
+        self._coordinates_changed()
+
+    def _ancestor_transform(self):
+        """Return the transform pending on the ancestors of self, or None.
+
+        The coordinates of a particle are its stored position transformed by
+        the 4x4 affine matrices pending on all of its ancestors.
+        """
+        if not _pending_transforms:
+            return None
+        T = None
+        compound = self.parent
+        while compound is not None:
+            pending = compound._pending_transform
+            if pending is not None:
+                T = pending if T is None else pending @ T
+            compound = compound.parent
+        return T
+
+    def _defer_transform(self, T):
+        """Move the particles of self by the 4x4 affine matrix T lazily.
+
+        For a Compound with children, T is composed with the transform
+        pending on self and only applied to the particles when their
+        coordinates are read in bulk, or when particles are added to or
+        removed from self. Reading the position of a single particle applies
+        the transforms pending on its ancestors to that particle only. Moving
+        a Compound many times, as when a chain is grown with `force_overlap`,
+        then takes constant time per move.
+        """
+        A = self._ancestor_transform()
+        if A is not None:
+            # T moves the coordinates, which the ancestors transform by A.
+            T = np.linalg.inv(A) @ T @ A
+        self._compose_transform(T)
+        self._coordinates_changed()
+
+    def _compose_transform(self, T):
+        """Transform the stored positions below self by T, lazily if possible."""
+        if self.children:
+            pending = self._pending_transform
+            self._pending_transform = T if pending is None else T @ pending
+            _pending_transforms.add(self)
+        else:
+            self._store_pos(T[:3, :3] @ self._pos + T[:3, 3])
+
+    def _apply_pending_transforms(self):
+        """Apply the transforms pending on self and below it to the particles.
+
+        Transforms pending on the ancestors of self are left pending.
+        """
+        if not _pending_transforms or not self.children:
+            return
+        moved = {}
+        stack = [(self, None)]
+        while stack:
+            compound, T = stack.pop()
+            if not compound.children:
+                if T is not None:
+                    moved.setdefault(id(T), (T, []))[1].append(compound)
+                continue
+            pending = compound._pending_transform
+            if pending is not None:
+                T = pending if T is None else T @ pending
+                compound._pending_transform = None
+                _pending_transforms.discard(compound)
+            stack.extend((child, T) for child in compound.children)
+        root = self.root
+        for T, particles in moved.values():
+            xyz = np.array([particle._pos for particle in particles], dtype=float)
+            xyz = xyz.reshape(-1, 3) @ T[:3, :3].T + T[:3, 3]
+            for particle, pos in zip(particles, xyz):
+                particle._store_pos(pos, root)
+
+    def _coordinates_changed(self):
+        """Mark the cached geometric summaries affected by a move of self stale.
+
+        The summaries of self and its ancestors are dropped. Those below self
+        are stale once they are older than the move, which
+        `_current_geometry` checks, so that moving a Compound does not visit
+        its descendants and leaves the rest of the hierarchy cached.
+        """
+        if self.children:
+            self._moved_at = next(_coordinates_clock)
+        self._drop_geometry()
+
+    def _drop_geometry(self):
+        """Drop the cached geometric summaries of self and its ancestors."""
+        compound = self
+        while compound is not None:
+            if compound._geometry is not None:
+                compound._geometry = None
+            compound = compound.parent
+
+    def _current_geometry(self):
+        """Return the cached summary of self, or None if it is stale."""
+        summary = self._geometry
+        compound = self
+        while summary is not None and compound is not None:
+            if compound._moved_at > summary.time:
+                return None
+            compound = compound.parent
+        return summary
+
+    def _extend_geometry(self, new_child):
+        """Update the cached bounds of self and its ancestors after an add.
+
+        The summaries are only updated if the summary of self is current, so
+        that the particles of new_child come after the first particle of every
+        summary; otherwise they are dropped.
+        """
+        if self._current_geometry() is None:
+            self._drop_geometry()
+            return
+        child_summary = new_child._geometry_summary()
+        if child_summary is None:
+            return
+        compound = self
+        while compound is not None:
+            summary = compound._current_geometry()
+            if summary is not None:
+                summary.extend(child_summary)
+            compound = compound.parent
+
+    def _geometry_summary(self):
+        """Return the bounds of the particle coordinates of self.
+
+        The summary is cached until the particles below self move or are
+        removed, and is updated in place when Compounds are added to self.
+        Returns None if self contains no particles.
+        """
+        summary = self._current_geometry()
+        if summary is not None:
+            return summary
+        xyz = self.xyz
+        if not len(xyz):
+            return None
+        summary = _GeometrySummary(xyz)
+        if self.children:
+            # A single particle is cheaper to summarize than to cache.
+            self._geometry = summary
+        return summary
 
     @property
     def center(self):
@@ -1414,32 +2546,46 @@ class Compound(object):
         np.ndarray, shape=(3,), dtype=float
             The cartesian center of the Compound based on its Particles
         """
-        if np.all(np.isfinite(self.xyz)):
+        summary = self._geometry_summary()
+        if summary is None:
             return np.mean(self.xyz, axis=0)
+        if not summary.has_center:
+            if np.all(np.isfinite(summary.mins)) and np.all(np.isfinite(summary.maxs)):
+                summary.center = np.mean(self.xyz, axis=0)
+            summary.has_center = True
+        if summary.center is not None:
+            return summary.center.copy()
 
     @property
     def mins(self):
         """Return the mimimum x, y, z coordinate of any particle in this compound."""
-        return self.xyz.min(axis=0)
+        summary = self._geometry_summary()
+        if summary is None:
+            return self.xyz.min(axis=0)
+        return summary.mins.copy()
 
     @property
     def maxs(self):
         """Return the maximum x, y, z coordinate of any particle in this compound."""
-        return self.xyz.max(axis=0)
+        summary = self._geometry_summary()
+        if summary is None:
+            return self.xyz.max(axis=0)
+        return summary.maxs.copy()
 
     def is_independent(self):
         """Return True if there is no bond between particles of the Compound to an external Compound."""
         if not self.parent:
             # This is the very top level, and hence have to be independent
             return True
-        elif not self.root.bond_graph.edges():
+        bond_graph = self.root.bond_graph
+        if not bond_graph or not bond_graph.number_of_edges():
             # If there is no bond in the top level, then everything is independent
             return True
         else:
             # Cover the other cases
             for particle in self.particles():
-                for neigh in nx.neighbors(self.root.bond_graph, particle):
-                    if neigh not in self.particles():
+                for neigh in bond_graph.neighbors(particle):
+                    if not self._contains(neigh):
                         return False
             return True
 
@@ -1473,38 +2619,92 @@ class Compound(object):
         if excluded_bond_depth < 0 or not isinstance(excluded_bond_depth, int):
             raise ValueError("`excluded_bond_depth must be an integer >= 0.")
 
-        if self.box:
-            min_length = np.min(self.box.lengths)
-        else:
-            min_length = np.min(self.get_boundingbox().lengths)
-
-        if minimum_distance >= min_length / 2:
+        box = self.box if self.box else self.get_boundingbox()
+        if minimum_distance >= np.min(box.lengths) / 2:
             raise ValueError(
                 "The minimum distance chosen is greater than or equal to "
                 "half of the box length."
             )
 
-        freud = import_("freud")
-        moved_positions, freud_box = self.to_freud()
-        aq = freud.locality.AABBQuery(freud_box, moved_positions)
-        aq_query = aq.query(
-            query_points=moved_positions,
-            query_args=dict(r_min=0.0, r_max=minimum_distance, exclude_ii=True),
+        pairs_i, pairs_j, _ = neighbor_pairs(
+            self.xyz, minimum_distance, box=box, periodicity=self.periodicity
+        )
+        # Exclude bonded neighbors that are within min distance
+        if excluded_bond_depth > 0 and len(pairs_i):
+            keep = ~self._bonded_within(pairs_i, pairs_j, excluded_bond_depth)
+            pairs_i, pairs_j = pairs_i[keep], pairs_j[keep]
+        return list(zip(pairs_i.tolist(), pairs_j.tolist()))
+
+    def _bonded_within(self, pairs_i, pairs_j, graph_depth):
+        """Return which pairs of particles are at most `graph_depth` bonds apart.
+
+        Paths through any particle of the root are considered, as in
+        `direct_bonds`. The sparse adjacency of the bond graph is built once,
+        and the particles within `graph_depth` bonds of every distinct first
+        particle are found by repeated sparse matrix products.
+
+        Parameters
+        ----------
+        pairs_i, pairs_j : np.ndarray, shape=(n_pairs,), dtype=int
+            Indices of the two particles of each pair in `self.particles()`.
+        graph_depth : int
+            The largest number of bonds between the particles of a pair.
+
+        Returns
+        -------
+        np.ndarray, shape=(n_pairs,), dtype=bool
+            Whether each pair is bonded within `graph_depth` bonds.
+        """
+        bonded = np.zeros(len(pairs_i), dtype=bool)
+        bond_graph = self.root.bond_graph
+        if bond_graph is None or not self.children:
+            return bonded
+        index, start, _ = self._particle_range()
+        offset = int(index.n_before[start])
+        n_particles = len(index.particles)
+        position = {particle: i for i, particle in enumerate(index.particles)}
+        edges = np.array(
+            [
+                (position[u], position[v])
+                for u, v in bond_graph.edges()
+                if u in position and v in position
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        if not len(edges):
+            return bonded
+        adjacency = csr_matrix(
+            (
+                np.ones(2 * len(edges), dtype=np.float32),
+                (
+                    np.concatenate((edges[:, 0], edges[:, 1])),
+                    np.concatenate((edges[:, 1], edges[:, 0])),
+                ),
+            ),
+            shape=(n_particles, n_particles),
         )
-        nlist = aq_query.toNeighborList()
-        # nlist contains each pair twice, get the set
-        pairs_set = set([tuple(sorted((i, j))) for i, j in nlist])
-        all_particles = [p for p in self.particles()]
-        overlapping_particles = []
-        for i, j in pairs_set:
-            # Exclude bonded neighbors that are within min distance
-            if excluded_bond_depth > 0:
-                i_bonds = all_particles[i].direct_bonds(graph_depth=excluded_bond_depth)
-                if all_particles[j] not in i_bonds:
-                    overlapping_particles.append((i, j))
-            else:  # Don't exclude bonded neighbors
-                overlapping_particles.append((i, j))
-        return overlapping_particles
+
+        # One row per distinct first particle, expanded one bond at a time.
+        sources, rows = np.unique(pairs_i + offset, return_inverse=True)
+        reach = csr_matrix(
+            (
+                np.ones(len(sources), dtype=np.float32),
+                (np.arange(len(sources)), sources),
+            ),
+            shape=(len(sources), n_particles),
+        )
+        for _ in range(graph_depth):
+            expanded = reach + reach @ adjacency
+            expanded.data[:] = 1
+            if expanded.nnz == reach.nnz:
+                break
+            reach = expanded
+
+        reach = reach.tocoo()
+        reached = np.sort(reach.row.astype(np.int64) * n_particles + reach.col)
+        queried = rows.astype(np.int64) * n_particles + pairs_j + offset
+        positions = np.minimum(np.searchsorted(reached, queried), len(reached) - 1)
+        return reached[positions] == queried
 
     def get_boundingbox(self, pad_box=None):
         """Compute the bounding box of the compound.
@@ -1533,23 +2733,27 @@ class Compound(object):
         that are generated from mb.Lattice's and the resulting
         mb.Lattice.populate method
         """
+        summary = self._geometry_summary()
+        if summary is None:
+            raise MBuildError(f"{self} has no particles to bound.")
+        mins = summary.mins
+        maxs = summary.maxs
+
         # case where only 1 particle exists
         is_one_particle = False
-        if self.xyz.shape[0] == 1:
+        if summary.n_particles == 1:
             is_one_particle = True
 
         # are any columns all equalivalent values?
         # an example of this would be a planar molecule
         # example: all z values are 0.0
-        # from: https://stackoverflow.com/a/14860884
-        # steps: create mask array comparing first value in each column
-        # use np.all with axis=0 to do row columnar comparision
+        # steps: compare the coordinates furthest from the first particle
+        # with it, as np.isclose(xyz, xyz[0, :], atol=1e-2) would
         has_dimension = [True, True, True]
         if not is_one_particle:
-            missing_dimensions = np.all(
-                np.isclose(self.xyz, self.xyz[0, :], atol=1e-2),
-                axis=0,
-            )
+            first = summary.first
+            spread = np.maximum(maxs - first, first - mins)
+            missing_dimensions = spread <= 1e-2 + 1e-5 * np.abs(first)
             for i, truthy in enumerate(missing_dimensions):
                 has_dimension[i] = not truthy
 
@@ -1558,9 +2762,9 @@ class Compound(object):
             v2 = np.asarray([[0.0, 1.0, 0.0]])
             v3 = np.asarray([[0.0, 0.0, 1.0]])
         else:
-            v1 = np.asarray((self.maxs[0] - self.mins[0], 0.0, 0.0))
-            v2 = np.asarray((0.0, self.maxs[1] - self.mins[1], 0.0))
-            v3 = np.asarray((0.0, 0.0, self.maxs[2] - self.mins[2]))
+            v1 = np.asarray((maxs[0] - mins[0], 0.0, 0.0))
+            v2 = np.asarray((0.0, maxs[1] - mins[1], 0.0))
+            v3 = np.asarray((0.0, 0.0, maxs[2] - mins[2]))
         vecs = [v1, v2, v3]
 
         # handle any missing dimensions (planar molecules)
@@ -1762,9 +2966,11 @@ class Compound(object):
         py3Dmol = import_("py3Dmol")
 
         cloned = clone(self)
-        for edge in cloned.bond_graph.edges(data=True):
-            if edge[2]["bond_order"] == 0.0:
-                edge[2]["bond_order"] = 1.0
+        for particle1, particle2, bond_order in cloned.bond_graph.edges(
+            data="bond_order"
+        ):
+            if bond_order == 0.0:
+                cloned.bond_graph.add_edge(particle1, particle2, bond_order=1.0)
 
         modified_color_scheme = {}
         for name, color in color_scheme.items():
@@ -1957,6 +3163,10 @@ class Compound(object):
             for child in children_list:
                 # Need to handle the case when child is a port
                 self.remove(child)
+            # The removed children keep their particles and ports.
+            self._detach_parts(
+                [part for part in particle_list + ports_list if part.parent is not None]
+            )
 
             # Re-add the particles and bonds
             self.add(particle_list)
@@ -2010,11 +3220,11 @@ class Compound(object):
             Reference coordinates to use for comparing how far anchor Particles
             have shifted.
         """
-        particles = list(self.particles())
+        particle_indices = {particle: i for i, particle in enumerate(self.particles())}
         for port in self.all_ports():
             if port.anchor:
-                idx = particles.index(port.anchor)
-                shift = particles[idx].pos - initial_coordinates[idx]
+                idx = particle_indices[port.anchor]
+                shift = port.anchor.pos - initial_coordinates[idx]
                 port.translate(shift)
 
     def _kick(self):
@@ -2211,7 +3421,7 @@ class Compound(object):
             for succesor in self.successors():
                 if id(anchor) == id(succesor):
                     anchor_in_compound = True
-                    anchor_pos_old = anchor.pos
+                    anchor_pos_old = np.array(anchor.pos)
 
             if not anchor_in_compound:
                 raise MBuildError(
@@ -2821,6 +4031,12 @@ class Compound(object):
         ----------
         by : np.ndarray, shape=(3,), dtype=float
         """
+        buffer_rows = self._xyz_buffer_rows()
+        if buffer_rows is not None:
+            root, rows = buffer_rows
+            root._xyz_buffer[rows] += np.asarray(by, dtype=float).reshape(3)
+            self._coordinates_changed()
+            return
         new_positions = _translate(self.xyz_with_ports, by)
         self.xyz_with_ports = new_positions
 
@@ -2864,7 +4080,7 @@ class Compound(object):
 
         if anchor:
             msg = f"{anchor} is not part of {self}."
-            assert anchor in self.successors(), msg
+            assert anchor is not self and self._contains(anchor), msg
         else:
             anchor = self
         anchor_pos = anchor.center
@@ -2873,6 +4089,84 @@ class Compound(object):
         self.rotate(theta, around)
         self.translate(anchor_pos)
 
+    def transform_children(self, translations=None, rotations=None):
+        """Move each child of the Compound rigidly, all in one pass.
+
+        Each child is rotated about its center and then translated. The new
+        coordinates of all children are computed with a single broadcasted
+        transform and written back at once, which is much faster than
+        calling `rotate` and `translate` on each child.
+
+        Parameters
+        ----------
+        translations : array-like, shape=(k, 3), dtype=float, optional
+            The vector to translate each child by. If None, the children are
+            not translated.
+        rotations : array-like, shape=(k, 3, 3) or (k, 4), dtype=float, optional
+            The rotation matrix, or the quaternion (w, x, y, z), of each
+            child. A child without particles other than Port particles, such
+            as a Port, is rotated about the center of its Port particles. If
+            None, the children are not rotated.
+
+        Notes
+        -----
+        `k` must be the number of children of the Compound, Ports included,
+        in the order of `Compound.children`. Uniformly random rotations for
+        packing molecules can be drawn with
+        `mbuild.coordinate_transform.random_rotation_matrices`.
+        """
+        n_children = len(self.children)
+        if translations is not None:
+            translations = np.asarray(translations, dtype=float)
+            if translations.shape != (n_children, 3):
+                raise ValueError(
+                    f"translations must have shape ({n_children}, 3), "
+                    f"got {translations.shape}."
+                )
+        if rotations is not None:
+            rotations = np.asarray(rotations, dtype=float)
+            if rotations.shape == (n_children, 4):
+                rotations = quaternions_to_matrices(rotations)
+            elif rotations.shape != (n_children, 3, 3):
+                raise ValueError(
+                    f"rotations must have shape ({n_children}, 3, 3) or "
+                    f"({n_children}, 4), got {rotations.shape}."
+                )
+        if not n_children or (translations is None and rotations is None):
+            return
+
+        # The particles of each child are contiguous rows of xyz_with_ports.
+        index, start, stop = self._particle_range()
+        bounds = np.array(
+            [
+                index.subtrees[child][2] if child.children else index.positions[child]
+                for child in self.children
+            ]
+            + [stop]
+        )
+        owner = np.repeat(np.arange(n_children), np.diff(bounds))
+        xyz = self.xyz_with_ports
+        if rotations is not None:
+            # Center of the particles of each child, or of its Port
+            # particles if it has no other particles.
+            first_rows = bounds[:-1] - start
+            n_particles = np.diff(index.n_before[bounds])
+            is_particle = np.diff(index.n_before[start : stop + 1]).astype(bool)
+            centers = np.add.reduceat(xyz * is_particle[:, np.newaxis], first_rows)
+            centers /= np.maximum(n_particles, 1)[:, np.newaxis]
+            ports_only = n_particles == 0
+            if ports_only.any():
+                centers[ports_only] = (
+                    np.add.reduceat(xyz, first_rows)[ports_only]
+                    / np.diff(bounds)[ports_only, np.newaxis]
+                )
+            xyz -= centers[owner]
+            xyz = np.einsum("nij,nj->ni", rotations[owner], xyz)
+            xyz += centers[owner]
+        if translations is not None:
+            xyz += translations[owner]
+        self.xyz_with_ports = xyz
+
     def rotate_dihedral(self, bond, phi):
         """Rotate a dihedral about a central bond.
 
@@ -2896,7 +4190,7 @@ class Compound(object):
         component1 = components[1]  # One piece of the compound
 
         # Get original coordinates
-        original_bond_positions = [bond[0].pos, bond[1].pos]
+        original_bond_positions = [np.array(bond[0].pos), np.array(bond[1].pos)]
 
         # Get the vector along the bond
         bond_vec = bond[1].pos - bond[0].pos
@@ -3306,7 +4600,16 @@ class Compound(object):
     def __getitem__(self, selection):
         """Get item from Compound."""
         if isinstance(selection, int):
-            return list(self.particles())[selection]
+            if not self.children:
+                return [self][selection]
+            index, start, stop = self._particle_range()
+            start = index.n_before[start]
+            n_particles = index.n_before[stop] - start
+            if selection < 0:
+                selection += n_particles
+            if not 0 <= selection < n_particles:
+                raise IndexError("Particle index out of range")
+            return index.particles[start + selection]
         if isinstance(selection, str):
             if selection not in self.labels:
                 raise MBuildError(f"{self.name}['{selection}'] does not exist.")
@@ -3354,26 +4657,33 @@ class Compound(object):
         # Remember that we're cloning the new one of self.
         clone_of[self] = newone
 
-        newone.name = deepcopy(self.name)
-        newone._element = deepcopy(self.element)
-        newone._pos = deepcopy(self._pos)
-        newone.port_particle = deepcopy(self.port_particle)
-        newone._box = deepcopy(self._box)
-        newone._periodicity = deepcopy(self._periodicity)
-        newone._charge = deepcopy(self._charge)
-        newone._mass = deepcopy(self._mass)
+        # Names, elements and periodicity are immutable and can be shared.
+        newone._name = self._name
+        newone._element = self._element
+        newone._pos = np.array(self._pos, dtype=float)
+        if self._pending_transform is not None:
+            newone._pending_transform = self._pending_transform.copy()
+            _pending_transforms.add(newone)
+        newone.port_particle = self.port_particle
+        newone._box = None if self._box is None else deepcopy(self._box)
+        newone._periodicity = self._periodicity
+        newone._charge = None if self._charge is None else deepcopy(self._charge)
+        newone._mass = None if self._mass is None else deepcopy(self._mass)
         if hasattr(self, "index"):
             newone.index = deepcopy(self.index)
+        if self._array_backed:
+            newone._array_backed = True
 
+        # Parent should be None initially.
+        newone.parent = None
+        newone._allocate_containers()
         if self.children is None:
             newone.children = None
-        else:
+        elif self.children and not isinstance(newone.children, list):
             newone.children = list()
-        # Parent should be None initially.
-        newone.parent = None
-        newone.labels = OrderedDict()
-        newone.referrers = set()
-        newone.bond_graph = None
+        if self.labels and not isinstance(newone.labels, dict):
+            newone.labels = OrderedDict()
+        newone._bond_graph = None
 
         # Add children to clone.
         if self.children:
@@ -3387,7 +4697,7 @@ class Compound(object):
             for label, compound in self.labels.items():
                 if not isinstance(compound, list):
                     newone.labels[label] = compound._clone(clone_of, root_container)
-                    compound.referrers.add(clone_of[compound])
+                    compound._add_referrer(clone_of[compound])
                 else:
                     # compound is a list of compounds, so we create an empty
                     # list, and add the clones of the original list elements.
@@ -3404,23 +4714,243 @@ class Compound(object):
     def _clone_bonds(self, clone_of=None):
         """Clone the bond of the source compound to clone compound."""
         newone = clone_of[self]
-        newone.bond_graph = BondGraph()
+        if not self.children and self.bond_graph is None:
+            # Particles only need a bond graph once they have children or bonds
+            return
+        if self.root.bond_graph is None:
+            newone.bond_graph = new_bond_graph()
+        else:
+            newone.bond_graph = type(self.root.bond_graph)()
         for particle in self.particles():
             newone.bond_graph.add_node(clone_of[particle])
+        bonds = []
+        bond_orders = []
         for c1, c2, data in self.bonds(return_bond_order=True):
             try:
                 # bond order is added to the data dictionary as 'bo'
-                newone.add_bond(
-                    (clone_of[c1], clone_of[c2]), bond_order=data["bond_order"]
-                )
+                bonds.append((clone_of[c1], clone_of[c2]))
+                bond_orders.append(data["bond_order"])
             except KeyError:
                 raise MBuildError(
                     "Cloning failed. Compound contains bonds to "
                     "Particles outside of its containment hierarchy."
                 )
+        newone._add_bonds(bonds, bond_orders)
+
+
+class _EmptyLabels(Mapping):
+    """Read-only empty labels shared by Particles without labels of their own."""
+
+    __slots__ = ()
+
+    def __getitem__(self, label):
+        raise KeyError(label)
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+
+_EMPTY_LABELS = _EmptyLabels()
+_EMPTY_REFERRERS = frozenset()
+
+
+class Particle(Compound):
+    """A Compound at the bottom of the hierarchy, such as an atom or a bead.
+
+    Particle takes the same parameters as Compound and can be used wherever a
+    Compound without children is expected. Its `children`, `labels` and
+    `referrers` are empty containers shared by all Particles until a Particle
+    needs its own, for instance when a Compound is added to it. Particle
+    still inherits the `__dict__` slot of Compound, but the dict is only
+    allocated once an attribute outside the slots is set. Together, this
+    avoids allocating four containers for every atom of a system.
 
+    See Also
+    --------
+    Compound : The composite building block of the hierarchy
+    """
+
+    __slots__ = ()
+
+    def _allocate_containers(self):
+        """Use the shared empty containers of Particle until needed."""
+        self.children = ()
+        self.labels = _EMPTY_LABELS
+        self.referrers = _EMPTY_REFERRERS
+
+
+class _ParticleIndex:
+    """Ordered particles of a Compound hierarchy, built once by its root.
+
+    Attributes
+    ----------
+    leaves : list of mb.Compound
+        All particles below the root, including Port particles, in the order
+        of `Compound.particles`.
+    positions : dict
+        Position of each particle in `leaves`.
+    particles : list of mb.Compound
+        The particles in `leaves` that are not Port particles.
+    n_before : np.ndarray, shape=(len(leaves) + 1,), dtype=int
+        Number of non-Port particles before each position in `leaves`.
+    subtrees : dict
+        For each Compound with children, including the root, a tuple
+        (first, end, start, stop). Compounds with children are numbered in
+        preorder, and the ones below a Compound, itself included, are
+        numbered from `first` up to `end`. Its particles are `leaves[start:stop]`.
+    by_name : dict or None
+        Sorted positions in `particles` of the particles with each name. Built
+        by `names` and dropped when a particle is renamed.
+    by_element : dict or None
+        Sorted positions in `particles` of the particles of each element,
+        keyed by element symbol, or None for particles without an element.
+        Built by `elements` and dropped when the element of a particle is set.
+    ports : list of mb.Port
+        All Ports below the root, in the order of `Compound.successors`.
+    port_order : np.ndarray, shape=(len(ports),), dtype=int
+        The preorder number in `subtrees` of each Port in `ports`.
+    by_anchor : dict or None
+        The Ports in `ports` anchored to each Compound. Built by `anchors`
+        and dropped when the anchor of a Port is set.
+    """
+
+    __slots__ = (
+        "leaves",
+        "positions",
+        "particles",
+        "n_before",
+        "subtrees",
+        "by_name",
+        "by_element",
+        "ports",
+        "port_order",
+        "by_anchor",
+    )
+
+    def __init__(self, root):
+        from mbuild.port import Port
+
+        leaves = []
+        subtrees = {}
+        ports = []
+        stack = [root] if root.children else []
+        while stack:
+            compound = stack.pop()
+            if type(compound) is tuple:
+                # All Compounds below this one have been numbered.
+                compound = compound[0]
+                first, start = subtrees[compound]
+                subtrees[compound] = (first, len(subtrees), start, len(leaves))
+            elif compound.children:
+                if isinstance(compound, Port):
+                    ports.append(compound)
+                subtrees[compound] = (len(subtrees), len(leaves))
+                stack.append((compound,))
+                stack.extend(reversed(compound.children))
+            else:
+                leaves.append(compound)
+        is_port = [leaf.port_particle for leaf in leaves]
+        self.leaves = leaves
+        self.subtrees = subtrees
+        self.positions = {leaf: i for i, leaf in enumerate(leaves)}
+        self.particles = [
+            leaf for leaf, port_particle in zip(leaves, is_port) if not port_particle
+        ]
+        self.n_before = np.zeros(len(leaves) + 1, dtype=int)
+        np.cumsum(np.logical_not(is_port), out=self.n_before[1:])
+        self.by_name = None
+        self.by_element = None
+        self.ports = ports
+        self.port_order = np.array([subtrees[port][0] for port in ports], dtype=int)
+        self.by_anchor = None
+
+    def names(self):
+        """Return `by_name`, building it if needed."""
+        if self.by_name is None:
+            self.by_name = _group_positions(
+                particle.name for particle in self.particles
+            )
+        return self.by_name
+
+    def elements(self):
+        """Return `by_element`, building it if needed."""
+        if self.by_element is None:
+            self.by_element = _group_positions(
+                None if particle.element is None else particle.element.symbol
+                for particle in self.particles
+            )
+        return self.by_element
+
+    def anchors(self):
+        """Return `by_anchor`, building it if needed."""
+        if self.by_anchor is None:
+            self.by_anchor = {}
+            for port in self.ports:
+                if port.anchor is not None:
+                    self.by_anchor.setdefault(port.anchor, []).append(port)
+        return self.by_anchor
+
+
+class _GeometrySummary:
+    """Bounds of the particle coordinates of a Compound.
+
+    Computed from `Compound.xyz` and cached on the Compound until its
+    particles move, see `Compound._coordinates_changed`.
+
+    Attributes
+    ----------
+    time : int
+        The tick of `_coordinates_clock` at which the summary was computed.
+    n_particles : int
+        The number of particles, excluding Port particles.
+    first : np.ndarray, shape=(3,), dtype=float
+        The position of the first particle.
+    mins, maxs : np.ndarray, shape=(3,), dtype=float
+        The minimum and maximum x, y, z coordinate of any particle.
+    center : np.ndarray, shape=(3,), dtype=float, or None
+        The mean position of the particles, None until it is computed or if
+        any coordinate is not finite.
+    has_center : bool
+        Whether `center` has been computed.
+    """
 
-Particle = Compound
+    __slots__ = (
+        "time",
+        "n_particles",
+        "first",
+        "mins",
+        "maxs",
+        "center",
+        "has_center",
+    )
+
+    def __init__(self, xyz):
+        self.time = next(_coordinates_clock)
+        self.n_particles = len(xyz)
+        self.first = xyz[0].copy()
+        self.mins = xyz.min(axis=0)
+        self.maxs = xyz.max(axis=0)
+        self.center = None
+        self.has_center = False
+
+    def extend(self, other):
+        """Include the particles summarized by other, appended after an add."""
+        self.n_particles += other.n_particles
+        self.mins = np.minimum(self.mins, other.mins)
+        self.maxs = np.maximum(self.maxs, other.maxs)
+        self.center = None
+        self.has_center = False
+
+
+def _group_positions(keys):
+    """Map each key to the sorted array of the positions where it occurs."""
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(key, []).append(i)
+    return {key: np.array(positions, dtype=int) for key, positions in groups.items()}
 
 
 def _flatten_list(c_list):
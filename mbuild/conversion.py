@@ -568,10 +568,17 @@ def from_parmed(
         compound.add(chain_list)
 
     # Infer bonds information
-    for bond in structure.bonds:
-        atom1 = atom_mapping[bond.atom1]
-        atom2 = atom_mapping[bond.atom2]
-        compound.add_bond((atom1, atom2), bond_order=bond.order)
+    particle_index = {particle: i for i, particle in enumerate(compound.particles())}
+    compound.add_bonds(
+        [
+            (
+                particle_index[atom_mapping[bond.atom1]],
+                particle_index[atom_mapping[bond.atom2]],
+            )
+            for bond in structure.bonds
+        ],
+        bond_orders=[bond.order for bond in structure.bonds],
+    )
 
     # Convert box information
     if structure.box is not None:
@@ -679,10 +686,16 @@ def from_trajectory(
     if traj.topology.n_chains > 1:
         compound.add(chains_list, label=chains_list_label)
 
-    for mdtraj_atom1, mdtraj_atom2 in traj.topology.bonds:
-        atom1 = atom_mapping[mdtraj_atom1]
-        atom2 = atom_mapping[mdtraj_atom2]
-        compound.add_bond((atom1, atom2))
+    particle_index = {particle: i for i, particle in enumerate(compound.particles())}
+    compound.add_bonds(
+        [
+            (
+                particle_index[atom_mapping[mdtraj_atom1]],
+                particle_index[atom_mapping[mdtraj_atom2]],
+            )
+            for mdtraj_atom1, mdtraj_atom2 in traj.topology.bonds
+        ]
+    )
 
     if np.any(traj.unitcell_lengths) and np.any(traj.unitcell_lengths[0]):
         compound.box = Box(traj.unitcell_lengths[0])
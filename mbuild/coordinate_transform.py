@@ -53,9 +53,14 @@ def force_overlap(
 
     if not T:
         T = _create_equivalence_transform(equivalence_pairs)
-    atom_positions = move_this.xyz_with_ports
-    atom_positions = T.apply_to(atom_positions)
-    move_this.xyz_with_ports = atom_positions
+    if move_this.children and not move_this.root._array_backed:
+        # Composed with earlier moves and applied to the particles of
+        # move_this when their coordinates are next read.
+        move_this._defer_transform(T.T)
+    else:
+        atom_positions = move_this.xyz_with_ports
+        atom_positions = T.apply_to(atom_positions)
+        move_this.xyz_with_ports = atom_positions
 
     if add_bond:
         if isinstance(from_positions, Port) and isinstance(to_positions, Port):
@@ -241,41 +246,113 @@ class RigidTransform(CoordinateTransform):
     """
 
     def __init__(self, A, B):
-        rows, _ = np.shape(A)
-        centroid_A = np.mean(A, axis=0)
-        centroid_B = np.mean(B, axis=0)
-        centroid_A.shape = (1, 3)
-        centroid_B.shape = (1, 3)
+        T = rigid_transform_matrices(np.asarray(A)[None], np.asarray(B)[None])[0]
+        super(RigidTransform, self).__init__(T)
 
-        H = np.zeros((3, 3), dtype=float)
 
-        for i in range(rows):
-            H = H + np.transpose(A[i, :] - centroid_A).dot((B[i, :] - centroid_B))
+def rigid_transform_matrices(A, B):
+    """Compute the rigid transformations that map many point sets at once.
 
-        U, _, V = svd(H)
-        V = np.transpose(V)
-        R = V.dot(np.transpose(U))
+    The covariance of every pair of point sets is computed in one einsum
+    and decomposed in one batched SVD, so aligning K point sets costs about
+    as much as aligning one.
 
-        C_A = np.eye(3)
-        C_A = np.vstack(
-            [
-                np.hstack([C_A, np.transpose(centroid_A) * -1.0]),
-                np.array([0, 0, 0, 1]),
-            ]
-        )
+    Parameters
+    ----------
+    A : np.ndarray, shape=(k, n, 3), dtype=float
+        K sets of points in source coordinate systems.
+    B : np.ndarray, shape=(k, n, 3), dtype=float
+        K sets of points in destination coordinate systems.
 
-        R_new = np.vstack(
-            [np.hstack([R, np.array([[0], [0], [0]])]), np.array([0, 0, 0, 1])]
+    Returns
+    -------
+    T : np.ndarray, shape=(k, 4, 4), dtype=float
+        The affine transformation matrix mapping each set of points in A to
+        the respective set in B, as used by `CoordinateTransform`.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    if A.ndim != 3 or A.shape[2] != 3 or A.shape != B.shape:
+        raise ValueError(
+            f"A and B must both have shape (k, n, 3), got {A.shape} and {B.shape}."
         )
+    centroid_A = A.mean(axis=1)
+    centroid_B = B.mean(axis=1)
+    H = np.einsum("kni,knj->kij", A - centroid_A[:, None], B - centroid_B[:, None])
+    U, _, V = svd(H)
+    R = np.matmul(np.swapaxes(V, 1, 2), np.swapaxes(U, 1, 2))
+
+    T = np.zeros((len(A), 4, 4))
+    T[:, :3, :3] = R
+    T[:, :3, 3] = centroid_B - np.einsum("kij,kj->ki", R, centroid_A)
+    T[:, 3, 3] = 1.0
+    return T
 
-        C_B = np.eye(3)
-        C_B = np.vstack(
-            [np.hstack([C_B, np.transpose(centroid_B)]), np.array([0, 0, 0, 1])]
-        )
 
-        T = C_B.dot(R_new).dot(C_A)
+def quaternions_to_matrices(quaternions):
+    """Convert quaternions to rotation matrices.
 
-        super(RigidTransform, self).__init__(T)
+    Parameters
+    ----------
+    quaternions : np.ndarray, shape=(k, 4), dtype=float
+        Quaternions (w, x, y, z), with the scalar part first. They are
+        normalized before being converted.
+
+    Returns
+    -------
+    R : np.ndarray, shape=(k, 3, 3), dtype=float
+        The rotation matrix of each quaternion.
+    """
+    q = np.asarray(quaternions, dtype=float)
+    if q.ndim != 2 or q.shape[1] != 4:
+        raise ValueError(f"quaternions must have shape (k, 4), got {q.shape}.")
+    norms = norm(q, axis=1)
+    if np.any(norms == 0):
+        raise ValueError("Cannot convert a zero quaternion to a rotation")
+    w, x, y, z = (q / norms[:, np.newaxis]).T
+    R = np.empty((len(q), 3, 3))
+    R[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    R[:, 0, 1] = 2 * (x * y - z * w)
+    R[:, 0, 2] = 2 * (x * z + y * w)
+    R[:, 1, 0] = 2 * (x * y + z * w)
+    R[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    R[:, 1, 2] = 2 * (y * z - x * w)
+    R[:, 2, 0] = 2 * (x * z - y * w)
+    R[:, 2, 1] = 2 * (y * z + x * w)
+    R[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+
+def random_rotation_matrices(n, seed=None):
+    """Sample rotation matrices uniformly from all rotations.
+
+    Uses the method of Shoemake, Graphics Gems III (1992), which maps three
+    uniform random numbers to a uniformly distributed unit quaternion.
+
+    Parameters
+    ----------
+    n : int
+        The number of rotations.
+    seed : int or np.random.Generator, optional, default=None
+        Seed of the random number generator, or the generator itself.
+
+    Returns
+    -------
+    R : np.ndarray, shape=(n, 3, 3), dtype=float
+        The rotation matrices.
+    """
+    u1, u2, u3 = np.random.default_rng(seed).random((3, int(n)))
+    a = np.sqrt(1 - u1)
+    b = np.sqrt(u1)
+    quaternions = np.column_stack(
+        (
+            a * np.sin(2 * np.pi * u2),
+            a * np.cos(2 * np.pi * u2),
+            b * np.sin(2 * np.pi * u3),
+            b * np.cos(2 * np.pi * u3),
+        )
+    )
+    return quaternions_to_matrices(quaternions)
 
 
 def unit_vector(v):
@@ -310,11 +387,8 @@ def _create_equivalence_transform(equiv):
     """
     from mbuild.compound import Compound
 
-    self_points = np.array([])
-    self_points.shape = (0, 3)
-    other_points = np.array([])
-    other_points.shape = (0, 3)
-
+    self_points = []
+    other_points = []
     for pair in equiv:
         if not isinstance(pair, tuple) or len(pair) != 2:
             raise ValueError("Equivalence pair not a 2-tuple")
@@ -323,16 +397,9 @@ def _create_equivalence_transform(equiv):
                 f"Equivalence pair type mismatch: pair[0] is a {pair[0]} "
                 f"and pair[1] is a {pair[1]}"
             )
-
-        if not pair[0].children:
-            self_points = np.vstack([self_points, pair[0].pos])
-            other_points = np.vstack([other_points, pair[1].pos])
-        else:
-            for atom0 in pair[0]._particles(include_ports=True):
-                self_points = np.vstack([self_points, atom0.pos])
-            for atom1 in pair[1]._particles(include_ports=True):
-                other_points = np.vstack([other_points, atom1.pos])
-    T = RigidTransform(self_points, other_points)
+        self_points.append(np.reshape(pair[0].xyz_with_ports, (-1, 3)))
+        other_points.append(np.reshape(pair[1].xyz_with_ports, (-1, 3)))
+    T = RigidTransform(np.concatenate(self_points), np.concatenate(other_points))
     return T
 
 
@@ -342,7 +409,9 @@ def _choose_correct_port(from_port, to_port):
     Each Port object actually contains 2 sets of 4 atoms, either of which can be
     used to make a connection with an equivalence transform. This function
     chooses the set of 4 atoms that makes the anchor atoms not overlap which is
-    the intended behavior for most use-cases.
+    the intended behavior for most use-cases. If either Port is an
+    `AnalyticPort`, both transforms are computed in closed form from the frames
+    of the Ports instead.
 
     Parameters
     ----------
@@ -354,30 +423,67 @@ def _choose_correct_port(from_port, to_port):
     equivalence_pairs : tuple of Ports, shape=(2,)
         Technically, a tuple of the Ports' sub-Compounds ('up' or 'down') that
         are used to make the correct connection between components.
+    T : CoordinateTransform
+        The transform that makes the correct connection.
     """
-    # First we try matching the two 'up' ports.
-    T1 = _create_equivalence_transform([(from_port["up"], to_port["up"])])
-    new_position = T1.apply_to(np.array(from_port.anchor.pos, ndmin=2))
+    from mbuild.port import AnalyticPort
 
-    dist_between_anchors_up_up = norm(new_position[0] - to_port.anchor.pos)
-
-    # Then matching a 'down' with an 'up' port.
-    T2 = _create_equivalence_transform([(from_port["down"], to_port["up"])])
-    new_position = T2.apply_to(np.array(from_port.anchor.pos, ndmin=2))
+    if isinstance(from_port, AnalyticPort) or isinstance(to_port, AnalyticPort):
+        T_up, T_down = _port_frame_transforms(from_port, to_port)
+        up_pair = down_pair = (from_port, to_port)
+    else:
+        # Match both the 'up' and the 'down' Port of from_port with the 'up'
+        # Port of to_port, computing the two transforms in one batch.
+        to_points = to_port["up"].xyz_with_ports
+        T_up, T_down = rigid_transform_matrices(
+            np.stack(
+                [from_port["up"].xyz_with_ports, from_port["down"].xyz_with_ports]
+            ),
+            np.stack([to_points, to_points]),
+        )
+        up_pair = (from_port["up"], to_port["up"])
+        down_pair = (from_port["down"], to_port["up"])
+    anchor = np.append(from_port.anchor.pos, 1.0)
+    dist_between_anchors_up_up = norm(T_up.dot(anchor)[:3] - to_port.anchor.pos)
+    dist_between_anchors_down_up = norm(T_down.dot(anchor)[:3] - to_port.anchor.pos)
 
     # Determine which transform places the anchors further away from each other.
-    dist_between_anchors_down_up = norm(new_position[0] - to_port.anchor.pos)
     difference_between_distances = (
         dist_between_anchors_down_up - dist_between_anchors_up_up
     )
 
     if difference_between_distances > 0:
-        correct_port = from_port["down"]
-        T = T2
-    else:
-        correct_port = from_port["up"]
-        T = T1
-    return [(correct_port, to_port["up"])], T
+        return [down_pair], CoordinateTransform(T_down)
+    return [up_pair], CoordinateTransform(T_up)
+
+
+def _port_frame_transforms(from_port, to_port):
+    """Compute the equivalence transforms of two Ports in closed form.
+
+    A Port has an 'up' and a 'down' frame, each made of the origin of the Port
+    and three orthonormal axes. The rotation that maps one frame onto another
+    is the product of their axes, so no singular value decomposition is
+    needed.
+
+    Parameters
+    ----------
+    from_port : mb.Port
+    to_port : mb.Port
+
+    Returns
+    -------
+    T : np.ndarray, shape=(2, 4, 4), dtype=float
+        The transforms mapping the 'up' and the 'down' frame of from_port
+        onto the 'up' frame of to_port.
+    """
+    from_origin, from_up, from_down = from_port._frames()
+    to_origin, to_up, _ = to_port._frames()
+
+    T = np.zeros((2, 4, 4))
+    T[:, :3, :3] = [to_up @ from_up.T, to_up @ from_down.T]
+    T[:, :3, 3] = to_origin - T[:, :3, :3] @ from_origin
+    T[:, 3, 3] = 1.0
+    return T
 
 
 def _translate(coordinates, by):
@@ -7,7 +7,7 @@ from collections import OrderedDict
 import ele
 
 import mbuild as mb
-from mbuild.bond_graph import BondGraph
+from mbuild.bond_graph import new_bond_graph
 from mbuild.exceptions import MBuildError
 
 logger = logging.getLogger(__name__)
@@ -71,7 +71,7 @@ def compound_from_json(json_file):
                     parent_compound.labels[key].append(sub_cmpd)
             parent_compound.add(sub_cmpd, check_box_size=False, label=label_str)
 
-        parent.bond_graph = BondGraph()
+        parent.bond_graph = new_bond_graph()
         parent.bond_graph.add_nodes_from([particle for particle in parent.particles()])
 
         _add_ports(compound_dict, converted_dict)
@@ -635,19 +635,17 @@ class Lattice(object):
                         break
                     except ElementError:
                         element = None
-                particle = mb.Compound(name=key_id, pos=[0, 0, 0], element=element)
-                for pos in all_pos:
-                    particle_to_add = mb.clone(particle)
-                    particle_to_add.translate_to(list(pos))
-                    compoundsList.append(particle_to_add)
+                particle = mb.Particle(name=key_id, pos=[0, 0, 0], element=element)
+                compoundsList.extend(
+                    mb.replicate(particle, len(all_pos), positions=all_pos)
+                )
         else:
             for key_id, all_pos in cell.items():
                 if isinstance(compound_dict[key_id], mb.Compound):
                     compound_to_move = compound_dict[key_id]
-                    for pos in all_pos:
-                        tmp_comp = mb.clone(compound_to_move)
-                        tmp_comp.translate_to(list(pos))
-                        compoundsList.append(tmp_comp)
+                    compoundsList.extend(
+                        mb.replicate(compound_to_move, len(all_pos), positions=all_pos)
+                    )
                 else:
                     err_type = type(compound_dict.get(key_id))
                     raise TypeError(
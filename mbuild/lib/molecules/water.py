@@ -11,9 +11,9 @@ class Water3Site(mb.Compound):
     def __init__(self, oh_bond_length, hoh_angle):
         super().__init__()
 
-        o1 = mb.Compound(name="OW", element="O", pos=[0.0, 0.0, 0.0])
-        h1 = mb.Compound(name="HW1", element="H", pos=[oh_bond_length, 0.0, 0.0])
-        h2 = mb.Compound(
+        o1 = mb.Particle(name="OW", element="O", pos=[0.0, 0.0, 0.0])
+        h1 = mb.Particle(name="HW1", element="H", pos=[oh_bond_length, 0.0, 0.0])
+        h2 = mb.Particle(
             name="HW2",
             element="H",
             pos=[
@@ -60,9 +60,9 @@ class Water4Site(mb.Compound):
     def __init__(self, oh_bond_length, hoh_angle, om_bond_length):
         super().__init__()
 
-        o1 = mb.Compound(name="OW", element="O", pos=[0.0, 0.0, 0.0])
-        h1 = mb.Compound(name="HW1", element="H", pos=[oh_bond_length, 0.0, 0.0])
-        h2 = mb.Compound(
+        o1 = mb.Particle(name="OW", element="O", pos=[0.0, 0.0, 0.0])
+        h1 = mb.Particle(name="HW1", element="H", pos=[oh_bond_length, 0.0, 0.0])
+        h2 = mb.Particle(
             name="HW2",
             element="H",
             pos=[
@@ -71,7 +71,7 @@ class Water4Site(mb.Compound):
                 0.0,
             ],
         )
-        m1 = mb.Compound(
+        m1 = mb.Particle(
             name="MW",
             element=None,
             pos=[
@@ -224,12 +224,10 @@ class Polymer(Compound):
             elif head_tail[i] is None and i == 1:
                 self.tail_port = None
 
-        port_ids = [
+        port_ids = {
             id(x) for x in self.available_ports()
-        ]  # prevent overlooking down port and incorrectly removing
-        for port in self.all_ports():
-            if id(port) not in port_ids:
-                self.remove(port)
+        }  # prevent overlooking down port and incorrectly removing
+        self.remove([port for port in self.all_ports() if id(port) not in port_ids])
 
     def add_monomer(
         self,
@@ -3,9 +3,7 @@
 import math
 import random
 
-import numpy as np
-
-from mbuild import Compound, Port
+from mbuild import AnalyticPort, Compound
 from mbuild.lib.recipes.tiled_compound import TiledCompound
 
 
@@ -82,9 +80,7 @@ class SilicaInterface(Compound):
         """Remove stray atoms and surface pieces."""
         components = self.bond_graph.connected_components()
         major_component = max(components, key=len)
-        for atom in list(self.particles()):
-            if atom not in major_component:
-                self.remove(atom)
+        self.remove([atom for atom in self.particles() if atom not in major_component])
 
     def _bridge_dangling_Os(self, oh_density, thickness):
         """Form Si-O-Si bridges to yield desired density of surface sites.
@@ -140,29 +136,30 @@ class SilicaInterface(Compound):
             if len(list(self.bond_graph.neighbors(atom))) == 1:
                 if atom.name == "O" and atom.pos[2] > thickness:
                     atom.name = "O_surface"
-                    port = Port(anchor=atom)
-                    port.spin(np.pi / 2, [1, 0, 0])
-                    port.translate(np.array([0.0, 0.0, 0.1]))
+                    port = AnalyticPort(
+                        anchor=atom, orientation=[0, 0, 1], separation=0.1
+                    )
                     self.add(port, f"port_{len(self.referenced_ports())}")
 
     def _adjust_stoichiometry(self):
         """Remove O's from underside of surface to yield a 2:1 Si:O ratio."""
-        num_O = len(list(self.particles_by_name("O")))
-        num_Si = len(list(self.particles_by_name("Si")))
-        n_deletions = num_O - 2 * num_Si
+        O_indices = self.particle_indices_by_name("O")
+        num_Si = len(self.particle_indices_by_name("Si"))
+        n_deletions = len(O_indices) - 2 * num_Si
 
+        particles = list(self.particles())
         bottom_Os = [
-            atom
-            for atom in self.particles()
-            if atom.name == "O"
-            and atom.pos[2] < self._O_buffer
-            and len(list(self.bond_graph.neighbors(atom))) == 1
+            particles[i]
+            for i in O_indices[self.xyz[O_indices, 2] < self._O_buffer].tolist()
+            if len(list(self.bond_graph.neighbors(particles[i]))) == 1
         ]
 
+        to_remove = []
         for _ in range(n_deletions):
             O1 = random.choice(bottom_Os)
             bottom_Os.remove(O1)
-            self.remove(O1)
+            to_remove.append(O1)
+        self.remove(to_remove)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ import itertools as it
 
 import numpy as np
 
-from mbuild import Box, Compound, Port, clone
+from mbuild import Box, Compound, Port, replicate
 from mbuild.exceptions import MBuildError
 from mbuild.periodic_kdtree import PeriodicKDTree
 
@@ -64,10 +64,10 @@ class TiledCompound(Compound):
 
         # Replicate and place periodic tiles.
         # -----------------------------------
-        for ijk in it.product(*[range(i) for i in n_tiles]):
-            new_tile = clone(tile)
-            new_tile.translate(np.multiply(ijk, np.asarray(tile.box.lengths)))
-
+        all_ijk = list(it.product(*[range(i) for i in n_tiles]))
+        shifts = np.multiply(all_ijk, np.asarray(tile.box.lengths))
+        new_tiles = replicate(tile, len(all_ijk), positions=tile.center + shifts)
+        for ijk, new_tile in zip(all_ijk, new_tiles):
             self._add_tile(new_tile, ijk)
             self._hoist_ports(new_tile)
 
@@ -120,11 +120,12 @@ class TiledCompound(Compound):
                 if (image1, particle2) not in bonds_to_add:
                     bonds_to_add.add((particle2, image1))
 
-        for bond in bonds_to_remove:
-            self.remove_bond(bond)
-
-        for bond in bonds_to_add:
-            self.add_bond(bond)
+        position = {particle: i for i, particle in enumerate(all_particles)}
+        self.remove_bonds(
+            [(position[p1], position[p2]) for p1, p2 in bonds_to_remove],
+            add_ports=True,
+        )
+        self.add_bonds([(position[p1], position[p2]) for p1, p2 in bonds_to_add])
 
         # Clean up temporary data.
         for particle in self._particles(include_ports=True):
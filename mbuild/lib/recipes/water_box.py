@@ -7,7 +7,7 @@ from collections.abc import Iterable
 import numpy as np
 
 import mbuild.lib.molecules.water as water_models
-from mbuild import Compound, clone, force_overlap, load
+from mbuild import Compound, clone, force_overlap, load, replicate
 from mbuild.exceptions import MBuildError
 
 __all__ = ["Water3SiteBox"]
@@ -162,6 +162,7 @@ class Water3SiteBox(Compound):
         # note we add to a list first, as this is more efficient than calling
         # the Compound.add function repeatedly as the Compound size grows.
         for water in aa_waters.children:
+            shifts = []
             for i, j, k in itertools.product(
                 range(scale_Lx), range(scale_Ly), range(scale_Lz)
             ):
@@ -200,13 +201,16 @@ class Water3SiteBox(Compound):
                             if dist <= cut_value:
                                 status = False
                         if status:
-                            temp = clone(water)
-                            temp.translate(shift)
-                            water_system_list.append(temp)
+                            shifts.append(shift)
                     else:
-                        temp = clone(water)
-                        temp.translate(shift)
-                        water_system_list.append(temp)
+                        shifts.append(shift)
+            water_system_list.extend(
+                replicate(
+                    water,
+                    len(shifts),
+                    positions=water.center + np.reshape(shifts, (-1, 3)),
+                )
+            )
 
         # add to the Compound and set box size
         self.add(water_system_list)
@@ -0,0 +1,266 @@
+"""Cell list neighbor search for particles in periodic and open boxes.
+
+A pure NumPy alternative to freud and `PeriodicKDTree` for finding all pairs
+of points within a cutoff distance. Points are binned into cells at least as
+wide as the cutoff, so each point only needs to be compared with the points
+in its own and the 26 surrounding cells. All pairs are found with a handful
+of vectorized operations per neighboring cell offset.
+
+Orthorhombic and triclinic `mb.Box` objects are supported, and each box
+vector may be periodic or not. Binning is done in fractional coordinates of
+the box, so a triclinic box is handled exactly like an orthorhombic one.
+"""
+
+import itertools
+
+import numpy as np
+
+from mbuild.box import Box
+
+__all__ = ["CellList", "neighbor_pairs"]
+
+# Offsets of a cell and its 26 neighbors in cell coordinates.
+_CELL_OFFSETS = np.array(list(itertools.product((-1, 0, 1), repeat=3)))
+
+
+class CellList:
+    """Bin points into cells to find all neighbors within a cutoff.
+
+    Parameters
+    ----------
+    points : array-like, shape=(n, 3), dtype=float
+        The points to search for neighbors of query points.
+    r_max : float
+        The largest distance that will be queried. Cells are at least this
+        wide along each box vector.
+    box : mb.Box, optional, default=None
+        The box containing the points, positioned with a corner at the
+        origin. If None, the search is not periodic and the cells span the
+        points.
+    periodicity : tuple of bool, length=3, optional, default=None
+        Whether the box is periodic along each of its vectors. Defaults to
+        (True, True, True) if a box is given and to (False, False, False)
+        otherwise.
+
+    Notes
+    -----
+    Along a periodic box vector, the perpendicular width of the box must be
+    at least twice `r_max`, so that at most one periodic image of each point
+    is within `r_max` of a query point.
+    """
+
+    def __init__(self, points, r_max, box=None, periodicity=None):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.r_max = float(r_max)
+        if self.r_max <= 0:
+            raise ValueError(f"r_max must be positive, got {r_max}.")
+        if periodicity is None:
+            periodicity = (box is not None,) * 3
+        self.periodicity = np.array(periodicity, dtype=bool).reshape(3)
+        if self.periodicity.any() and box is None:
+            raise ValueError("A box is required for a periodic neighbor search.")
+        if box is None:
+            self.vectors = np.identity(3)
+        elif isinstance(box, Box):
+            self.vectors = np.asarray(box.vectors, dtype=float)
+        else:
+            self.vectors = np.asarray(box, dtype=float).reshape(3, 3)
+        self._inverse = np.linalg.inv(self.vectors)
+
+        # Distance between opposite faces of the box along each vector.
+        volume = abs(np.linalg.det(self.vectors))
+        normals = np.cross(
+            np.roll(self.vectors, -1, axis=0), np.roll(self.vectors, -2, axis=0)
+        )
+        self._widths = volume / np.linalg.norm(normals, axis=1)
+        too_small = self.periodicity & (self._widths < 2 * self.r_max)
+        if too_small.any():
+            raise ValueError(
+                f"r_max={self.r_max} is larger than half of the box width "
+                f"along the periodic box vectors {np.flatnonzero(too_small)}."
+            )
+
+        fractional = self._fractional(self.points)
+        # Cells span [0, 1) along periodic vectors and the points otherwise.
+        self._lo = np.zeros(3)
+        self._extent = np.ones(3)
+        if len(fractional) and not self.periodicity.all():
+            lo = fractional.min(axis=0)
+            extent = fractional.max(axis=0) - lo
+            self._lo = np.where(self.periodicity, 0.0, lo)
+            self._extent = np.where(self.periodicity, 1.0, np.maximum(extent, 1e-12))
+        self.n_cells = self._cell_counts(len(fractional))
+        self._shape = tuple(self.n_cells.tolist())
+
+        cells = self._cell_coordinates(fractional)
+        cell_ids = np.ravel_multi_index(cells.T, self._shape)
+        self._order = np.argsort(cell_ids, kind="stable")
+        self._fractional_points = fractional[self._order]
+        counts = np.bincount(cell_ids, minlength=int(np.prod(self._shape)))
+        self._cell_start = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._cell_start[1:])
+
+    def _fractional(self, xyz):
+        """Return fractional box coordinates, wrapped along periodic vectors."""
+        fractional = xyz @ self._inverse
+        fractional[:, self.periodicity] -= np.floor(fractional[:, self.periodicity])
+        return fractional
+
+    def _cell_counts(self, n_points):
+        """Return the number of cells along each box vector."""
+        widths = self._widths * self._extent
+        n_cells = np.maximum(np.floor(widths / self.r_max), 1).astype(np.int64)
+        # Keep the number of cells on the order of the number of points.
+        max_cells = max(2 * n_points, 27)
+        while np.prod(n_cells) > max_cells:
+            n_cells = np.maximum(n_cells // 2, 1)
+        return n_cells
+
+    def _cell_coordinates(self, fractional):
+        """Return the integer cell coordinates of fractional positions."""
+        cells = np.floor((fractional - self._lo) / self._extent * self.n_cells)
+        return np.clip(cells, 0, self.n_cells - 1).astype(np.int64)
+
+    def query(self, query_points, r_max=None, r_min=0.0, exclude_ii=False):
+        """Find all pairs of query points and points within a distance range.
+
+        Parameters
+        ----------
+        query_points : array-like, shape=(m, 3), dtype=float
+            The points to find neighbors of.
+        r_max : float, optional, default=None
+            The largest distance of a neighbor. Defaults to the `r_max` the
+            cell list was built with, and cannot be larger.
+        r_min : float, optional, default=0.0
+            The smallest distance of a neighbor.
+        exclude_ii : bool, optional, default=False
+            Whether to exclude pairs with equal indices, as when the query
+            points are the points of the cell list.
+
+        Returns
+        -------
+        i : np.ndarray, shape=(n_pairs,), dtype=int
+            The index of the query point of each pair.
+        j : np.ndarray, shape=(n_pairs,), dtype=int
+            The index of the point of each pair.
+        distances : np.ndarray, shape=(n_pairs,), dtype=float
+            The distance between the points of each pair, using the nearest
+            periodic image. Pairs are sorted by i, then j.
+        """
+        if r_max is None:
+            r_max = self.r_max
+        elif r_max > self.r_max:
+            raise ValueError(
+                f"r_max={r_max} is larger than the r_max={self.r_max} the "
+                "cell list was built with."
+            )
+        query_points = np.asarray(query_points, dtype=float).reshape(-1, 3)
+        query_fractional = self._fractional(query_points)
+        query_cells = self._cell_coordinates(query_fractional)
+        query_indices = np.arange(len(query_points))
+        n_cells = self.n_cells
+        periodic = self.periodicity
+
+        # Neighboring cells that wrap onto the same cell along a periodic
+        # vector with fewer than 3 cells are only visited once per image.
+        found_i, found_j, found_d = [], [], []
+        for offset in _CELL_OFFSETS:
+            neighbor_cells = query_cells + offset
+            images = np.where(periodic, np.floor_divide(neighbor_cells, n_cells), 0)
+            neighbor_cells = np.where(
+                periodic, np.mod(neighbor_cells, n_cells), neighbor_cells
+            )
+            inside = np.all((neighbor_cells >= 0) & (neighbor_cells < n_cells), axis=1)
+            if not inside.any():
+                continue
+            cell_ids = np.ravel_multi_index(neighbor_cells[inside].T, self._shape)
+            starts = self._cell_start[cell_ids]
+            counts = self._cell_start[cell_ids + 1] - starts
+            n_pairs = int(counts.sum())
+            if n_pairs == 0:
+                continue
+            pair_query = np.repeat(np.flatnonzero(inside), counts)
+            first_pair = np.repeat(np.cumsum(counts) - counts, counts)
+            sorted_j = np.repeat(starts, counts) + np.arange(n_pairs) - first_pair
+            displacement = (
+                self._fractional_points[sorted_j]
+                + images[pair_query]
+                - query_fractional[pair_query]
+            ) @ self.vectors
+            distances = np.linalg.norm(displacement, axis=1)
+            keep = (distances >= r_min) & (distances <= r_max)
+            i = query_indices[pair_query[keep]]
+            j = self._order[sorted_j[keep]]
+            if exclude_ii:
+                distinct = i != j
+                i, j, distances = i[distinct], j[distinct], distances[keep][distinct]
+            else:
+                distances = distances[keep]
+            found_i.append(i)
+            found_j.append(j)
+            found_d.append(distances)
+
+        if not found_i:
+            return (
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=float),
+            )
+        i = np.concatenate(found_i)
+        j = np.concatenate(found_j)
+        distances = np.concatenate(found_d)
+        order = np.lexsort((j, i))
+        return i[order], j[order], distances[order]
+
+    def pairs(self, r_max=None, r_min=0.0):
+        """Find all pairs of points of the cell list within a distance range.
+
+        Parameters
+        ----------
+        r_max : float, optional, default=None
+            The largest distance of a pair. Defaults to the `r_max` the cell
+            list was built with, and cannot be larger.
+        r_min : float, optional, default=0.0
+            The smallest distance of a pair.
+
+        Returns
+        -------
+        i, j : np.ndarray, shape=(n_pairs,), dtype=int
+            The indices of the points of each pair, with i < j.
+        distances : np.ndarray, shape=(n_pairs,), dtype=float
+            The distance between the points of each pair.
+        """
+        i, j, distances = self.query(
+            self.points, r_max=r_max, r_min=r_min, exclude_ii=True
+        )
+        unique = i < j
+        return i[unique], j[unique], distances[unique]
+
+
+def neighbor_pairs(points, r_max, box=None, periodicity=None, r_min=0.0):
+    """Find all pairs of points within a distance range.
+
+    Parameters
+    ----------
+    points : array-like, shape=(n, 3), dtype=float
+        The points to find pairs of.
+    r_max : float
+        The largest distance of a pair.
+    box : mb.Box, optional, default=None
+        The box containing the points. See `CellList`.
+    periodicity : tuple of bool, length=3, optional, default=None
+        Whether the box is periodic along each of its vectors. See
+        `CellList`.
+    r_min : float, optional, default=0.0
+        The smallest distance of a pair.
+
+    Returns
+    -------
+    i, j : np.ndarray, shape=(n_pairs,), dtype=int
+        The indices of the points of each pair, with i < j.
+    distances : np.ndarray, shape=(n_pairs,), dtype=float
+        The distance between the points of each pair, using the nearest
+        periodic image.
+    """
+    cell_list = CellList(points, r_max, box=box, periodicity=periodicity)
+    return cell_list.pairs(r_min=r_min)
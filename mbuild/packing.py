@@ -3,11 +3,13 @@
 http://leandro.iqm.unicamp.br/m3g/packmol/home.shtml
 """
 
+import hashlib
 import logging
 import os
 import shutil
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from itertools import zip_longest
 from subprocess import PIPE, Popen
 
@@ -15,7 +17,7 @@ import numpy as np
 
 from mbuild import clone
 from mbuild.box import Box
-from mbuild.compound import Compound
+from mbuild.compound import Compound, replicate
 from mbuild.exceptions import MBuildError
 
 __all__ = ["fill_box", "fill_region", "fill_sphere", "solvate"]
@@ -63,6 +65,109 @@ constrain_rotation y 0. 0.
 constrain_rotation z 0. 0.
 """
 
+_packmol_cache = None
+
+
+def set_packmol_cache(directory, max_size=2**30):
+    """Cache the results of PACKMOL on disk.
+
+    A packing that was done before is copied from the cache instead of
+    running PACKMOL again. That means the same structures, numbers of
+    molecules, regions, seed and other PACKMOL options. Results are keyed on
+    a hash of the PACKMOL input, in which the names of the structure files are
+    replaced by a hash of their contents. Packings that PACKMOL could not
+    finish without overlaps are not cached.
+
+    Parameters
+    ----------
+    directory : str or None
+        Directory to store the results in, created if needed. None disables
+        the cache.
+    max_size : int, optional, default=2**30
+        Maximum total size of the cached results, in bytes. When it is
+        exceeded, the least recently used results are removed.
+    """
+    global _packmol_cache
+    if directory is None:
+        _packmol_cache = None
+    else:
+        _packmol_cache = _PackmolCache(directory, max_size)
+
+
+class _PackmolCache:
+    """PACKMOL outputs stored in a directory, keyed on their inputs.
+
+    Each output is stored as `<key>.xyz`. The modification time of a file is
+    updated whenever it is used, so the least recently used outputs are the
+    ones with the oldest modification times.
+    """
+
+    def __init__(self, directory, max_size):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, input_text):
+        """Return the key of a PACKMOL input.
+
+        The output file is left out and each structure file is replaced by a
+        hash of its contents, since both are temporary files with random
+        names.
+        """
+        digest = hashlib.sha256(str(PACKMOL).encode())
+        for line in input_text.splitlines():
+            keyword, _, argument = line.strip().partition(" ")
+            if keyword == "output":
+                continue
+            if keyword == "structure":
+                with open(argument, "rb") as structure_file:
+                    line = hashlib.sha256(structure_file.read()).hexdigest()
+            digest.update(line.encode() + b"\n")
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.xyz")
+
+    def load(self, key, filled_xyz):
+        """Copy the output stored under key to filled_xyz, if there is one."""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, filled_xyz.name)
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key, filled_xyz):
+        """Store the output in filled_xyz under key and evict old outputs."""
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(handle)
+        shutil.copyfile(filled_xyz.name, temp_path)
+        os.replace(temp_path, self._path(key))
+        self._evict(keep=self._path(key))
+
+    def _evict(self, keep):
+        """Remove least recently used outputs other than keep to fit max_size."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".xyz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
 
 def check_packmol_args(custom_args):
     # List of all available packmol_inputs.
@@ -118,6 +223,7 @@ def fill_box(
     packmol_file=None,
     update_port_locations=False,
     packmol_args=None,
+    n_domains=1,
 ):
     """Fill a box with an `mbuild.compound` or `Compound` s using PACKMOL.
 
@@ -196,6 +302,11 @@ def fill_box(
         seed and overlap.
         Other command options can be found in the PACKMOL userguide:
         http://www.ime.unicamp.br/~martinez/packmol/userguide.shtml
+    n_domains : int, default=1
+        Split the box into this many slabs along its longest side and pack
+        them concurrently, each with its own PACKMOL process. A gap of
+        `overlap` is left between neighboring slabs, so that molecules packed
+        in different slabs cannot overlap. Must be 1 if `use_pbc` is True.
 
     Notes
     -----
@@ -316,6 +427,8 @@ def fill_box(
     overlap *= 10
     if use_pbc and edge != 0:
         raise ValueError("edge must be 0 if use_pbc is set to True")
+    if use_pbc and n_domains > 1:
+        raise ValueError("n_domains must be 1 if use_pbc is set to True")
     # Apply edge buffer
     box_maxs = [a_max - (edge * 10) for a_max in box_maxs]
     box_mins = [a_min + (edge * 10) for a_min in box_mins]
@@ -333,6 +446,7 @@ def fill_box(
 
     # create a list to contain the file handles for the compound temp files
     compound_xyz_list = list()
+    structures = list()
     try:
         if use_pbc:
             pbc_arg = "pbc {0:.3f} {1:.3f} {2:.3f} {3:.3f} {4:.3f} {5:.3f}".format(
@@ -364,7 +478,27 @@ def fill_box(
                 fill_arg,
                 PACKMOL_CONSTRAIN if rotate else "",
             )
-        _run_packmol(input_text, filled_xyz, temp_file, packmol_file)
+            structures.append(
+                (
+                    compound_xyz.name,
+                    m_compounds,
+                    box_mins,
+                    box_maxs,
+                    rotate,
+                    comp.n_particles,
+                )
+            )
+        if n_domains > 1:
+            _run_packmol_domains(
+                (overlap, seed, sidemax * 10, packmol_commands),
+                structures,
+                n_domains,
+                filled_xyz,
+                temp_file,
+                packmol_file,
+            )
+        else:
+            _run_packmol(input_text, filled_xyz, temp_file, packmol_file)
         # Create the topology and update the coordinates.
         filled = Compound(periodicity=periodicity)
         filled = _create_topology(filled, compound, n_compounds)
@@ -397,6 +531,7 @@ def fill_region(
     packmol_file=None,
     update_port_locations=False,
     packmol_args=None,
+    n_domains=1,
 ):
     """Fill a region of a box with `mbuild.Compound` (s) using PACKMOL.
 
@@ -448,6 +583,11 @@ def fill_region(
         seed and overlap.
         Other command options can be found in the PACKMOL userguide:
         http://www.ime.unicamp.br/~martinez/packmol/userguide.shtml
+    n_domains : int, default=1
+        Split the regions into this many slabs along the longest side of
+        their bounding box and pack them concurrently, each with its own
+        PACKMOL process. A gap of `overlap` is left between neighboring slabs,
+        so that molecules packed in different slabs cannot overlap.
 
     Notes
     -----
@@ -563,6 +703,7 @@ def fill_region(
 
     # List to hold file handles for the temporary compounds
     compound_xyz_list = list()
+    structures = list()
     try:
         input_text = PACKMOL_HEADER.format(
             overlap, filled_xyz.name, seed, sidemax * 10, packmol_commands, ""
@@ -596,8 +737,28 @@ def fill_region(
                 fill_arg,
                 PACKMOL_CONSTRAIN if rotate else "",
             )
+            structures.append(
+                (
+                    compound_xyz.name,
+                    m_compounds,
+                    reg_mins,
+                    reg_maxs,
+                    rotate,
+                    comp.n_particles,
+                )
+            )
 
-        _run_packmol(input_text, filled_xyz, temp_file, packmol_file)
+        if n_domains > 1:
+            _run_packmol_domains(
+                (overlap, seed, sidemax * 10, packmol_commands),
+                structures,
+                n_domains,
+                filled_xyz,
+                temp_file,
+                packmol_file,
+            )
+        else:
+            _run_packmol(input_text, filled_xyz, temp_file, packmol_file)
 
         # Create the topology and update the coordinates.
         filled = Compound()
@@ -859,6 +1020,7 @@ def solvate(
     update_port_locations=False,
     center_solute=True,
     packmol_args=None,
+    n_domains=1,
 ):
     """Solvate a compound in a box of solvent using PACKMOL.
 
@@ -911,6 +1073,12 @@ def solvate(
         seed and overlap.
         Other command options can be found in the PACKMOL userguide:
         http://www.ime.unicamp.br/~martinez/packmol/userguide.shtml
+    n_domains : int, default=1
+        Split the box into this many slabs along its longest side and pack
+        them concurrently, each with its own PACKMOL process. A gap of
+        `overlap` is left between neighboring slabs, so that molecules packed
+        in different slabs cannot overlap. The solute is fixed in every slab.
+        Must be 1 if `use_pbc` is True.
 
     Notes
     -----
@@ -963,6 +1131,8 @@ def solvate(
     overlap *= 10
     if use_pbc and edge != 0:
         raise ValueError("edge must be 0 if use_pbc is set to True")
+    if use_pbc and n_domains > 1:
+        raise ValueError("n_domains must be 1 if use_pbc is set to True")
     if center_solute:
         center_solute = (box_maxs + box_mins) / 2
     else:
@@ -984,6 +1154,7 @@ def solvate(
 
     # generate list of temp files for the solvents
     solvent_xyz_list = list()
+    structures = list()
     try:
         if use_pbc:
             pbc_arg = "pbc {0:.3f} {1:.3f} {2:.3f} {3:.3f} {4:.3f} {5:.3f}".format(
@@ -1000,9 +1171,18 @@ def solvate(
             pbc_arg = ""
             periodicity = (False, False, False)
         solute.save(solute_xyz.name, overwrite=True)
-        input_text = PACKMOL_HEADER.format(
-            overlap, solvated_xyz.name, seed, sidemax * 10, packmol_commands, pbc_arg
-        ) + PACKMOL_SOLUTE.format(solute_xyz.name, *center_solute.tolist())
+        solute_arg = PACKMOL_SOLUTE.format(solute_xyz.name, *center_solute.tolist())
+        input_text = (
+            PACKMOL_HEADER.format(
+                overlap,
+                solvated_xyz.name,
+                seed,
+                sidemax * 10,
+                packmol_commands,
+                pbc_arg,
+            )
+            + solute_arg
+        )
 
         for solv, m_solvent, rotate in zip(solvent, n_solvent, fix_orientation):
             m_solvent = int(m_solvent)
@@ -1016,7 +1196,28 @@ def solvate(
                 fill_arg,
                 PACKMOL_CONSTRAIN if rotate else "",
             )
-        _run_packmol(input_text, solvated_xyz, temp_file, packmol_file)
+            structures.append(
+                (
+                    solvent_xyz.name,
+                    m_solvent,
+                    box_mins,
+                    box_maxs,
+                    rotate,
+                    solv.n_particles,
+                )
+            )
+        if n_domains > 1:
+            _run_packmol_domains(
+                (overlap, seed, sidemax * 10, packmol_commands),
+                structures,
+                n_domains,
+                solvated_xyz,
+                temp_file,
+                packmol_file,
+                fixed=(solute_arg, solute.n_particles),
+            )
+        else:
+            _run_packmol(input_text, solvated_xyz, temp_file, packmol_file)
 
         # Create the topology and update the coordinates.
         solvated = Compound(periodicity=periodicity)
@@ -1148,8 +1349,7 @@ def _create_topology(container, comp_to_add, n_compounds):
     """
     container_list = []
     for comp, m_compound in zip(comp_to_add, n_compounds):
-        for _ in range(m_compound):
-            container_list.append(clone(comp))
+        container_list.extend(replicate(comp, m_compound))
 
     container.add(container_list)
     return container
@@ -1175,6 +1375,11 @@ def _run_packmol(input_text, filled_xyz, temp_file, packmol_file):
         Where to copy the filled tempfile.
     packmol_file : str, required
         Path to save the generated PACKMOL input file if desired.
+
+    Notes
+    -----
+    If a cache is set with `set_packmol_cache`, PACKMOL only runs for inputs
+    whose output is not in the cache.
     """
     # Create input file
     packmol_inp = tempfile.NamedTemporaryFile(
@@ -1190,28 +1395,190 @@ def _run_packmol(input_text, filled_xyz, temp_file, packmol_file):
         ):
             shutil.copyfileobj(inp_file, new_file)
 
-    proc = Popen(
-        f"{PACKMOL} < {packmol_inp.name}",
-        stdin=PIPE,
-        stdout=PIPE,
-        stderr=PIPE,
-        universal_newlines=True,
-        shell=True,
-    )
-    out, err = proc.communicate()
-
-    if "WITHOUT PERFECT PACKING" in out:
-        logger.warning(
-            "Packmol finished with imperfect packing. Using the .xyz_FORCED "
-            "file instead. This may not be a sufficient packing result."
+    # Reuse the output of an identical packing if it is cached.
+    cache = _packmol_cache
+    cache_key = None if cache is None else cache.key(input_text)
+    if cache_key is not None and cache.load(cache_key, filled_xyz):
+        os.remove(packmol_inp.name)
+    else:
+        proc = Popen(
+            f"{PACKMOL} < {packmol_inp.name}",
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=PIPE,
+            universal_newlines=True,
+            shell=True,
         )
-        os.system(f"cp {filled_xyz.name}_FORCED {filled_xyz.name}")
+        out, err = proc.communicate()
 
-    if "ERROR" in out or proc.returncode != 0:
-        _packmol_error(out, err)
-    else:
-        # Delete input file if success
-        os.remove(packmol_inp.name)
+        if "WITHOUT PERFECT PACKING" in out:
+            logger.warning(
+                "Packmol finished with imperfect packing. Using the .xyz_FORCED "
+                "file instead. This may not be a sufficient packing result."
+            )
+            os.system(f"cp {filled_xyz.name}_FORCED {filled_xyz.name}")
+
+        if "ERROR" in out or proc.returncode != 0:
+            _packmol_error(out, err)
+        else:
+            # Delete input file if success
+            os.remove(packmol_inp.name)
+            if cache_key is not None and "WITHOUT PERFECT PACKING" not in out:
+                cache.store(cache_key, filled_xyz)
+
+    if temp_file is not None:
+        os.system("cp {0} {1}".format(filled_xyz.name, os.path.join(temp_file)))
+
+
+def _run_packmol_domains(
+    header_args,
+    structures,
+    n_domains,
+    filled_xyz,
+    temp_file,
+    packmol_file,
+    fixed=None,
+):
+    """Pack slabs of the packing regions concurrently and combine the results.
+
+    The bounding box of the regions of all structures is cut into `n_domains`
+    slabs of equal width along its longest side. The molecules of each
+    structure are shared between the slabs in proportion to the width of its
+    region inside each slab. A gap of `overlap` is left below the upper face
+    of every slab but the last, so molecules in neighboring slabs cannot
+    overlap and each slab can be packed on its own. The PACKMOL processes of
+    the slabs run concurrently, and their outputs are combined into
+    `filled_xyz` in the order of a single PACKMOL run over all slabs.
+
+    Parameters
+    ----------
+    header_args : tuple
+        The overlap, seed, sidemax and additional commands used to format
+        `PACKMOL_HEADER`, with lengths in angstroms. The seed of each slab is
+        offset by the index of the slab.
+    structures : list of tuple
+        For each structure: the name of its xyz file, the number of molecules,
+        the mins and maxs of its region in angstroms, whether its orientation
+        is fixed and the number of particles in each molecule.
+    n_domains : int
+        Number of slabs.
+    filled_xyz : `tempfile` object, required
+        Tempfile that will store the combined results of PACKMOL packing.
+    temp_file : `tempfile` object, required
+        Where to copy the filled tempfile.
+    packmol_file : str, required
+        Path to save the generated PACKMOL input files if desired. The index
+        of the slab is appended to the name of the input file of each slab.
+    fixed : tuple, optional, default=None
+        The PACKMOL input of a fixed structure to include in every slab, and
+        its number of particles. It is written once, before the other
+        structures, to `filled_xyz`.
+    """
+    overlap, seed, sidemax, packmol_commands = header_args
+    mins = np.min([structure[2] for structure in structures], axis=0)
+    maxs = np.max([structure[3] for structure in structures], axis=0)
+    axis = int(np.argmax(maxs - mins))
+    edges = np.linspace(mins[axis], maxs[axis], n_domains + 1)
+    if edges[1] - edges[0] <= overlap:
+        raise ValueError(
+            f"n_domains={n_domains} is too large for the packing region. Each "
+            "slab must be wider than `overlap`."
+        )
+    gaps = np.full(n_domains, overlap)
+    gaps[-1] = 0.0
+
+    # Lower and upper bound along the axis of the part of each region in
+    # each slab, and the number of molecules packed there.
+    lows = []
+    highs = []
+    counts = []
+    for _, n, region_mins, region_maxs, _, _ in structures:
+        low = np.maximum(edges[:-1], region_mins[axis])
+        high = np.minimum(edges[1:] - gaps, region_maxs[axis])
+        widths = np.clip(high - low, 0.0, None)
+        if n and not widths.sum():
+            raise ValueError(
+                "A packing region lies between the slabs. Use a smaller n_domains."
+            )
+        quota = n * widths / widths.sum() if n else np.zeros(n_domains)
+        count = np.floor(quota).astype(int)
+        # Give the molecules left over to the largest remainders.
+        count[np.argsort(count - quota, kind="stable")[: n - count.sum()]] += 1
+        lows.append(low)
+        highs.append(high)
+        counts.append(count)
+
+    outputs = []
+    runs = []
+    try:
+        for domain in range(n_domains):
+            output = _new_xyz_file()
+            outputs.append(output)
+            if not any(count[domain] for count in counts) and (fixed is None or runs):
+                continue
+            input_text = PACKMOL_HEADER.format(
+                overlap, output.name, seed + domain, sidemax, packmol_commands, ""
+            )
+            if fixed is not None:
+                input_text += fixed[0]
+            for structure, low, high, count in zip(structures, lows, highs, counts):
+                if count[domain] == 0:
+                    continue
+                name, _, region_mins, region_maxs, rotate, _ = structure
+                box_arg = list(region_mins) + list(region_maxs)
+                box_arg[axis] = low[domain]
+                box_arg[3 + axis] = high[domain]
+                input_text += PACKMOL_BOX.format(
+                    name,
+                    int(count[domain]),
+                    "inside box {0:.3f} {1:.3f} {2:.3f} {3:.3f} {4:.3f} {5:.3f}".format(
+                        *box_arg
+                    ),
+                    PACKMOL_CONSTRAIN if rotate else "",
+                )
+            domain_file = None
+            if packmol_file:
+                root, ext = os.path.splitext(packmol_file)
+                domain_file = f"{root}_{domain}{ext}"
+            runs.append((domain, input_text, output, domain_file))
+
+        # PACKMOL runs in its own process, so threads are enough to run the
+        # slabs in parallel.
+        n_workers = max(1, min(len(runs), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(_run_packmol, input_text, output, None, domain_file)
+                for _, input_text, output, domain_file in runs
+            ]
+            for future in futures:
+                future.result()
+
+        # Particles of each slab, in the order of its PACKMOL input.
+        lines = {}
+        for domain, _, output, _ in runs:
+            with open(output.name, "r") as xyz_file:
+                lines[domain] = xyz_file.readlines()[2:]
+        n_fixed = 0
+        combined = []
+        if fixed is not None:
+            n_fixed = fixed[1]
+            combined.extend(lines[runs[0][0]][:n_fixed])
+        offsets = dict.fromkeys(lines, n_fixed)
+        for structure, count in zip(structures, counts):
+            n_particles = structure[5]
+            for domain in lines:
+                stop = offsets[domain] + count[domain] * n_particles
+                combined.extend(lines[domain][offsets[domain] : stop])
+                offsets[domain] = stop
+    finally:
+        for output in outputs:
+            output.close()
+            os.unlink(output.name)
+
+    with open(filled_xyz.name, "w") as xyz_file:
+        xyz_file.write(f"{len(combined)}\n")
+        xyz_file.write(f"Built with Packmol in {len(runs)} slabs\n")
+        xyz_file.writelines(combined)
 
     if temp_file is not None:
         os.system("cp {0} {1}".format(filled_xyz.name, os.path.join(temp_file)))
@@ -4,7 +4,7 @@ from itertools import product
 
 import numpy as np
 
-from mbuild import clone
+from mbuild import clone, replicate
 from mbuild.coordinate_transform import force_overlap
 from mbuild.utils.validation import assert_port_exists
 
@@ -97,11 +97,9 @@ class Pattern(object):
 
                 compounds.append(new_compound)
         else:
-            for point in self.points:
-                new_compound = clone(compound)
-                new_compound.translate(point)
-
-                compounds.append(new_compound)
+            compounds = replicate(
+                compound, len(self.points), positions=compound.center + self.points
+            )
         return compounds
 
     def apply_to_compound(
@@ -139,7 +137,8 @@ class Pattern(object):
         backfills : list of mb.Compound
             List of inserted backfill compounds on host compound
         """
-        n_ports = len(host.available_ports())
+        host_ports = host.available_ports()
+        n_ports = len(host_ports)
         assert n_ports >= self.points.shape[0], "Not enough ports for pattern."
         assert_port_exists(guest_port_name, guest)
         box = host.get_boundingbox()
@@ -147,14 +146,20 @@ class Pattern(object):
             self.scale(box.lengths)
             self.points += host.mins
         pattern = self.points
+        from mbuild.port import AnalyticPort
+
         port_positions = np.empty(shape=(n_ports, 3))
         port_list = list()
-        for port_idx, port in enumerate(host.available_ports()):
-            port_positions[port_idx, :] = port["up"]["middle"].pos
+        for port_idx, port in enumerate(host_ports):
+            if isinstance(port, AnalyticPort):
+                port_positions[port_idx, :] = port.center
+            else:
+                port_positions[port_idx, :] = port["up"]["middle"].pos
             port_list.append(port)
         used_ports = set()  # Keep track of used ports for backfilling.
         guests = []
-        for point in pattern:
+        new_guests = replicate(guest, len(pattern))
+        for point, new_guest in zip(pattern, new_guests):
             closest_point_idx = np.argmin(
                 host.min_periodic_distance(point, port_positions)
             )
@@ -162,7 +167,6 @@ class Pattern(object):
             used_ports.add(closest_port)
 
             # Attach the guest to the closest port.
-            new_guest = clone(guest)
             force_overlap(new_guest, new_guest.labels[guest_port_name], closest_port)
             guests.append(new_guest)
 
@@ -173,16 +177,16 @@ class Pattern(object):
         if backfill:
             assert_port_exists(backfill_port_name, backfill)
             # Attach the backfilling Compound to unused ports.
-            for port in port_list:
-                if port not in used_ports:
-                    new_backfill = clone(backfill)
-                    # Might make sense to have a backfill_port_name option...
-                    force_overlap(
-                        new_backfill,
-                        new_backfill.labels[backfill_port_name],
-                        port,
-                    )
-                    backfills.append(new_backfill)
+            unused_ports = [port for port in port_list if port not in used_ports]
+            new_backfills = replicate(backfill, len(unused_ports))
+            for port, new_backfill in zip(unused_ports, new_backfills):
+                # Might make sense to have a backfill_port_name option...
+                force_overlap(
+                    new_backfill,
+                    new_backfill.labels[backfill_port_name],
+                    port,
+                )
+                backfills.append(new_backfill)
         return guests, backfills
 
 
@@ -1,7 +1,9 @@
 """Periodic KDTree module.
 
 A wrapper around scipy.spatial.kdtree to implement periodic boundary
-conditions
+conditions. Orthorhombic boxes use the periodic `boxsize` of the scipy
+kd-tree, and triclinic boxes search all neighboring periodic images of the
+query points in one batch.
 
 Written by Patrick Varilly, 6 Jul 2012
 Released under the scipy license:
@@ -32,124 +34,118 @@ OUT OF THE USE OF THIS  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
 DAMAGE.
 """
 
-import heapq
-from itertools import chain
+import itertools
 
 import numpy as np
-from scipy.spatial import KDTree
+from scipy.sparse import coo_matrix
+from scipy.spatial import KDTree, cKDTree
 
 import mbuild as mb
 
 
-def _gen_relevant_images(x, bounds, distance_upper_bound):
-    """Map x onto canonical unit cell and produce mirror images."""
-    real_x = np.copy(x)
-
-    for i, coord in enumerate(x):
-        if bounds[i] > 0.0:
-            real_x[i] = x[i] - np.floor(x[i] / bounds[i]) * bounds[i]
-
-    m = len(x)
-
-    xs = [real_x]
-    for i in range(m):
-        if bounds[i] > 0.0:
-            disp = np.zeros(m)
-            disp[i] = bounds[i]
-
-            if distance_upper_bound == np.inf:
-                xs = list(chain.from_iterable((_ + disp, _, _ - disp) for _ in xs))
-            else:
-                extra_xs = []
-
-                # Point near lower boundary, include image on upper side
-                if abs(real_x[i]) < distance_upper_bound:
-                    extra_xs.extend(_ + disp for _ in xs)
-
-                # Point near upper boundary, include image on lower side
-                if abs(bounds[i] - real_x[i]) < distance_upper_bound:
-                    extra_xs.extend(_ - disp for _ in xs)
-
-                xs.extend(extra_xs)
-    return xs
-
-
 class PeriodicKDTree(KDTree):
     """Cython kd-tree for nearest-neighbor lookup with periodic boundaries.
 
     See scipy.spatial.kdtree for details on kd-trees.
 
-    Searches with periodic boundaries are implemented by mapping all initial
-    data points to one canonical periodic image, building an ordinary kd-tree
-    with these points, then querying this kd-tree multiple times, if necessary,
-    with all the relevant periodic images of the query point.
+    Data points are mapped to one canonical periodic image. In orthorhombic
+    boxes, the kd-tree is built with the `boxsize` of scipy, so all queries
+    use the nearest periodic image in compiled code. In triclinic boxes, an
+    ordinary kd-tree is built and every query point is replicated into all of
+    its neighboring periodic images, which are searched in one batch.
 
     Parameters
     ----------
+    bounds : array_like, shape (m,) or (m, m), required
+        Size of the periodic box along each spatial dimension. A negative or
+        zero size for dimension k means that space is not periodic along k.
+        Alternatively, the box vectors of a triclinic box as the rows of a
+        matrix.
     data : array-like, shape (n,m), required
-        The n data points of dimension m to be indexed. This array is not copied
-        unless this is necessary to produce a contiguous array of doubles, and
-        so modifying this data will result in bogus results.
-    bounds : array_like, shape (m,), required
-        Size of the periodic box along each spatial dimension.  A
-        negative or zero size for dimension k means that space is not
-        periodic along k.
+        The n data points of dimension m to be indexed.
     leafsize : positive integer, optional, default=10
         The number of points at which the algorithm switches over to
         brute-force.
+    periodicity : array_like of bool, shape (m,), optional, default=None
+        Whether space is periodic along each box vector. Defaults to
+        periodic along every dimension with a positive size.
 
     Note
     ----
-    To ensure that no two distinct images of the same point appear in the
-    results, it is essential to restrict the maximum distance between a query
-    point and a data point to half the smallest box dimension.
+    In triclinic boxes, to ensure that no two distinct images of the same
+    point appear in the results, distances are restricted to half the
+    smallest distance between opposite faces of the box, and only the
+    Euclidean distance (p=2) is supported.
     """
 
-    def __init__(self, bounds, data, leafsize=10):
+    def __init__(self, bounds, data, leafsize=10, periodicity=None):
         """Construct Cython kd-tree for nearest-neighbor lookup with periodic boundaries.
 
         Parameters
         ----------
-        bounds : array_like, shape (m,)
+        bounds : array_like, shape (m,) or (m, m)
             Size of the periodic box along each spatial dimension.  A
             negative or zero size for dimension k means that space is not
-            periodic along k.
+            periodic along k. Alternatively, the box vectors of a triclinic
+            box as the rows of a matrix.
         data : array-like, shape (n,m)
-            The n data points of dimension m to be indexed. This array is
-            not copied unless this is necessary to produce a contiguous
-            array of doubles, and so modifying this data will result in
-            bogus results.
+            The n data points of dimension m to be indexed.
         leafsize : positive integer
             The number of points at which the algorithm switches over to
             brute-force.
+        periodicity : array_like of bool, shape (m,), optional
+            Whether space is periodic along each box vector.
         """
-        # Map all points to canonical periodic image
-        self.bounds = np.array(bounds)
-        self.real_data = np.asarray(data)
-        wrapped_data = self.real_data - np.where(
-            self.bounds > 0.0,
-            (np.floor(self.real_data / self.bounds) * self.bounds),
-            0.0,
+        self.real_data = np.asarray(data, dtype=float)
+        bounds = np.asarray(bounds, dtype=float)
+        if bounds.ndim == 2 and np.count_nonzero(bounds - np.diag(np.diag(bounds))):
+            vectors = bounds
+            if periodicity is None:
+                periodicity = np.ones(len(vectors), dtype=bool)
+            self.periodicity = np.asarray(periodicity, dtype=bool)
+        else:
+            vectors = None
+            if bounds.ndim == 2:
+                bounds = np.diag(bounds)
+            if periodicity is None:
+                periodicity = bounds > 0.0
+            self.periodicity = np.asarray(periodicity, dtype=bool) & (bounds > 0.0)
+
+        if vectors is None:
+            # Orthorhombic: scipy handles the periodic images itself.
+            self.box_vectors = None
+            self.bounds = np.where(self.periodicity, bounds, 0.0)
+            self._images = None
+            self.max_distance_upper_bound = np.inf
+            boxsize = self.bounds if self.periodicity.any() else None
+            super(PeriodicKDTree, self).__init__(
+                self._wrap(self.real_data), leafsize, boxsize=boxsize
+            )
+            return
+
+        # Triclinic: query every periodic image next to the query points.
+        self.box_vectors = vectors
+        self.bounds = np.where(self.periodicity, np.linalg.norm(vectors, axis=1), 0.0)
+        self._inverse = np.linalg.inv(vectors)
+        shifts = itertools.product(
+            *[(-1, 0, 1) if periodic else (0,) for periodic in self.periodicity]
         )
-
-        # Calculate maximum distance_upper_bound
+        self._images = np.array(list(shifts), dtype=float) @ vectors
+        normals = np.cross(np.roll(vectors, -1, axis=0), np.roll(vectors, -2, axis=0))
+        widths = abs(np.linalg.det(vectors)) / np.linalg.norm(normals, axis=1)
         self.max_distance_upper_bound = np.min(
-            np.where(self.bounds > 0, 0.5 * self.bounds, np.inf)
+            np.where(self.periodicity, 0.5 * widths, np.inf)
         )
-
-        # Set up underlying kd-tree
-        super(PeriodicKDTree, self).__init__(wrapped_data, leafsize)
+        super(PeriodicKDTree, self).__init__(self._wrap(self.real_data), leafsize)
 
     @classmethod
-    def from_compound(cls, compound, leafsize=10):
+    def from_compound(cls, compound, leafsize=10, data=None):
         """Create a PeriodicKDTree from a compound.
 
         See scipy.spatial.kdtree for details on kd-trees.
 
-        Searches with periodic boundaries are implemented by mapping all initial
-        data points to one canonical periodic image, building an ordinary kd-tree
-        with these points, then querying this kd-tree multiple times, if necessary,
-        with all the relevant periodic images of the query point.
+        The box of the compound may be orthorhombic or triclinic, and is
+        periodic along the box vectors given by `compound.periodicity`.
 
         Parameters
         ----------
@@ -159,12 +155,9 @@ class PeriodicKDTree(KDTree):
         leafsize : positive integer
             The number of points at which the algorithm switches over to
             brute-force.
-
-        Note
-        ----
-        To ensure that no two distinct images of the same point appear in the
-        results, it is essential to restrict the maximum distance between a query
-        point and a data point to half the smallest box dimension.
+        data : array_like, shape (n, m), optional, default=None
+            The points to index, in the box of the compound. Defaults to the
+            positions of all particles of the compound.
         """
         if not isinstance(compound, mb.Compound):
             raise TypeError(
@@ -174,57 +167,86 @@ class PeriodicKDTree(KDTree):
             raise TypeError(
                 f"Incorrect type of box. Was provided box of type {type(compound.box)}. Expected mbuild.Box"
             )
-        if not np.allclose(compound.box.angles, 90.0):
-            raise NotImplementedError(
-                "Periodic KDTree search only implemented"
-                "for orthorhombic periodic boundaries"
-            )
-        # Map all points to canonical periodic image.
-        compound_bounds = []
-        for box_len, period in zip(compound.box.lengths, compound.periodicity):
-            if period:
-                compound_bounds.append(box_len)
-            else:
-                compound_bounds.append(0)
-
-        # Set up underlying kd-tree
-        return cls(bounds=compound_bounds, data=compound.xyz, leafsize=leafsize)
-
-    # Ideally, KDTree and cKDTree would expose identical query and __query
-    # interfaces.  But they don't, and cKDTree.__query is also inaccessible
-    # from Python.  We do our best here to cope.
-    def __query(self, x, k=1, eps=0, p=2, distance_upper_bound=np.inf):
-        # This is the internal query method, which guarantees that x
-        # is a single point, not an array of points
-        #
-        # A slight complication: k could be "None", which means "return
-        # all neighbors within the given distance_upper_bound".
-
-        # Cap distance_upper_bound
-        distance_upper_bound = np.min(
-            [distance_upper_bound, self.max_distance_upper_bound]
+        if np.allclose(compound.box.angles, 90.0):
+            bounds = compound.box.lengths
+        else:
+            bounds = compound.box.vectors
+        if data is None:
+            data = compound.xyz
+        return cls(
+            bounds=bounds,
+            data=data,
+            leafsize=leafsize,
+            periodicity=compound.periodicity,
         )
 
-        # Run queries over all relevant images of x
-        hits_list = []
-        for real_x in _gen_relevant_images(x, self.bounds, distance_upper_bound):
-            d, i = super(PeriodicKDTree, self).query(
-                real_x, k, eps, p, distance_upper_bound
+    def _wrap(self, x):
+        """Map points onto the canonical periodic image in the box."""
+        x = np.array(x, dtype=float)
+        if self.box_vectors is None:
+            bounds = np.where(self.periodicity, self.bounds, 1.0)
+            wrapped = x - np.floor(x / bounds) * bounds
+            # Rounding can map tiny negative coordinates onto the upper bound.
+            wrapped = np.where(wrapped >= bounds, 0.0, wrapped)
+            return np.where(self.periodicity, wrapped, x)
+        fractional = x @ self._inverse
+        fractional -= np.where(self.periodicity, np.floor(fractional), 0.0)
+        return fractional @ self.box_vectors
+
+    def _check_points(self, x):
+        """Return x as an array of floats of points of dimension m."""
+        x = np.asarray(x, dtype=float)
+        if np.shape(x)[-1] != self.m:
+            raise ValueError(
+                "x must consist of vectors of length %d but has "
+                "shape %s" % (self.m, np.shape(x))
             )
-            if k > 1:
-                hits_list.append(list(zip(d, i)))
-            else:
-                hits_list.append([(d, i)])
-
-        # Now merge results
-        if k > 1:
-            return heapq.nsmallest(k, chain(*hits_list))
-        elif k == 1:
-            return [min(chain(*hits_list))]
-        else:
-            raise ValueError("Invalid k in periodic_kdtree._KDTree__query")
+        return x
+
+    def _check_p(self, p):
+        """Check that the p-norm can be used with the box."""
+        if p < 1:
+            raise ValueError("Only p-norms with 1<=p<=infinity permitted")
+        if self._images is not None and p != 2:
+            raise NotImplementedError(
+                "Only the Euclidean distance (p=2) is supported in triclinic boxes."
+            )
+
+    def _image_pairs(self, x, r):
+        """Find all pairs of points in x and data points within distance r.
+
+        Only used for triclinic boxes, where every point of x is replicated
+        into its neighboring periodic images and all images are matched with
+        the data points in a single call of `sparse_distance_matrix`.
 
-    def query(self, x, k=1, eps=0, p=2, distance_upper_bound=np.inf):
+        Returns
+        -------
+        i : np.ndarray, shape=(n_pairs,), dtype=int
+            The index in x of each pair.
+        j : np.ndarray, shape=(n_pairs,), dtype=int
+            The index in self.data of each pair.
+        d : np.ndarray, shape=(n_pairs,), dtype=float
+            The distance of each pair, sorted by i and then j.
+        """
+        r = min(r, self.max_distance_upper_bound)
+        x = self._wrap(x).reshape(-1, self.m)
+        images = (x[:, None, :] + self._images).reshape(-1, self.m)
+        pairs = cKDTree(images).sparse_distance_matrix(self, r, output_type="ndarray")
+        i = pairs["i"] // len(self._images)
+        order = np.lexsort((pairs["j"], i))
+        return i[order], pairs["j"][order], pairs["v"][order]
+
+    @staticmethod
+    def _group(keys, values, n):
+        """Split values into n lists by their sorted integer keys."""
+        if n == 0:
+            return []
+        return [
+            group.tolist()
+            for group in np.split(values, np.searchsorted(keys, np.arange(1, n)))
+        ]
+
+    def query(self, x, k=1, eps=0, p=2, distance_upper_bound=np.inf, workers=1):
         """Query the kd-tree for nearest neighbors.
 
         Parameters
@@ -247,6 +269,9 @@ class PeriodicKDTree(KDTree):
             tree searches, so if you are doing a series of nearest-neighbor
             queries, it may help to supply the distance to the nearest neighbor
             of the most recent point.
+        workers : int, optional, default=1
+            Number of workers to use for parallel processing. If -1 is given
+            all CPU threads are used.
 
         Returns
         -------
@@ -259,91 +284,44 @@ class PeriodicKDTree(KDTree):
             If `x` has shape tuple+(self.m,), then `i` has shape tuple+(k,).
             Missing neighbors are indicated with self.n.
         """
-        x = np.asarray(x)
-        if np.shape(x)[-1] != self.m:
-            raise ValueError(
-                "x must consist of vectors of length %d but has "
-                "shape %s" % (self.m, np.shape(x))
-            )
-        if p < 1:
-            raise ValueError("Only p-norms with 1<=p<=infinity permitted")
-        retshape = np.shape(x)[:-1]
-        if not isinstance(retshape, tuple):
-            if k > 1:
-                dd = np.empty(retshape + (k,), dtype=float)
-                dd.fill(np.inf)
-                ii = np.empty(retshape + (k,), dtype=int)
-                ii.fill(self.n)
-            elif k == 1:
-                dd = np.empty(retshape, dtype=float)
-                dd.fill(np.inf)
-                ii = np.empty(retshape, dtype=int)
-                ii.fill(self.n)
-            else:
-                raise ValueError(
-                    "Requested %s nearest neighbors; acceptable numbers are "
-                    "integers greater than or equal to one, or None"
-                )
-            for c in np.ndindex(retshape):
-                hits = self.__query(
-                    x[c],
-                    k=k,
-                    eps=eps,
-                    p=p,
-                    distance_upper_bound=distance_upper_bound,
-                )
-                if k > 1:
-                    for j, _ in enumerate(hits):
-                        dd[c + (j,)], ii[c + (j,)] = hits[j]
-                elif k == 1:
-                    if len(hits) > 0:
-                        dd[c], ii[c] = hits[0]
-                    else:
-                        dd[c] = np.inf
-                        ii[c] = self.n
-            return dd, ii
-        else:
-            hits = self.__query(
-                x, k=k, eps=eps, p=p, distance_upper_bound=distance_upper_bound
+        x = self._check_points(x)
+        self._check_p(p)
+        if self._images is None:
+            return super(PeriodicKDTree, self).query(
+                self._wrap(x), k, eps, p, distance_upper_bound, workers
             )
-            if k == 1:
-                if len(hits) > 0:
-                    return hits[0]
-                else:
-                    return np.inf, self.n
-            elif k > 1:
-                dd = np.empty(k, dtype=float)
-                dd.fill(np.inf)
-                ii = np.empty(k, dtype=int)
-                ii.fill(self.n)
-                for j in range(len(hits)):
-                    dd[j], ii[j] = hits[j]
-                return dd, ii
-            else:
-                raise ValueError(
-                    "Requested %s nearest neighbors; acceptable numbers are "
-                    "integers greater than or equal to one, or None"
-                )
-
-    # Ideally, KDTree and cKDTree would expose identical __query_ball_point
-    # interfaces.  But they don't, and cKDTree.__query_ball_point is also
-    # inaccessible from Python.  We do our best here to cope.
-    def __query_ball_point(self, x, r, p=2.0, eps=0):
-        # This is the internal query method, which guarantees that x
-        # is a single point, not an array of points
-
-        # Cap r
-        r = min(r, self.max_distance_upper_bound)
 
-        # Run queries over all relevant images of x
-        results = []
-        for real_x in _gen_relevant_images(x, self.bounds, r):
-            results.extend(
-                super(PeriodicKDTree, self).query_ball_point(real_x, r, p, eps)
+        if not isinstance(k, (int, np.integer)) or k < 1:
+            raise ValueError(
+                "Requested %s nearest neighbors; acceptable numbers are "
+                "integers greater than or equal to one" % k
             )
-        return results
-
-    def query_ball_point(self, x, r, p=2.0, eps=0):
+        # Query the k nearest neighbors of every image of every point, then
+        # keep the k nearest over all images.
+        bound = min(distance_upper_bound, self.max_distance_upper_bound)
+        images = self._wrap(x)[..., None, :] + self._images
+        dd, ii = super(PeriodicKDTree, self).query(
+            images, list(range(1, k + 1)), eps, p, bound, workers
+        )
+        dd = dd.reshape(x.shape[:-1] + (-1,))
+        ii = ii.reshape(x.shape[:-1] + (-1,))
+        nearest = np.argsort(dd, axis=-1, kind="stable")[..., :k]
+        dd = np.take_along_axis(dd, nearest, axis=-1)
+        ii = np.take_along_axis(ii, nearest, axis=-1)
+        if k == 1:
+            return dd[..., 0], ii[..., 0]
+        return dd, ii
+
+    def query_ball_point(
+        self,
+        x,
+        r,
+        p=2.0,
+        eps=0,
+        workers=1,
+        return_sorted=None,
+        return_length=False,
+    ):
         """Find all points within distance r of point(s) x.
 
         Parameters
@@ -359,6 +337,15 @@ class PeriodicKDTree(KDTree):
             nearest points are further than ``r / (1 + eps)``, and branches are
             added in bulk if their furthest points are nearer than
             ``r * (1 + eps)``.
+        workers : int, optional, default=1
+            Number of workers to use for parallel processing. If -1 is given
+            all CPU threads are used.
+        return_sorted : bool, optional, default=None
+            Sorts returned indices if True. Neighbors are always sorted in
+            triclinic boxes.
+        return_length : bool, optional, default=False
+            Return the number of points inside the radius instead of a list of
+            the indices.
 
         Returns
         -------
@@ -373,33 +360,167 @@ class PeriodicKDTree(KDTree):
         save substantial amounts of time by putting them in a
         PeriodicKDTree and using query_ball_tree.
         """
-        x = np.asarray(x).astype(float)
-        if x.shape[-1] != self.m:
-            raise ValueError(
-                "Searching for a {}d-dimensional point in a {}d-dimensional "
-                "KDTree".format(x.shape[-1], self.m)
+        x = self._check_points(x)
+        self._check_p(p)
+        if self._images is None:
+            return super(PeriodicKDTree, self).query_ball_point(
+                self._wrap(x), r, p, eps, workers, return_sorted, return_length
             )
-        if len(x.shape) == 1:
-            return self.__query_ball_point(x, r, p, eps)
-        else:
-            retshape = x.shape[:-1]
-            result = np.empty(retshape, dtype=np.object)
-            for c in np.ndindex(retshape):
-                result[c] = self.__query_ball_point(x[c], r, p, eps)
-            return result
+
+        retshape = x.shape[:-1]
+        n_points = int(np.prod(retshape))
+        i, j, _ = self._image_pairs(x, r)
+        if return_length:
+            lengths = np.bincount(i, minlength=n_points).reshape(retshape)
+            return lengths if retshape else int(lengths)
+        neighbors = self._group(i, j, n_points)
+        if not retshape:
+            return neighbors[0]
+        result = np.empty(n_points, dtype=object)
+        for index, neighbor_list in enumerate(neighbors):
+            result[index] = neighbor_list
+        return result.reshape(retshape)
 
     def query_ball_tree(self, other, r, p=2.0, eps=0):
-        """Query the ball tree."""
-        raise NotImplementedError()
+        """Find all pairs of points between self and other within distance r.
+
+        Parameters
+        ----------
+        other : KDTree
+            The tree containing points to search against, in the same box.
+        r : float
+            The maximum distance, has to be positive.
+        p : float, optional
+            Which Minkowski p-norm to use.  Should be in the range [1, inf].
+        eps : nonnegative float, optional
+            Approximate search, see `query_ball_point`.
+
+        Returns
+        -------
+        results : list of lists
+            For each element ``self.data[i]`` of this tree, ``results[i]`` is a
+            list of the indices of its neighbors in ``other.data``.
+        """
+        self._check_p(p)
+        if self._images is None:
+            return super(PeriodicKDTree, self).query_ball_tree(other, r, p, eps)
+        i, j, _ = self._image_pairs(other.data, r)
+        order = np.lexsort((i, j))
+        return self._group(j[order], i[order], self.n)
+
+    def query_pairs(self, r, p=2.0, eps=0, output_type="set"):
+        """Find all pairs of points in self whose distance is at most r.
+
+        Parameters
+        ----------
+        r : positive float
+            The maximum distance.
+        p : float, optional
+            Which Minkowski p-norm to use.  Should be in the range [1, inf].
+        eps : nonnegative float, optional
+            Approximate search, see `query_ball_point`.
+        output_type : str, optional, default="set"
+            Choose the output container, 'set' or 'ndarray'.
+
+        Returns
+        -------
+        results : set or ndarray
+            Set of pairs ``(i, j)``, with ``i < j``, for which the
+            corresponding positions are close. If output_type is 'ndarray', an
+            ndarray of shape (n_pairs, 2) is returned instead.
+        """
+        self._check_p(p)
+        if self._images is None:
+            return super(PeriodicKDTree, self).query_pairs(r, p, eps, output_type)
+        i, j, _ = self._image_pairs(self.data, r)
+        pairs = np.column_stack((i, j))[i < j]
+        if output_type == "ndarray":
+            return pairs
+        elif output_type == "set":
+            return set(map(tuple, pairs.tolist()))
+        raise ValueError("Invalid output type")
+
+    def count_neighbors(self, other, r, p=2.0, weights=None, cumulative=True):
+        """Count how many nearby pairs can be formed between self and other.
 
-    def query_pairs(self, r, p=2.0, eps=0):
-        """Query the pairs."""
-        raise NotImplementedError()
+        Parameters
+        ----------
+        other : KDTree
+            The other tree to draw points from, in the same box.
+        r : float or one-dimensional array of floats
+            The radius to produce a count for. Multiple radii are searched
+            with a single tree traversal.
+        p : float, optional
+            Which Minkowski p-norm to use.  Should be in the range [1, inf].
+        weights : tuple, array_like, or None, optional, default=None
+            Weights of the pairs, see scipy.spatial.KDTree.count_neighbors.
+            Not supported in triclinic boxes.
+        cumulative : bool, optional, default=True
+            Whether the returned counts are cumulative.
 
-    def count_neighbors(self, other, r, p=2.0):
-        """Count the neighbors."""
-        raise NotImplementedError()
+        Returns
+        -------
+        result : scalar or 1-D array
+            The number of pairs. For a scalar r, a single number.
+        """
+        self._check_p(p)
+        if self._images is None:
+            return super(PeriodicKDTree, self).count_neighbors(
+                other, r, p, weights, cumulative
+            )
+        if weights is not None:
+            raise NotImplementedError(
+                "Weighted neighbor counts are not supported in triclinic boxes."
+            )
+        radii = np.asarray(r, dtype=float)
+        _, _, d = self._image_pairs(other.data, np.max(radii))
+        counts = np.searchsorted(np.sort(d), radii.ravel(), side="right")
+        if not cumulative:
+            counts = np.diff(counts, prepend=0)
+        if radii.ndim == 0:
+            return int(counts[0])
+        return counts.reshape(radii.shape)
+
+    def sparse_distance_matrix(
+        self, other, max_distance, p=2.0, output_type="dok_matrix"
+    ):
+        """Compute a sparse distance matrix between self and other.
 
-    def sparse_distance_matrix(self, other, max_distance, p=2.0):
-        """Get a sparse distance matrix."""
-        raise NotImplementedError()
+        Parameters
+        ----------
+        other : KDTree
+            The tree containing points to search against, in the same box.
+        max_distance : positive float
+            Distances larger than this are not stored.
+        p : float, optional
+            Which Minkowski p-norm to use.  Should be in the range [1, inf].
+        output_type : str, optional, default="dok_matrix"
+            Which container to use for output data. Options: 'dok_matrix',
+            'coo_matrix', 'dict', or 'ndarray'.
+
+        Returns
+        -------
+        result : dok_matrix, coo_matrix, dict or ndarray
+            Sparse matrix of the distances from the points of self (rows) to
+            the points of other (columns), using the nearest periodic image.
+        """
+        self._check_p(p)
+        if self._images is None:
+            return super(PeriodicKDTree, self).sparse_distance_matrix(
+                other, max_distance, p, output_type
+            )
+        i, j, d = self._image_pairs(other.data, max_distance)
+        if output_type == "ndarray":
+            result = np.empty(
+                len(d), dtype=[("i", np.intp), ("j", np.intp), ("v", np.float64)]
+            )
+            result["i"], result["j"], result["v"] = j, i, d
+            return result
+        elif output_type == "dict":
+            return dict(zip(zip(j.tolist(), i.tolist()), d.tolist()))
+        matrix = coo_matrix((d, (j, i)), shape=(self.n, other.n))
+        if output_type == "coo_matrix":
+            return matrix
+        elif output_type == "dok_matrix":
+            return matrix.todok()
+        raise ValueError("Invalid output type")
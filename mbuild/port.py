@@ -7,7 +7,7 @@ import numpy as np
 
 from mbuild import clone
 from mbuild.compound import Compound, Particle
-from mbuild.coordinate_transform import angle, unit_vector
+from mbuild.coordinate_transform import _rotate, angle, unit_vector
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +86,18 @@ class Port(Compound):
         newone.used = self.used
         return newone
 
+    @property
+    def anchor(self):
+        """Get the Particle associated with the Port."""
+        return self._anchor
+
+    @anchor.setter
+    def anchor(self, anchor):
+        self._anchor = anchor
+        index = self.root._particle_index
+        if index is not None:
+            index.by_anchor = None
+
     def update_separation(self, separation):
         """Change the distance between a port and its anchor particle.
 
@@ -130,6 +142,18 @@ class Port(Compound):
         # Move back to it's anchor particle
         self.update_separation(init_separation)
 
+    def _frames(self):
+        """Return the origin of the Port and the axes of its two subports.
+
+        The axes of a subport are the columns of a rotation matrix: its
+        direction, its normal and their cross product. They are read from the
+        ghost Particles of the 'up' and the 'down' subport. Both subports
+        share the origin of the Port.
+        """
+        up = self.labels["up"].xyz_with_ports
+        down = self.labels["down"].xyz_with_ports
+        return np.mean(up, axis=0), _frame_axes(up), _frame_axes(down)
+
     @property
     def center(self):
         """Get the cartesian center of the Port."""
@@ -196,3 +220,124 @@ class Port(Compound):
 
         descr.append(f"id: {id(self)}>")
         return "".join(descr)
+
+
+def _frame_axes(points):
+    """Return the axes of the frame of a subport from its ghost Particles."""
+    middle, top, left = points[:3]
+    direction = unit_vector(top - middle)
+    normal = unit_vector(np.cross(direction, left - middle))
+    return np.column_stack([direction, normal, np.cross(direction, normal)])
+
+
+class AnalyticPort(Port):
+    """A Port that stores its frame with three ghost Particles.
+
+    Holds the origin of the Port and two points one arm length away from it,
+    along the direction of the Port and along its normal, instead of the two
+    subports of four ghost Particles each. The points move with the rest of
+    the hierarchy and `force_overlap` computes the equivalence transform from
+    them in closed form. It is placed and oriented exactly like a `Port`
+    created with the same arguments, but has no 'up' or 'down' subports.
+
+    Parameters
+    ----------
+    anchor : mb.Particle, optional, default=None
+        A Particle associated with the port. Used to form bonds.
+    orientation : array-like, shape=(3,), optional, default=[0, 1, 0]
+        Vector along which to orient the port
+    separation : float, optional, default=0
+        Distance to shift port along the orientation vector from the anchor
+        particle position. If no anchor is provided, the port will be shifted
+        from the origin.
+
+    Attributes
+    ----------
+    anchor : mb.Particle, optional, default=None
+        A Particle associated with the port. Used to form bonds.
+    used : bool
+        Status of whether a port has been occupied following an equivalence
+        transform.
+    """
+
+    _arm = 0.02
+
+    def __init__(self, anchor=None, orientation=None, separation=0):
+        super(Port, self).__init__(name="Port", port_particle=True)
+        self.bond_graph = None
+        self.anchor = anchor
+        self.used = False
+        default_direction = np.array([0, 1, 0])
+        if orientation is None:
+            orientation = [0, 1, 0]
+        direction = unit_vector(np.asarray(orientation, dtype=float))
+
+        # Same normal as the 'up' subport of a Port with this orientation,
+        # and the same axis its 'down' subport is turned around, in the frame
+        # of the 'up' subport so that it follows the Port when it moves.
+        normal = np.array([0.0, 0.0, 1.0])
+        flip_axis = normal
+        if not np.allclose(np.abs(direction), default_direction):
+            flip_axis = unit_vector(np.cross(default_direction, direction))
+            normal = _rotate(normal, angle(default_direction, direction), flip_axis)[0]
+        axes = np.column_stack([direction, normal, np.cross(direction, normal)])
+        self._flip_axis = axes.T @ flip_axis
+
+        origin = np.zeros(3)
+        if anchor:
+            origin = anchor.pos
+        origin = origin + separation * direction
+        for label, pos in (
+            ("middle", origin),
+            ("top", origin + self._arm * direction),
+            ("normal", origin + self._arm * normal),
+        ):
+            self.add(Particle(name="G", pos=pos, port_particle=True), label)
+
+    def _clone(self, clone_of=None, root_container=None):
+        newone = super(AnalyticPort, self)._clone(clone_of, root_container)
+        newone._flip_axis = self._flip_axis
+        return newone
+
+    def _frames(self):
+        """Return the origin of the Port and the axes of its two frames.
+
+        The 'up' frame is read from the ghost Particles. The 'down' frame is
+        the 'up' frame turned by pi around the same axis as the 'down'
+        subport of a Port created with the same arguments.
+        """
+        origin, top, normal = self.xyz_with_ports
+        direction = unit_vector(top - origin)
+        normal = normal - origin
+        normal = unit_vector(normal - np.dot(normal, direction) * direction)
+        up = np.column_stack([direction, normal, np.cross(direction, normal)])
+        flip = 2 * np.outer(self._flip_axis, self._flip_axis) - np.eye(3)
+        return origin, up, up @ flip
+
+    def update_orientation(self, orientation):
+        """Change the direction between a port and its anchor particle.
+
+        orientation : array-like, shape=(3,), required
+            Vector along which to orient the port
+        """
+        if self.used:
+            logger.warning(
+                "This port is already being used and changing its orientation "
+                "will have no effect on the direction between particles."
+            )
+
+        orientation = np.asarray(orientation).reshape(3)
+        init_separation = self.separation
+        normal = np.cross(self.direction, orientation)
+        # Move to origin to perform rotation, then turn the Port around its
+        # normal like the subports of a Port are.
+        self.translate_to((0, 0, 0))
+        self.rotate(angle(self.direction, orientation), normal)
+        self.rotate(np.pi, normal)
+        # Move back to it's anchor particle
+        self.update_separation(init_separation)
+
+    @property
+    def center(self):
+        """Get the cartesian center of the Port."""
+        return self.labels["middle"].pos
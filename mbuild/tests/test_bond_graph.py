@@ -0,0 +1,165 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+import mbuild as mb
+from mbuild.bond_graph import (
+    BondGraph,
+    CompactBondGraph,
+    get_default_backend,
+    new_bond_graph,
+    set_default_backend,
+)
+from mbuild.exceptions import MBuildError
+from mbuild.tests.base_test import BaseTest
+
+
+class TestBondGraph(BaseTest):
+    @pytest.fixture
+    def compact_backend(self):
+        default_backend = get_default_backend()
+        set_default_backend("compact")
+        yield
+        set_default_backend(default_backend)
+
+    @pytest.mark.parametrize("backend", ["networkx", "compact"])
+    def test_edges_and_neighbors(self, backend):
+        particles = [mb.Compound(name="C") for _ in range(4)]
+        bond_graph = new_bond_graph(backend)
+        bond_graph.add_edge(particles[0], particles[1], bond_order=1.0)
+        bond_graph.add_edge(particles[1], particles[2], bond_order=2.0)
+        bond_graph.add_node(particles[3])
+        assert bond_graph.number_of_nodes() == 4
+        assert bond_graph.number_of_edges() == 2
+        assert bond_graph.has_edge(particles[1], particles[0])
+        assert not bond_graph.has_edge(particles[0], particles[2])
+        assert set(bond_graph.neighbors(particles[1])) == {
+            particles[0],
+            particles[2],
+        }
+        bond_orders = {
+            frozenset((u, v)): data["bond_order"]
+            for u, v, data in bond_graph.edges(data=True)
+        }
+        assert bond_orders[frozenset(particles[1:3])] == 2.0
+
+        bond_graph.remove_edge(particles[0], particles[1])
+        assert not bond_graph.has_edge(particles[0], particles[1])
+        bond_graph.remove_node(particles[2])
+        assert bond_graph.number_of_edges() == 0
+        assert not bond_graph.has_node(particles[2])
+        with pytest.raises(nx.NetworkXError):
+            bond_graph.remove_edge(particles[0], particles[1])
+
+    @pytest.mark.parametrize("backend", ["networkx", "compact"])
+    def test_components_and_subgraph(self, backend):
+        particles = [mb.Compound(name="C") for _ in range(6)]
+        bond_graph = new_bond_graph(backend)
+        for i in (0, 1, 3):
+            bond_graph.add_edge(particles[i], particles[i + 1], bond_order=1.0)
+        bond_graph.add_node(particles[5])
+        components = sorted(bond_graph.connected_components(), key=lambda c: -len(c))
+        assert [len(c) for c in components] == [3, 2, 1]
+        assert set(components[0]) == set(particles[:3])
+
+        subgraph = bond_graph.subgraph(particles[1:4])
+        assert subgraph.number_of_nodes() == 3
+        assert subgraph.number_of_edges() == 1
+        assert subgraph.has_edge(particles[1], particles[2])
+
+    def test_compact_many_bonds(self):
+        # Enough bonds and removals to exercise the adjacency rebuilds
+        particles = [mb.Compound(name="C") for _ in range(5000)]
+        bond_graph = CompactBondGraph()
+        for particle1, particle2 in zip(particles[:-1], particles[1:]):
+            bond_graph.add_edge(particle1, particle2, bond_order=1.0)
+        for particle in particles[::2]:
+            bond_graph.remove_node(particle)
+        assert bond_graph.number_of_nodes() == 2500
+        assert bond_graph.number_of_edges() == 0
+        for particle1, particle2 in zip(particles[1:-2:2], particles[3::2]):
+            bond_graph.add_edge(particle1, particle2)
+        assert len(bond_graph.connected_components()) == 1
+        assert set(bond_graph.neighbors(particles[3])) == {
+            particles[1],
+            particles[5],
+        }
+        edges, bond_orders = bond_graph.edge_array()
+        assert edges.shape == (2499, 2)
+        assert np.isnan(bond_orders).all()
+
+    def test_merge_between_backends(self, ethane):
+        compact = CompactBondGraph()
+        compact.merge(ethane.bond_graph)
+        assert compact.number_of_edges() == ethane.n_bonds
+        networkx_graph = BondGraph()
+        networkx_graph.merge(compact)
+        assert networkx_graph.number_of_edges() == ethane.n_bonds
+
+    @pytest.mark.parametrize("backend", ["networkx", "compact"])
+    def test_merge_many(self, backend):
+        particles = [mb.Compound(name="C") for _ in range(6)]
+        graphs = [new_bond_graph(backend) for _ in range(3)]
+        for i, graph in enumerate(graphs):
+            graph.add_edge(particles[2 * i], particles[2 * i + 1], bond_order=2.0)
+        bond_graph = new_bond_graph(backend)
+        bond_graph.add_node(particles[0])
+        bond_graph.merge_many(graphs[1:])
+        bond_graph.merge_many(graphs[:1])
+        assert bond_graph.number_of_nodes() == 6
+        assert bond_graph.number_of_edges() == 3
+        assert list(bond_graph.neighbors(particles[3])) == [particles[2]]
+        assert all(
+            data["bond_order"] == 2.0 for _, _, data in bond_graph.edges(data=True)
+        )
+
+    @pytest.mark.parametrize("backend", ["networkx", "compact"])
+    def test_add_remove_edges_from(self, backend):
+        particles = [mb.Compound(name="C") for _ in range(100)]
+        bond_graph = new_bond_graph(backend)
+        bond_graph.add_edge(particles[0], particles[1], bond_order=1.0)
+        bond_graph.add_edges_from(
+            [(particles[i], particles[i + 1]) for i in range(99)]
+            + [(particles[1], particles[0], {"bond_order": 2.0})],
+            bond_order=3.0,
+        )
+        assert bond_graph.number_of_edges() == 99
+        assert bond_graph.number_of_nodes() == 100
+        orders = {
+            frozenset((u, v)): data["bond_order"]
+            for u, v, data in bond_graph.edges(data=True)
+        }
+        assert orders[frozenset(particles[:2])] == 2.0
+        assert orders[frozenset(particles[1:3])] == 3.0
+
+        bond_graph.remove_edges_from(
+            [(particles[i + 1], particles[i]) for i in range(0, 99, 2)]
+            + [(particles[0], particles[50])]
+        )
+        assert bond_graph.number_of_edges() == 49
+        assert not bond_graph.has_edge(particles[0], particles[1])
+        assert bond_graph.has_edge(particles[1], particles[2])
+        assert list(bond_graph.neighbors(particles[2])) == [particles[1]]
+
+    def test_compound_backend(self, compact_backend, ethane, methane):
+        assert get_default_backend() == "compact"
+        assert ethane.bond_graph_backend == "compact"
+        assert isinstance(ethane.bond_graph, CompactBondGraph)
+        assert ethane.n_bonds == 7
+        assert len(ethane[0].direct_bonds()) == 4
+        compound = mb.Compound([ethane, methane])
+        assert compound.n_bonds == 11
+        assert len(compound.bond_graph.connected_components()) == 2
+        ethane_clone = mb.clone(ethane)
+        assert isinstance(ethane_clone.bond_graph, CompactBondGraph)
+        assert ethane_clone.n_bonds == 7
+
+    def test_set_compound_backend(self, ethane):
+        assert ethane.bond_graph_backend == "networkx"
+        ethane.bond_graph_backend = "compact"
+        assert isinstance(ethane.bond_graph, CompactBondGraph)
+        assert ethane.n_bonds == 7
+        with pytest.raises(MBuildError):
+            ethane.children[0].bond_graph_backend = "networkx"
+        with pytest.raises(ValueError):
+            ethane.bond_graph_backend = "igraph"
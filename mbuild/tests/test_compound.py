@@ -1,3 +1,4 @@
+import itertools
 import logging
 import os
 import sys
@@ -173,6 +174,33 @@ class TestCompound(BaseTest):
         with pytest.raises(ValueError):
             comp.add_bond([A_bead, B_bead], bond_order=4)
 
+    def test_add_bonds(self):
+        comp = mb.Compound(
+            [mb.Compound(name="A", pos=[0.1 * i, 0, 0]) for i in range(4)]
+        )
+        comp.add_bonds([[0, 1], [1, 2], [2, 3], [1, 0]], bond_orders=[1, 2, 3, 1.5])
+        assert comp.n_bonds == 3
+        bond_orders = {
+            frozenset((p1, p2)): data["bond_order"]
+            for p1, p2, data in comp.bonds(return_bond_order=True)
+        }
+        assert bond_orders[frozenset((comp[0], comp[1]))] == 1.5
+        assert bond_orders[frozenset((comp[2], comp[3]))] == 3
+        comp.add_bonds(np.array([[0, 3]]))
+        assert comp.n_bonds == 4
+        assert comp[3] in comp[0].direct_bonds()
+
+    @pytest.mark.parametrize(
+        "pairs, bond_orders",
+        [([[0, 1]], 4), ([[0, 4]], None), ([0, 1], None), ([[0.0, 1.0]], None)],
+    )
+    def test_add_bonds_bad_inputs(self, pairs, bond_orders):
+        comp = mb.Compound(
+            [mb.Compound(name="A", pos=[0.1 * i, 0, 0]) for i in range(4)]
+        )
+        with pytest.raises(ValueError):
+            comp.add_bonds(pairs, bond_orders=bond_orders)
+
     @pytest.mark.skipif(not has_rdkit, reason="RDKit is not installed")
     def test_to_rdkit(self, methane):
         # check basic conversion
@@ -537,6 +565,22 @@ class TestCompound(BaseTest):
         assert overlap[0] == (0, 5)
         assert not comp.check_for_overlap(excluded_bond_depth=5, minimum_distance=0.11)
 
+    @pytest.mark.parametrize("excluded_bond_depth", [1, 2, 3])
+    def test_check_overlap_matches_direct_bonds(self, ethane, excluded_bond_depth):
+        compound = mb.Compound([ethane, mb.clone(ethane)])
+        compound.box = mb.box.Box(lengths=[5, 5, 5])
+        compound.children[1].box = mb.box.Box(lengths=[5, 5, 5])
+        for part in (compound, compound.children[1]):
+            particles = list(part.particles())
+            expected = [
+                (i, j)
+                for i, j in part.check_for_overlap(0, minimum_distance=0.5)
+                if particles[j]
+                not in particles[i].direct_bonds(graph_depth=excluded_bond_depth)
+            ]
+            overlap = part.check_for_overlap(excluded_bond_depth, minimum_distance=0.5)
+            assert overlap == expected
+
     def test_check_for_overlap_bad_inputs(self, ethane):
         with pytest.raises(ValueError):
             ethane.check_for_overlap(excluded_bond_depth=-2, minimum_distance=0.5)
@@ -757,6 +801,40 @@ class TestCompound(BaseTest):
         only_C = ethane.particles_by_name("C")
         assert sum(1 for _ in only_C) == 2
 
+    def test_particle_indices_by_name(self, ethane):
+        compound = mb.Compound([ethane, mb.clone(ethane)])
+        particles = list(compound.particles())
+        for name in ("C", "H", "X"):
+            indices = compound.particle_indices_by_name(name)
+            expected = [i for i, p in enumerate(particles) if p.name == name]
+            assert indices.tolist() == expected
+            assert np.allclose(compound.xyz[indices], compound.xyz[expected])
+
+        # Indices of a sub-compound are relative to its own particles.
+        second = compound.children[1]
+        assert second.particle_indices_by_name("C").tolist() == [0, 4]
+        assert second.children[0].particle_indices_by_name("H").tolist() == [1, 2, 3]
+
+        # Renaming, adding and removing particles updates the index.
+        particles[1].name = "X"
+        assert compound.particle_indices_by_name("X").tolist() == [1]
+        compound.add(mb.Particle(name="X"))
+        assert compound.particle_indices_by_name("X").tolist() == [1, 16]
+        compound.remove(second)
+        assert compound.particle_indices_by_name("C").tolist() == [0, 4]
+        assert compound.particle_indices_by_name("X").tolist() == [1, 8]
+        assert list(compound.particles_by_name("X"))[0] is particles[1]
+
+    def test_particle_indices_by_element(self, ethane):
+        compound = mb.Compound([ethane, mb.Particle(name="A")])
+        assert compound.particle_indices_by_element("C").tolist() == [0, 4]
+        hydrogen = compound[1].element
+        indices = compound.particle_indices_by_element(hydrogen)
+        assert indices.tolist() == [1, 2, 3, 5, 6, 7]
+        compound[8].element = "O"
+        assert compound.particle_indices_by_element("O").tolist() == [8]
+        assert list(compound.particles_by_element("O")) == [compound[8]]
+
     def test_particles_in_range(self, ethane):
         group = ethane.particles_in_range(ethane[0], 0.141)
         assert sum([1 for x in group if x.name == "H"]) == 3
@@ -770,6 +848,34 @@ class TestCompound(BaseTest):
         ch3.generate_bonds("H", "H", dmin=0.01, dmax=2.0)
         assert ch3.n_bonds == 3 + 3
 
+    @pytest.mark.parametrize(
+        "periodicity, n_bonds", [((True, True, True), 2), ((False, True, True), 1)]
+    )
+    def test_generate_bonds_periodic(self, periodicity, n_bonds):
+        compound = mb.Compound(box=mb.Box([2.0, 2.0, 2.0]))
+        compound.add(
+            [
+                mb.Particle(name="A", pos=[0.05, 1.0, 1.0]),
+                mb.Particle(name="B", pos=[1.95, 1.0, 1.0]),
+                mb.Particle(name="B", pos=[1.0, 1.0, 1.0]),
+                mb.Particle(name="A", pos=[1.1, 1.0, 1.0]),
+            ]
+        )
+        compound.periodicity = periodicity
+        compound.generate_bonds("A", "B", dmin=0.0, dmax=0.2)
+        assert compound.n_bonds == n_bonds
+        compound.generate_bonds("B", "A", dmin=0.0, dmax=0.2)
+        compound.generate_bonds("A", "A", dmin=0.0, dmax=0.2)
+        assert compound.n_bonds == n_bonds
+
+    def test_generate_bonds_without_freud(self, ch3, monkeypatch):
+        monkeypatch.setattr(mb.compound, "has_freud", False)
+        bounding_box = ch3.get_boundingbox()
+        ch3.box = mb.Box(lengths=[max(bounding_box.lengths) + 1] * 3)
+        ch3.periodicity = (True, True, False)
+        ch3.freud_generate_bonds("H", "H", dmin=0.01, dmax=0.2)
+        assert ch3.n_bonds == 3 + 3
+
     @pytest.mark.skipif(not has_freud, reason="Freud not installed.")
     def test_freud_generated_bonds_periodicity(self, ch3):
         bounding_box = ch3.get_boundingbox()
@@ -910,6 +1016,69 @@ class TestCompound(BaseTest):
         for part in ethane.children:
             assert isinstance(part, Port)
 
+    def test_remove_batch(self, ethane):
+        box = mb.fill_box(ethane, 6, [3, 3, 3])
+        hydrogens = [
+            particle
+            for ethane in box.children[:3]
+            for particle in ethane.particles_by_name("H")
+        ]
+        box.remove(hydrogens + box.children[3:5])
+
+        assert len(box.children) == 4
+        assert box.n_particles == 3 * 2 + ethane.n_particles
+        assert box.n_bonds == 3 + ethane.n_bonds
+        for eth in box.children[:3]:
+            for methyl in eth.children:
+                assert len(methyl.all_ports()) == 3
+                particles = list(box.particles())
+                assert all(port.anchor in particles for port in methyl.all_ports())
+                assert not any(label.startswith("H") for label in methyl.labels)
+
+    def test_all_ports_index(self, ch2):
+        system = mb.Compound([mb.clone(ch2) for _ in range(3)])
+        ports = [part for part in system.successors() if isinstance(part, Port)]
+        assert len(ports) == 6
+        assert system.all_ports() == ports
+        for child in system.children:
+            assert child.all_ports() == [child["up"], child["down"]]
+            assert child["up"].all_ports() == []
+
+        middle = system.children[1]
+        system.remove(middle["up"])
+        assert len(system.all_ports()) == 5
+        assert middle.all_ports() == [middle["down"]]
+
+    def test_remove_prunes_reanchored_port(self, ethane):
+        port = Port(anchor=ethane[0])
+        ethane.add(port, "extra")
+        assert port in ethane.all_ports()
+        hydrogen = next(ethane.particles_by_name("H"))
+        port.anchor = hydrogen
+        ethane.remove(hydrogen)
+
+        assert port not in ethane.all_ports()
+        assert "extra" not in ethane.labels
+        assert all(port.anchor is not hydrogen for port in ethane.all_ports())
+
+    def test_batch(self, ethane, caplog):
+        box = mb.Compound(box=mb.Box([1, 1, 1]))
+        with caplog.at_level(logging.WARNING, logger="mbuild"):
+            with box.batch():
+                for i in range(4):
+                    box.add(mb.clone(ethane), check_box_size=True)
+                    box.children[-1].translate([i, 0, 0])
+                assert box.n_bonds == 4 * ethane.n_bonds
+                box.remove(box.children[1])
+                box.add(mb.clone(ethane))
+                assert caplog.text == ""
+        assert caplog.text.count("Compound.box.lengths") == 1
+        assert len(box.children) == 4
+        assert box.n_bonds == 4 * ethane.n_bonds
+        assert box.bond_graph.number_of_nodes() == 4 * ethane.n_particles
+        for particle in box.particles():
+            assert box.bond_graph.has_node(particle)
+
     def test_remove_subcompound(self, ethane):
         methyl = ethane.children[0]
         ethane.remove(methyl)
@@ -942,6 +1111,17 @@ class TestCompound(BaseTest):
         with pytest.raises(MBuildError):
             ch3.remove_bond(ch_bond)
 
+    def test_remove_bonds(self, ethane):
+        n_ports = len(ethane.all_ports())
+        ethane.remove_bonds([[0, 2], [3, 0]])
+        assert ethane.n_bonds == 5
+        assert len(ethane.all_ports()) == n_ports
+        with pytest.raises(MBuildError):
+            ethane.remove_bonds([[0, 2]])
+        ethane.remove_bonds([[0, 1]], add_ports=True)
+        assert ethane.n_bonds == 4
+        assert len(ethane.all_ports()) == n_ports + 2
+
     def test_port_does_not_exist(self, ethane):
         with pytest.raises(MBuildError):
             ethane["not_port"]
@@ -2705,3 +2885,268 @@ class TestCompound(BaseTest):
         methane.periodicity = (True, True, True)
         shifted_pos, freud_box = methane.to_freud()
         assert freud_box.Lx == freud_box.Ly == freud_box.Lz == 2.0
+
+    def test_array_backed_xyz(self, ethane):
+        ethane_list = ethane.xyz_with_ports
+        ethane.array_backed = True
+        assert ethane.array_backed
+        assert ethane.children[0].array_backed
+        assert np.allclose(ethane.xyz_with_ports, ethane_list)
+        particle = next(ethane.particles())
+        assert particle.pos.base is ethane._xyz_buffer
+
+        ethane.translate([1, 2, 3])
+        assert np.allclose(ethane.xyz_with_ports, ethane_list + [1, 2, 3])
+        ch3 = ethane.children[0]
+        ch3.xyz = np.zeros((ch3.n_particles, 3))
+        assert np.allclose(ch3.xyz, 0)
+        assert np.allclose(particle.pos, 0)
+
+    def test_array_backed_add_remove(self, ethane, ch3):
+        ethane.array_backed = True
+        n_particles = ethane.n_particles
+        assert ethane.xyz.shape == (n_particles, 3)
+        ch3.translate([5, 5, 5])
+        ethane.add(ch3)
+        assert ethane.xyz.shape == (n_particles + 4, 3)
+        assert np.allclose(ethane.children[-1].xyz, ch3.xyz)
+        ethane.remove(ch3)
+        assert ethane.xyz.shape == (n_particles, 3)
+        ch3_center = ch3.center
+        ethane.translate([1, 1, 1])
+        assert np.allclose(ch3.center, ch3_center)
+
+    def test_array_backed_keeps_rows(self, ethane, ch3):
+        ethane.array_backed = True
+        ethane.xyz
+        buffer = ethane._xyz_buffer
+        particle = next(ethane.particles())
+        particle.pos = [1, 2, 3]
+        ethane.children[0].rotate(np.pi / 2, [0, 0, 1])
+        ethane.children[1].xyz = ethane.children[1].xyz + 1
+        xyz = ethane.xyz
+        assert ethane._xyz_buffer is buffer
+        assert all(p._pos.base is buffer for p in ethane.particles())
+        assert np.allclose(xyz, [p.pos for p in ethane.particles()])
+
+        generation = ethane._hierarchy_generation
+        ethane.add(ch3)
+        assert ethane._hierarchy_generation == generation + 1
+        assert ethane.xyz.shape == (ethane.n_particles, 3)
+        assert ethane._xyz_buffer is not buffer
+
+    def test_array_backed_only_root(self, ethane):
+        with pytest.raises(MBuildError):
+            ethane.children[0].array_backed = True
+
+    def test_array_backed_clone(self, ethane):
+        ethane.array_backed = True
+        ethane_clone = mb.clone(ethane)
+        assert ethane_clone.array_backed
+        ethane_clone.translate([1, 0, 0])
+        assert np.allclose(ethane_clone.xyz, ethane.xyz + [1, 0, 0])
+
+    def test_add_merges_bond_graph_in_place(self, ethane, methane):
+        compound = mb.Compound()
+        compound.add(ethane)
+        root_bond_graph = compound.bond_graph
+        compound.add([methane, mb.Compound(name="C")])
+        assert compound.bond_graph is root_bond_graph
+        assert compound.n_bonds == ethane.n_bonds + methane.n_bonds
+        assert compound.bond_graph.number_of_nodes() == compound.n_particles
+        assert ethane.bond_graph is None
+        assert methane.bond_graph is None
+
+    def test_particle_bond_graph_lazy(self):
+        particle = Compound(name="C")
+        assert particle.bond_graph is None
+        assert particle.bond_graph_backend is None
+        assert mb.clone(particle).bond_graph is None
+        compound = Compound([particle, Compound(name="C")])
+        assert particle.bond_graph is None
+        assert compound.bond_graph.number_of_nodes() == 2
+        assert compound.n_bonds == 0
+        compound.add_bond(compound.children)
+        assert compound.n_bonds == 1
+        assert particle.n_direct_bonds == 1
+
+    def test_particle_index(self, ethane, methane):
+        compound = Compound([ethane, methane])
+        particles = list(compound.particles())
+        assert compound.n_particles == 13
+        assert compound[0] is particles[0]
+        assert compound[-1] is particles[-1]
+        assert methane[0] is particles[8]
+        assert methane.n_particles == 5
+        assert ethane._n_particles(include_ports=True) == 8
+        with pytest.raises(IndexError):
+            methane[5]
+
+        ch3 = mb.clone(ethane.children[0])
+        compound.add(ch3)
+        assert compound.n_particles == 17
+        assert compound[-1] is list(ch3.particles())[-1]
+        compound.remove(methane)
+        assert compound.n_particles == 12
+        assert compound[8] is ch3[0]
+
+    def test_replicate(self, ethane):
+        # Give the C-C bond a different bond order than the C-H bonds
+        ethane.add_bond((ethane[0], ethane[4]), bond_order=2.0)
+        positions = np.array([[0, 0, 0], [1, 1, 1], [2, 0, 1]])
+        copies = mb.replicate(ethane, 3, positions=positions)
+        assert len(copies) == 3
+        for copy, position in zip(copies, positions):
+            assert copy.parent is None
+            assert copy.n_particles == ethane.n_particles
+            assert copy.n_bonds == ethane.n_bonds
+            assert np.allclose(copy.center, position)
+            assert np.allclose(
+                copy.xyz_with_ports - copy.center,
+                ethane.xyz_with_ports - ethane.center,
+            )
+            assert set(copy.particles()).isdisjoint(ethane.particles())
+        bond_orders = [bond[2]["bond_order"] for bond in copies[0].bonds(True)]
+        assert sorted(bond_orders) == sorted(
+            bond[2]["bond_order"] for bond in ethane.bonds(True)
+        )
+        copies[0].translate([1, 0, 0])
+        assert np.allclose(copies[1].center, [1, 1, 1])
+
+    def test_replicate_rotations(self, ch3):
+        rotation = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+        copies = mb.replicate(ch3, 2, rotations=[np.eye(3), rotation])
+        assert np.allclose(copies[0].xyz_with_ports, ch3.xyz_with_ports)
+        assert np.allclose(
+            copies[1].xyz_with_ports - ch3.center,
+            (ch3.xyz_with_ports - ch3.center) @ rotation.T,
+        )
+        assert np.allclose(copies[1]["up"].anchor.pos, copies[1][0].pos)
+
+    def test_replicate_particle(self):
+        particle = Compound(name="C", element="C")
+        copies = mb.replicate(particle, 2, positions=[[0, 0, 1], [0, 1, 0]])
+        assert [copy.name for copy in copies] == ["C", "C"]
+        assert copies[0].element == particle.element
+        assert np.allclose(copies[1].pos, [0, 1, 0])
+        assert np.allclose(particle.pos, [0, 0, 0])
+
+    def test_replicate_bad_inputs(self, ch3):
+        with pytest.raises(ValueError):
+            mb.replicate(ch3, 2, positions=np.zeros((3, 3)))
+        with pytest.raises(ValueError):
+            mb.replicate(ch3, 2, rotations=np.zeros((2, 3)))
+        assert mb.replicate(ch3, 0) == []
+
+    def test_particle_shared_containers(self):
+        particle = Particle(name="C", element="C")
+        other = Particle(name="H", element="H")
+        assert isinstance(particle, Compound)
+        assert particle.children is other.children
+        assert particle.labels is other.labels
+        assert particle.__dict__ == {}
+
+        compound = Compound([particle, other])
+        assert particle.referrers == {compound}
+        assert not particle.children
+        assert mb.clone(compound)[0].children is other.children
+        for copy in mb.replicate(compound, 2):
+            copy.translate([1, 0, 0])
+            assert all(p.__dict__ == {} for p in copy.particles())
+
+        child = Particle(name="H")
+        particle.add(child)
+        assert particle.children == [child]
+        assert particle.labels["H[0]"] is child
+        assert not other.children
+        assert len(other.labels) == 0
+        assert compound.n_particles == 2
+        # Removing its only child also removes the now empty particle
+        compound.remove(child)
+        assert list(compound.particles()) == [other]
+
+    def test_geometry_cache(self, ethane):
+        xyz = ethane.xyz
+        assert np.allclose(ethane.mins, xyz.min(axis=0))
+        assert np.allclose(ethane.maxs, xyz.max(axis=0))
+        assert np.allclose(ethane.center, xyz.mean(axis=0))
+        assert ethane._geometry is not None
+
+        ethane[0].pos = ethane[0].pos + [10, 0, 0]
+        assert np.isclose(ethane.maxs[0], ethane[0].pos[0])
+        ethane.translate([0, 0, 1])
+        assert np.allclose(ethane.center, ethane.xyz.mean(axis=0))
+
+        # Adding a Compound updates the cached bounds in place
+        box = mb.Compound()
+        box.add(mb.clone(ethane))
+        lengths = box.get_boundingbox().lengths
+        methane = mb.Compound(name="C", pos=[0, 0, 20])
+        box.add(methane)
+        assert box._geometry.n_particles == ethane.n_particles + 1
+        assert np.isclose(box.maxs[2], 20)
+        assert np.allclose(box.mins, np.minimum(ethane.mins, [0, 0, 20]))
+        assert box.get_boundingbox().lengths[2] > lengths[2]
+        assert np.allclose(box.center, box.xyz.mean(axis=0))
+
+    def test_geometry_cache_moves(self, ethane):
+        box = mb.Compound()
+        box.add(mb.clone(ethane))
+        summary = box._geometry_summary()
+        for i in range(1, 4):
+            # Moving a detached molecule leaves the summary of box current
+            molecule = mb.clone(ethane)
+            molecule.translate([i, 0, 0])
+            box.add(molecule)
+            assert box._geometry is summary
+            assert summary.n_particles == (i + 1) * ethane.n_particles
+            assert np.allclose(box.maxs, box.xyz.max(axis=0))
+
+        # Moving a child drops the summaries of it and its ancestors only
+        child_summary = box.children[0]._geometry_summary()
+        molecule_summary = molecule._geometry_summary()
+        box.children[0].translate([0, 0, 5])
+        assert box.children[0]._current_geometry() is None
+        assert box._current_geometry() is None
+        assert molecule._current_geometry() is molecule_summary
+        assert np.allclose(box.maxs, box.xyz.max(axis=0))
+        assert child_summary is not box.children[0]._geometry_summary()
+
+        # Moving box makes the summaries below it stale
+        box.translate([1, 1, 1])
+        assert molecule._current_geometry() is None
+        assert np.allclose(molecule.center, molecule.xyz.mean(axis=0))
+
+    def test_boundingbox_planar_cache(self):
+        compound = mb.Compound()
+        for x in range(3):
+            compound.add(mb.Compound(name="C", pos=[x, 0.004 * x, 0]))
+        assert np.allclose(compound.get_boundingbox().lengths, [2, 0.1, 0.1])
+        compound.add(mb.Compound(name="C", pos=[0, 1, 0]))
+        assert np.allclose(compound.get_boundingbox().lengths, [2, 1, 0.1])
+
+    def test_contains(self, ethane, methane):
+        system = mb.Compound([ethane, methane])
+        for compound in (system, ethane, ethane.children[0]):
+            descendants = set(compound.successors()) | {compound}
+            for other in itertools.chain([system], system.successors()):
+                assert compound._contains(other) == (other in descendants)
+        assert not methane._contains(mb.clone(methane[0]))
+        assert not methane[0]._contains(methane)
+
+    @pytest.mark.parametrize("backend", ["networkx", "compact"])
+    def test_sub_compound_bonds(self, backend):
+        from mbuild.bond_graph import set_default_backend
+
+        set_default_backend(backend)
+        try:
+            ethane = mb.load("CC", smiles=True)
+            system = mb.Compound([ethane, mb.clone(ethane)])
+        finally:
+            set_default_backend("networkx")
+        assert system.n_bonds == 14
+        for molecule in system.children:
+            bonds = list(molecule.bonds(return_bond_order=True))
+            assert len(bonds) == molecule.n_bonds == 7
+            particles = set(molecule.particles())
+            assert all(p1 in particles and p2 in particles for p1, p2, _ in bonds)
@@ -17,6 +17,9 @@ from mbuild.coordinate_transform import (
     _spin,
     angle,
     force_overlap,
+    quaternions_to_matrices,
+    random_rotation_matrices,
+    rigid_transform_matrices,
     x_axis_transform,
     y_axis_transform,
     z_axis_transform,
@@ -95,6 +98,82 @@ class TestCoordinateTransform(BaseTest):
         rigid_transform = RigidTransform(A, B)
         assert (rigid_transform.apply_to(np.array([[2, 3, 4]])) == B).all()
 
+    def test_rigid_transform_matrices(self):
+        rng = np.random.default_rng(0)
+        A = rng.random((5, 4, 3))
+        B = np.empty_like(A)
+        for k in range(5):
+            rotation = Rotation(rng.random() * np.pi, rng.random(3) - 0.5)
+            B[k] = rotation.apply_to(A[k]) + rng.random(3)
+
+        T = rigid_transform_matrices(A, B)
+        assert T.shape == (5, 4, 4)
+        for k in range(5):
+            transform = RigidTransform(A[k], B[k])
+            assert np.allclose(transform.T, T[k])
+            assert np.allclose(CoordinateTransform(T[k]).apply_to(A[k]), B[k])
+
+    def test_rigid_transform_matrices_bad_shapes(self):
+        with pytest.raises(ValueError):
+            rigid_transform_matrices(np.zeros((4, 3)), np.zeros((4, 3)))
+        with pytest.raises(ValueError):
+            rigid_transform_matrices(np.zeros((2, 4, 3)), np.zeros((2, 5, 3)))
+
+    def test_quaternions_to_matrices(self):
+        theta = 1.2
+        axis = np.array([1.0, 2.0, -0.5]) / np.linalg.norm([1.0, 2.0, -0.5])
+        quaternion = np.append(np.cos(theta / 2), np.sin(theta / 2) * axis)
+        R = quaternions_to_matrices([quaternion, 3 * quaternion])
+        assert np.allclose(R[0], Rotation(theta, axis).T[:3, :3])
+        assert np.allclose(R[1], R[0])
+        with pytest.raises(ValueError):
+            quaternions_to_matrices(np.zeros((1, 4)))
+
+    def test_random_rotation_matrices(self):
+        R = random_rotation_matrices(1000, seed=1)
+        assert R.shape == (1000, 3, 3)
+        assert np.allclose(np.matmul(R, np.swapaxes(R, 1, 2)), np.eye(3))
+        assert np.allclose(np.linalg.det(R), 1.0)
+        # Uniform rotations send a vector uniformly over the sphere.
+        assert np.allclose(np.mean(R[:, :, 2], axis=0), 0.0, atol=0.1)
+        assert np.allclose(R, random_rotation_matrices(1000, seed=1))
+
+    @pytest.mark.parametrize("as_quaternions", [False, True])
+    def test_transform_children(self, methane, as_quaternions):
+        system = mb.Compound([mb.clone(methane) for _ in range(3)])
+        system.add(mb.Port(anchor=system[0]), "port")
+        expected = mb.clone(system)
+        thetas = [0.3, 2.0, -1.0, 0.7]
+        axes = np.array([[1, 0, 0], [0, 1, 1], [1, 2, 3], [0, 0, 1]], dtype=float)
+        translations = np.arange(12, dtype=float).reshape(4, 3)
+        for child, theta, axis, by in zip(
+            expected.children, thetas, axes, translations
+        ):
+            if isinstance(child, mb.Port):
+                center = np.mean(child.xyz_with_ports, axis=0)
+                child.translate(-center)
+                child.rotate(theta, axis)
+                child.translate(center)
+            else:
+                child.spin(theta, axis)
+            child.translate(by)
+
+        if as_quaternions:
+            axes /= np.linalg.norm(axes, axis=1)[:, np.newaxis]
+            half = np.array(thetas)[:, np.newaxis] / 2
+            rotations = np.hstack((np.cos(half), np.sin(half) * axes))
+        else:
+            rotations = [Rotation(t, a).T[:3, :3] for t, a in zip(thetas, axes)]
+        system.transform_children(translations, rotations)
+        assert np.allclose(system.xyz_with_ports, expected.xyz_with_ports)
+
+    def test_transform_children_bad_shapes(self, methane):
+        system = mb.Compound([mb.clone(methane) for _ in range(3)])
+        with pytest.raises(ValueError):
+            system.transform_children(translations=np.zeros((2, 3)))
+        with pytest.raises(ValueError):
+            system.transform_children(rotations=np.zeros((3, 3)))
+
     def test_rotate_0(self, methane):
         before = methane.xyz_with_ports
         methane.rotate(0.0, np.asarray([1.0, 0.0, 0.0]))
@@ -360,6 +439,56 @@ class TestCoordinateTransform(BaseTest):
         ethyl = mb.Compound([ch2, ch3])
         assert ethyl.n_bonds == 6
 
+    @staticmethod
+    def _grow_chain(monomer, n, array_backed, read_each_step=False):
+        """Grow a chain by moving it onto each new monomer."""
+        chain = mb.Compound()
+        chain.add(mb.clone(monomer), "monomer[$]")
+        chain.array_backed = array_backed
+        for _ in range(n):
+            new_monomer = mb.clone(monomer)
+            force_overlap(chain, chain["all-monomers"][-1]["down"], new_monomer["up"])
+            chain.add(new_monomer, "monomer[$]")
+            if read_each_step:
+                chain.xyz_with_ports
+        return chain
+
+    @pytest.mark.parametrize("array_backed", [False, True])
+    def test_force_overlap_grow_chain(self, ch2, array_backed):
+        chain = self._grow_chain(ch2, 5, array_backed)
+        if not array_backed:
+            # Every move was composed with the transform pending on the chain.
+            assert chain._pending_transform is not None
+        expected = self._grow_chain(ch2, 5, True, read_each_step=True)
+        particles = list(chain.particles(include_ports=True))
+        assert np.allclose([p.pos for p in particles], chain.xyz_with_ports)
+        assert np.allclose(chain.xyz_with_ports, expected.xyz_with_ports)
+        assert chain._pending_transform is None
+        assert chain.n_bonds == expected.n_bonds == 17
+
+    def test_force_overlap_pending_transform(self, ch3, methane):
+        compound = mb.Compound([ch3, methane])
+        first = compound.children[0]
+        force_overlap(first, first[0], compound.children[1][1], add_bond=False)
+        moved = first.xyz_with_ports
+        assert np.allclose(first[0].pos, compound.children[1][1].pos)
+
+        # Clones and removed parts keep their coordinates.
+        assert np.allclose(mb.clone(first).xyz_with_ports, moved)
+        assert np.allclose(mb.clone(first[1]).pos, moved[1])
+        hydrogen = first[3]
+        first.remove(hydrogen)
+        assert np.allclose(hydrogen.pos, moved[3])
+
+        # Added parts keep theirs, and setting coordinates sets them.
+        first.add(hydrogen)
+        assert np.allclose(first.xyz, moved[:4])
+        hydrogen.pos = [1.0, 2.0, 3.0]
+        assert np.allclose(hydrogen.pos, [1.0, 2.0, 3.0])
+        force_overlap(compound, compound[0], hydrogen, add_bond=False)
+        assert np.allclose(compound[0].pos, [1.0, 2.0, 3.0])
+        assert np.allclose(compound.xyz[0], [1.0, 2.0, 3.0])
+
     def test_translate(self, methane):
         methane_atoms = list(methane.particles())
         methane.translate(-methane_atoms[0].pos)
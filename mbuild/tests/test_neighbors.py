@@ -0,0 +1,76 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import mbuild as mb
+from mbuild.neighbors import CellList, neighbor_pairs
+from mbuild.tests.base_test import BaseTest
+
+
+def brute_force_pairs(points, r_max, box, periodicity, r_min=0.0):
+    """Return the set of (i, j, distance) pairs found by trying all images."""
+    vectors = np.asarray(box.vectors) if box is not None else np.identity(3)
+    images = [
+        np.array(image) @ vectors
+        for image in itertools.product(
+            *[(-1, 0, 1) if periodic else (0,) for periodic in periodicity]
+        )
+    ]
+    pairs = {}
+    for i, j in itertools.combinations(range(len(points)), 2):
+        distance = min(
+            np.linalg.norm(points[j] + image - points[i]) for image in images
+        )
+        if r_min <= distance <= r_max:
+            pairs[(i, j)] = distance
+    return pairs
+
+
+class TestNeighbors(BaseTest):
+    @pytest.mark.parametrize(
+        "box, periodicity",
+        [
+            (None, (False, False, False)),
+            (mb.Box([2.0, 2.5, 3.0]), (True, True, True)),
+            (mb.Box([2.0, 2.5, 3.0]), (True, False, True)),
+            (
+                mb.Box([2.0, 2.5, 3.0], angles=[80.0, 95.0, 110.0]),
+                (True, True, True),
+            ),
+            (
+                mb.Box([2.0, 2.5, 3.0], angles=[90.0, 90.0, 120.0]),
+                (True, True, False),
+            ),
+        ],
+    )
+    def test_pairs_match_brute_force(self, box, periodicity):
+        rng = np.random.default_rng(12)
+        fractional = rng.random((200, 3))
+        vectors = np.identity(3) * 2.0 if box is None else box.vectors
+        points = fractional @ vectors
+        i, j, distances = neighbor_pairs(
+            points, 0.6, box=box, periodicity=periodicity, r_min=0.1
+        )
+        expected = brute_force_pairs(points, 0.6, box, periodicity, r_min=0.1)
+        assert set(zip(i.tolist(), j.tolist())) == set(expected)
+        assert np.allclose(distances, [expected[pair] for pair in zip(i, j)])
+
+    def test_query_points_outside_box(self):
+        box = mb.Box([2.0, 2.0, 2.0])
+        points = np.array([[0.1, 0.1, 0.1], [1.0, 1.0, 1.0]])
+        cell_list = CellList(points, 0.5, box=box)
+        i, j, distances = cell_list.query([[1.9, 2.1, -1.9]])
+        assert i.tolist() == [0]
+        assert j.tolist() == [0]
+        assert np.isclose(distances[0], 0.2)
+
+    def test_cutoff_too_large(self):
+        with pytest.raises(ValueError):
+            CellList(np.zeros((2, 3)), 1.1, box=mb.Box([2.0, 2.0, 2.0]))
+        with pytest.raises(ValueError):
+            CellList(np.zeros((2, 3)), 1.0).query(np.zeros((1, 3)), r_max=2.0)
+
+    def test_empty(self):
+        i, j, distances = neighbor_pairs(np.empty((0, 3)), 0.5)
+        assert len(i) == len(j) == len(distances) == 0
@@ -266,6 +266,84 @@ class TestPacking(BaseTest):
         assert filled.n_bonds == 7 + n_solvent * 2
         assert len(filled.children) == 101
 
+    def test_fill_box_domains(self, h2o):
+        filled = mb.fill_box(
+            h2o,
+            n_compounds=101,
+            box=Box([4, 2, 2]),
+            n_domains=4,
+            packmol_file="packmol.inp",
+        )
+        assert filled.n_particles == 101 * 3
+        assert filled.n_bonds == 101 * 2
+        for domain in range(4):
+            assert os.path.isfile(f"packmol_{domain}.inp")
+        for water in filled.children:
+            assert np.all(np.linalg.norm(water.xyz - water.xyz[0], axis=1) < 0.2)
+        assert np.all(filled.xyz >= 0.2 - 1e-3)
+        assert np.all(filled.xyz <= np.array([3.8, 1.8, 1.8]) + 1e-3)
+        assert len(filled.check_for_overlap(2, minimum_distance=0.15)) == 0
+
+    def test_fill_box_domains_bad_args(self, h2o):
+        with pytest.raises(ValueError):
+            mb.fill_box(
+                h2o, n_compounds=10, box=[2, 2, 2], use_pbc=True, edge=0, n_domains=2
+            )
+        with pytest.raises(ValueError):
+            mb.fill_box(h2o, n_compounds=10, box=[2, 2, 2], n_domains=100)
+
+    def test_fill_region_domains(self, ethane, h2o):
+        filled = mb.fill_region(
+            [h2o, ethane],
+            n_compounds=[30, 10],
+            region=[[0, 0, 0, 2, 2, 2], [2, 0, 0, 4, 2, 2]],
+            n_domains=2,
+        )
+        assert filled.n_particles == 30 * 3 + 10 * 8
+        assert all(child.name == "H2O" for child in filled.children[:30])
+        assert all(child.name == "Ethane" for child in filled.children[30:])
+        assert np.all(filled.children[0].xyz[:, 0] < 2.0)
+        assert np.all(filled.children[-1].xyz[:, 0] >= 2.0 - 1e-3)
+
+    def test_solvate_domains(self, ethane, h2o):
+        solvated = mb.solvate(ethane, h2o, n_solvent=100, box=[4, 4, 4], n_domains=3)
+        assert solvated.n_particles == 8 + 100 * 3
+        assert solvated.n_bonds == 7 + 100 * 2
+        assert solvated.children[0].n_particles == 8
+        assert np.allclose(solvated.children[0].center, [2, 2, 2], atol=1e-3)
+        assert len(solvated.check_for_overlap(2, minimum_distance=0.15)) == 0
+
+    def test_packmol_cache(self, h2o, tmpdir, monkeypatch):
+        cache_dir = str(tmpdir.join("cache"))
+        mb.packing.set_packmol_cache(cache_dir)
+        try:
+            filled = mb.fill_box(h2o, n_compounds=10, box=[1, 1, 1], seed=1)
+            assert len(os.listdir(cache_dir)) == 1
+
+            def fail(*args, **kwargs):
+                raise AssertionError("PACKMOL should not run")
+
+            monkeypatch.setattr(mb.packing, "Popen", fail)
+            cached = mb.fill_box(
+                h2o, n_compounds=10, box=[1, 1, 1], seed=1, temp_file="temp.xyz"
+            )
+            assert np.allclose(filled.xyz, cached.xyz)
+            assert os.path.isfile("temp.xyz")
+            with pytest.raises(AssertionError):
+                mb.fill_box(h2o, n_compounds=10, box=[1, 1, 1], seed=2)
+        finally:
+            mb.packing.set_packmol_cache(None)
+
+    def test_packmol_cache_eviction(self, h2o, tmpdir):
+        cache_dir = str(tmpdir.join("cache"))
+        mb.packing.set_packmol_cache(cache_dir, max_size=1)
+        try:
+            mb.fill_box(h2o, n_compounds=10, box=[1, 1, 1], seed=1)
+            mb.fill_box(h2o, n_compounds=10, box=[1, 1, 1], seed=2)
+            assert len(os.listdir(cache_dir)) == 1
+        finally:
+            mb.packing.set_packmol_cache(None)
+
     def test_solvate(self, ethane, h2o):
         n_solvent = 100
         ethane_pos = ethane.pos
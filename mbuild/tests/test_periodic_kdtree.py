@@ -0,0 +1,97 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import mbuild as mb
+from mbuild.periodic_kdtree import PeriodicKDTree
+from mbuild.tests.base_test import BaseTest
+
+BOXES = [
+    (mb.Box([2.0, 2.5, 3.0]), (True, True, True)),
+    (mb.Box([2.0, 2.5, 3.0]), (True, False, True)),
+    (mb.Box([2.0, 2.5, 3.0], angles=[80.0, 95.0, 110.0]), (True, True, True)),
+    (mb.Box([2.0, 2.5, 3.0], angles=[90.0, 90.0, 120.0]), (True, True, False)),
+]
+
+
+def brute_force_distances(x, data, box, periodicity):
+    """Return the nearest image distances between all points of x and data."""
+    images = [
+        np.array(image) @ box.vectors
+        for image in itertools.product(
+            *[range(-2, 3) if periodic else (0,) for periodic in periodicity]
+        )
+    ]
+    displacements = data[None, :, :] - x[:, None, :]
+    return np.min(
+        [np.linalg.norm(displacements + image, axis=-1) for image in images],
+        axis=0,
+    )
+
+
+def make_tree(box, periodicity, n_points=150, seed=5):
+    points = np.random.default_rng(seed).random((n_points, 3)) @ box.vectors
+    compound = mb.Compound(box=box)
+    compound.add([mb.Particle(name="A", pos=pos) for pos in points])
+    compound.periodicity = periodicity
+    return PeriodicKDTree.from_compound(compound), points
+
+
+class TestPeriodicKDTree(BaseTest):
+    @pytest.mark.parametrize("box, periodicity", BOXES)
+    def test_query(self, box, periodicity):
+        tree, points = make_tree(box, periodicity)
+        x = np.random.default_rng(6).random((20, 3)) * 4.0 - 1.0
+        distances = brute_force_distances(x, points, box, periodicity)
+
+        d, i = tree.query(x, k=3, distance_upper_bound=0.8)
+        expected = np.sort(distances, axis=1)[:, :3]
+        expected[expected > 0.8] = np.inf
+        assert d.shape == i.shape == (20, 3)
+        assert np.allclose(d, expected)
+        found = i[np.isfinite(d)]
+        assert np.allclose(
+            distances[np.nonzero(np.isfinite(d))[0], found], d[np.isfinite(d)]
+        )
+
+        d, i = tree.query(x[0])
+        assert np.isclose(d, distances[0].min())
+        assert i == np.argmin(distances[0])
+
+    @pytest.mark.parametrize("box, periodicity", BOXES)
+    def test_query_ball_point(self, box, periodicity):
+        tree, points = make_tree(box, periodicity)
+        x = np.random.default_rng(7).random((10, 3)) * 4.0 - 1.0
+        distances = brute_force_distances(x, points, box, periodicity)
+        neighbors = tree.query_ball_point(x, 0.5)
+        for row, neighbor_list in zip(distances, neighbors):
+            assert sorted(neighbor_list) == np.flatnonzero(row <= 0.5).tolist()
+        assert sorted(tree.query_ball_point(x[0], 0.5)) == sorted(neighbors[0])
+
+    @pytest.mark.parametrize("box, periodicity", BOXES)
+    def test_pairs(self, box, periodicity):
+        tree, points = make_tree(box, periodicity)
+        distances = brute_force_distances(points, points, box, periodicity)
+        expected = {(i, j) for i, j in zip(*np.nonzero(distances <= 0.4)) if i < j}
+        assert tree.query_pairs(0.4) == expected
+
+        matrix = tree.sparse_distance_matrix(tree, 0.4, output_type="dict")
+        assert {(i, j) for i, j in matrix if i < j} == expected
+        for (i, j), distance in matrix.items():
+            assert np.isclose(distance, distances[i, j])
+
+        ball_tree = tree.query_ball_tree(tree, 0.4)
+        assert len(ball_tree) == len(points)
+        found = {(i, j) for i, row in enumerate(ball_tree) for j in row if i < j}
+        assert found == expected
+
+        counts = tree.count_neighbors(tree, [0.2, 0.4])
+        assert counts.tolist() == [
+            np.count_nonzero(distances <= 0.2),
+            np.count_nonzero(distances <= 0.4),
+        ]
+
+    def test_not_compound(self):
+        with pytest.raises(TypeError):
+            PeriodicKDTree.from_compound(np.zeros((3, 3)))
@@ -1,6 +1,7 @@
 import logging
 
 import numpy as np
+import pytest
 
 import mbuild as mb
 from mbuild.tests.base_test import BaseTest
@@ -114,3 +115,76 @@ class TestPattern(BaseTest):
         ethane.labels["new_port"] = ethane["methyl1"]["port[1]"]
         assert len(ethane["new_port"].access_labels) == 2
         assert "['new_port']" in ethane["new_port"].access_labels
+
+    @staticmethod
+    def _methylene(port_type, orientation=(0, 1, 0)):
+        carbon = mb.Particle(name="C")
+        monomer = mb.Compound([carbon, mb.Particle(name="H", pos=[0.05, 0.02, 0.09])])
+        monomer.add_bond((carbon, monomer[1]))
+        orientation = np.asarray(orientation, dtype=float)
+        monomer.add(
+            port_type(anchor=carbon, orientation=orientation, separation=0.07), "up"
+        )
+        monomer.add(
+            port_type(anchor=carbon, orientation=-orientation, separation=0.07), "down"
+        )
+        return monomer
+
+    @pytest.mark.parametrize(
+        "orientation", [[0, 1, 0], [0, -1, 0], [0, 0, 1], [1, 1, 1], [-0.3, 0.2, 0.5]]
+    )
+    def test_analytic_port_frame(self, ethane, orientation):
+        port = mb.Port(anchor=ethane, orientation=orientation, separation=0.1)
+        analytic = mb.AnalyticPort(
+            anchor=ethane, orientation=orientation, separation=0.1
+        )
+        assert len(analytic.children) == 3
+        assert np.allclose(port.center, analytic.center)
+        assert np.allclose(port.direction, analytic.direction)
+        assert np.allclose(port.separation, analytic.separation)
+        for expected, frame in zip(port._frames(), analytic._frames()):
+            assert np.allclose(expected, frame)
+
+    def test_analytic_port_update_orientation(self, ethane):
+        port = mb.Port(anchor=ethane, separation=0.1)
+        analytic = mb.AnalyticPort(anchor=ethane, separation=0.1)
+        for p in (port, analytic):
+            p.update_orientation([1, 0, 0])
+            p.update_separation(0.2)
+        assert np.allclose([-1, 0, 0], analytic.direction)
+        assert np.allclose(0.2, analytic.separation)
+        for expected, frame in zip(port._frames(), analytic._frames()):
+            assert np.allclose(expected, frame)
+
+    @pytest.mark.parametrize(
+        "from_type, to_type",
+        [
+            (mb.AnalyticPort, mb.AnalyticPort),
+            (mb.AnalyticPort, mb.Port),
+            (mb.Port, mb.AnalyticPort),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "orientation", [[0, 1, 0], [0, 0, 1], [1, 0, 0], [-0.3, 0.2, 0.5]]
+    )
+    def test_analytic_port_force_overlap(self, from_type, to_type, orientation):
+        expected = []
+        for from_port_type, to_port_type in ((mb.Port, mb.Port), (from_type, to_type)):
+            chain = self._methylene(to_port_type, orientation)
+            chain.spin(0.7, [1, 2, 3])
+            monomer = self._methylene(from_port_type, orientation)
+            mb.force_overlap(monomer, monomer["up"], chain["down"], add_bond=False)
+            assert monomer.available_ports() == [monomer["down"]]
+            assert chain.available_ports() == [chain["up"]]
+            expected.append(monomer.xyz)
+        assert np.allclose(*expected)
+
+    def test_analytic_port_clone(self):
+        monomer = self._methylene(mb.AnalyticPort)
+        copy = mb.clone(monomer)
+        assert isinstance(copy["up"], mb.AnalyticPort)
+        assert copy["up"].anchor is copy[0]
+        assert len(copy["up"].children) == 3
+        assert np.allclose(monomer["up"].xyz_with_ports, copy["up"].xyz_with_ports)
+        for expected, frame in zip(monomer["up"]._frames(), copy["up"]._frames()):
+            assert np.allclose(expected, frame)
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from mbuild.lib.recipes import TiledCompound
@@ -26,6 +27,20 @@ class TestTiledCompound(BaseTest):
         assert tiled.n_particles == 1900 * nx * ny
         assert tiled.n_bonds == 2400 * nx * ny
 
+    def test_replaced_bond_ports(self, betacristobalite):
+        # Both particles of each bond replaced across a periodic boundary get
+        # a Port, as with Compound.remove_bond.
+        lengths = np.asarray(betacristobalite.box.lengths)
+        dist_thresh = np.min(lengths[list(betacristobalite.periodicity)]) / 2
+        n_periodic = sum(
+            np.linalg.norm(particle1.pos - particle2.pos) > dist_thresh
+            for particle1, particle2 in betacristobalite.bonds()
+        )
+        n_ports = len(betacristobalite.all_ports())
+        tiled = TiledCompound(betacristobalite, [2, 2, 1])
+        assert n_periodic > 0
+        assert len(tiled.all_ports()) == 4 * (n_ports + 2 * n_periodic)
+
     def test_incorrect_periodicity(self, betacristobalite):
         nx = 2
         ny = 2